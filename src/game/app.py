@@ -1,9 +1,14 @@
 import os
+import time
 import pygame
-from .utils.audio import AudioManager
+from .utils.audio import AudioManager, NullAudio
+from .utils.perf_overlay import PerfOverlay
+from .utils.profiler import ProfileCapture
+from .scene_assets import SceneAssets
 
 class GameApp:
-    def __init__(self):
+    def __init__(self, watchdog_budget_ms=None, profile_frames=300, profile_on_start=False, profile_scene=None,
+                 telemetry_path=None, netplay=None, broadcast_port=None):
         import pygame
         from .scenes.main_menu import MainMenu
         from .scenes.gameplay import Gameplay
@@ -14,37 +19,7 @@ class GameApp:
         try:
             self.audio = AudioManager()
         except Exception:
-
-            class _NullAudio:
-                def play_sound(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return None
-                def play_music(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return False
-                def stop_music(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return None
-                def set_master_volume(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return None
-                def set_sfx_volume(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return None
-                def set_music_volume(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return None
-                def preload_folder(self, *args, **kwargs):
-                    _ = args
-                    _ = kwargs
-                    return 0
-            self.audio = _NullAudio()
+            self.audio = NullAudio()
 
         try:
             from .utils.config import load_config
@@ -91,14 +66,72 @@ class GameApp:
         self._zoom_start = 0
         self._zoom_duration = 0
         self._zoom_mag = 1.0
+        self.perf_overlay = PerfOverlay(budget_ms=1000.0 / FPS)
+        # expensive scene objects kept across restarts (see scene_assets.py)
+        self.assets = SceneAssets()
+        # cProfile capture sessions (F4 or --profile, see utils/profiler.py)
+        self.profiler = ProfileCapture(frames=profile_frames, start_on_scene=profile_scene)
+        if profile_on_start:
+            self.profiler.start()
+        # optional per-frame telemetry capture (see utils/telemetry.py)
+        self.telemetry = None
+        if telemetry_path is not None:
+            try:
+                from .utils.telemetry import FrameTelemetry
+                self.telemetry = FrameTelemetry(telemetry_path or None)
+            except Exception:
+                self.telemetry = None
+        # optional long-frame watchdog (see utils/watchdog.py)
+        self.watchdog = None
+        if watchdog_budget_ms is not None:
+            try:
+                from .utils.watchdog import FrameWatchdog
+                self.watchdog = FrameWatchdog(budget_ms=watchdog_budget_ms)
+                self.watchdog.start()
+            except Exception:
+                self.watchdog = None
+        # optional spectator stream of the gameplay scenes (see broadcast.py)
+        self.broadcaster = None
+        if broadcast_port is not None:
+            try:
+                from .broadcast import WorldBroadcaster
+                self.broadcaster = WorldBroadcaster(broadcast_port)
+            except Exception:
+                self.broadcaster = None
         self.current_scene = MainMenu(self)
+        # --netplay: go straight into a two-player match (see game/netplay.py)
+        if netplay is not None:
+            from .netplay import UdpTransport
+            from .scenes.netplay import NetplayGameplay
+            transport = UdpTransport(netplay['port'], netplay['peer'])
+            self.current_scene = NetplayGameplay(self, transport, netplay['player'], netplay['seed'])
 
     def run(self):
+        perf_counter = time.perf_counter
+        overlay = self.perf_overlay
+        watchdog = self.watchdog
+        profiler = self.profiler
+        telemetry = self.telemetry
         while self.running:
+            if watchdog is not None:
+                watchdog.begin_frame()
+            if profiler.active or profiler.start_on_scene:
+                profiler.begin_frame(self.current_scene)
+            # stage timestamps are only taken while the overlay is visible or
+            # telemetry is being captured
+            timing = overlay.visible or telemetry is not None
+            if timing:
+                t0 = perf_counter()
             self.handle_events()
+            if timing:
+                t1 = perf_counter()
             self.current_scene.update()
+            if timing:
+                t2 = perf_counter()
 
             self.current_scene.render(self.screen)
+            if timing:
+                t3 = perf_counter()
 
             now = pygame.time.get_ticks()
             if self.slow_motion_end and now >= self.slow_motion_end:
@@ -132,22 +165,72 @@ class GameApp:
             else:
                 self.display.blit(self.screen, (0, 0))
 
+            if timing:
+                t4 = perf_counter()
+                t4_end = t4
+                if overlay.visible:
+                    overlay.draw(self.display, self.clock.get_fps(), self.current_scene, self.audio)
+                    t4_end = perf_counter()
+
             pygame.display.flip()
 
+            if timing:
+                t5 = perf_counter()
+                stages = (
+                    (t1 - t0) * 1000.0,
+                    (t2 - t1) * 1000.0,
+                    (t3 - t2) * 1000.0,
+                    (t4 - t3) * 1000.0,
+                    (t5 - t4_end) * 1000.0,
+                )
+                if overlay.visible:
+                    overlay.record((t5 - t0) * 1000.0, dict(zip(overlay.STAGES, stages)))
+
+            if profiler.active:
+                profiler.end_frame()
+            if watchdog is not None:
+                watchdog.end_frame(self.current_scene.__class__.__name__)
+
             target_fps = max(1, int(self.FPS * self.time_scale))
             self.clock.tick(target_fps)
 
+            if timing and telemetry is not None:
+                # the whole period of this frame, frame-cap wait included, next to its own stages
+                scene = self.current_scene
+                counter = getattr(scene, 'event_counter', None)
+                telemetry.record(
+                    (perf_counter() - t0) * 1000.0,
+                    stages,
+                    scene.__class__.__name__,
+                    scene.enemy_count() if hasattr(scene, 'enemy_count') else len(getattr(scene, 'enemies', ())),
+                    len(getattr(scene, 'effects', ())),
+                    self.time_scale,
+                    counter.take() if counter is not None else None,
+                )
+
+        if profiler.active:
+            profiler.stop()
+        if telemetry is not None:
+            telemetry.close()
+        if watchdog is not None:
+            watchdog.stop()
+        if self.broadcaster is not None:
+            self.broadcaster.close()
         pygame.quit()
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            if self.perf_overlay.handle_event(event) or self.profiler.handle_event(event):
+                continue
             self.current_scene.handle_event(event)
 
     def change_scene(self, scene):
 
         self.current_scene = scene(self)
+        # release retained assets the new scene does not own
+        self.assets.prune(self.current_scene)
 
     def go_to_menu(self):
         """Convenience method for scenes to return to main menu without importing it."""
@@ -0,0 +1,532 @@
+"""World-state broadcast for spectators and recorders.
+
+`WorldBroadcaster.publish(scene)` is called by Gameplay once per tick
+(when the game runs with `--broadcast`) and streams what is on the
+battlefield to every TCP subscriber: positions, animation state and frame,
+facing, HP and hit flash of each knight and enemy, plus projectiles,
+effects, the health pickup and a few HUD values. Nothing here feeds back
+into the simulation.
+
+The world is a table of small integer records keyed by entity id. A
+keyframe is simply the delta from an empty world; every other tick only
+the difference with the previous tick is sent, bit-packed: one bit per
+unchanged entity, otherwise a field mask and each changed field as an
+Elias-gamma coded zigzag delta (a one-pixel step costs three bits). The
+per-tick cost therefore grows with what moves, not with how many
+entities exist. Keyframes go out every `keyframe_interval` ticks and to
+every subscriber that just connected or fell behind.
+
+Stream format: messages of `<type:u8 tick:u32 length:u32>` followed by
+the payload. `MSG_HELLO` (JSON: world geometry and the enemy archetype
+names sprite ids refer to) starts the stream and every scene change;
+then `MSG_KEYFRAME`/`MSG_DELTA`. `WorldStream` rebuilds the world from
+such a byte stream, live or from a recording; tools/stream_viewer.py
+renders it with the game's own sprite caches.
+"""
+import heapq
+import json
+import socket
+import struct
+from collections import deque
+
+from .settings import BROADCAST_PORT, BROADCAST_KEYFRAME_INTERVAL, BROADCAST_MAX_BACKLOG
+from .entities.archetype import get_registry
+from .entities.effects import Hitspark
+from .entities.effects.fireinbody import FireInBody
+
+STREAM_VERSION = 1
+
+MSG_HELLO = 0
+MSG_KEYFRAME = 1
+MSG_DELTA = 2
+_HEADER = struct.Struct('<BII')
+
+# entity kinds
+KIND_PLAYER = 0
+KIND_ENEMY = 1
+KIND_FIREBALL = 2
+KIND_HITSPARK = 3
+KIND_FIRE_IN_BODY = 4
+KIND_HEALTH = 5
+
+# every entity record has these fields, in this order (all ints); sprite
+# is the enemy archetype id, x/y the rect top-left (effect centers)
+FIELDS = ('kind', 'sprite', 'x', 'y', 'state', 'frame', 'facing', 'hp', 'max_hp', 'flags')
+FLAG_FLASH = 1
+SCENE_FIELDS = ('camera_x', 'camera_y', 'kills', 'mana', 'max_mana', 'spawn_limit', 'dead')
+
+_EMPTY_RECORD = (0,) * len(FIELDS)
+EMPTY_WORLD = ((0,) * len(SCENE_FIELDS), {})
+
+
+class BitWriter:
+    """Little-endian bit stream: fields are appended from the low bit up."""
+
+    __slots__ = ('buf', 'acc', 'bits')
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.acc = 0
+        self.bits = 0
+
+    def write(self, value, count):
+        self.acc |= value << self.bits
+        self.bits += count
+        if self.bits >= 64:
+            self.buf += (self.acc & 0xFFFFFFFFFFFFFFFF).to_bytes(8, 'little')
+            self.acc >>= 64
+            self.bits -= 64
+
+    def write_gamma(self, value):
+        """Elias gamma code of `value` >= 1 (2 * bit_length - 1 bits)."""
+        n = value.bit_length() - 1
+        # n zero bits and a one, then the bits below the leading one
+        self.write(1 << n, n + 1)
+        if n:
+            self.write(value & ((1 << n) - 1), n)
+
+    def write_signed(self, value):
+        self.write_gamma((value << 1 if value >= 0 else (-value << 1) - 1) + 1)
+
+    def getvalue(self):
+        return bytes(self.buf) + self.acc.to_bytes((self.bits + 7) // 8, 'little')
+
+
+class BitReader:
+    """Reads what `BitWriter` wrote; raises IndexError past the end."""
+
+    __slots__ = ('data', 'pos', 'acc', 'bits')
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.acc = 0
+        self.bits = 0
+
+    def read(self, count):
+        while self.bits < count:
+            self.acc |= self.data[self.pos] << self.bits
+            self.pos += 1
+            self.bits += 8
+        value = self.acc & ((1 << count) - 1)
+        self.acc >>= count
+        self.bits -= count
+        return value
+
+    def read_gamma(self):
+        n = 0
+        while not self.read(1):
+            n += 1
+        return (1 << n) | self.read(n) if n else 1
+
+    def read_signed(self):
+        z = self.read_gamma() - 1
+        return z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+
+def _write_record(w, old, new):
+    mask = 0
+    bit = 1
+    for a, b in zip(old, new):
+        if a != b:
+            mask |= bit
+        bit <<= 1
+    w.write(mask, len(new))
+    for a, b in zip(old, new):
+        if a != b:
+            w.write_signed(b - a)
+
+
+def _read_record(r, old):
+    mask = r.read(len(old))
+    if not mask:
+        return old
+    new = list(old)
+    for i in range(len(old)):
+        if mask >> i & 1:
+            new[i] += r.read_signed()
+    return tuple(new)
+
+
+def _write_ids(w, ids):
+    w.write_gamma(len(ids) + 1)
+    last = -1
+    for sid in ids:
+        w.write_gamma(sid - last)
+        last = sid
+
+
+def _read_ids(r):
+    ids = []
+    last = -1
+    for _ in range(r.read_gamma() - 1):
+        last += r.read_gamma()
+        ids.append(last)
+    return ids
+
+
+def encode_world(prev, cur):
+    """Bit-packed difference from world `prev` to `cur` (a keyframe if `prev` is EMPTY_WORLD)."""
+    w = BitWriter()
+    prev_scene, prev_entities = prev
+    scene, entities = cur
+    _write_record(w, prev_scene, scene)
+    removed = sorted(prev_entities.keys() - entities.keys())
+    added = sorted(entities.keys() - prev_entities.keys())
+    _write_ids(w, removed)
+    _write_ids(w, added)
+    for sid in added:
+        _write_record(w, _EMPTY_RECORD, entities[sid])
+    for sid in sorted(prev_entities.keys() & entities.keys()):
+        old = prev_entities[sid]
+        new = entities[sid]
+        if old == new:
+            w.write(0, 1)
+        else:
+            w.write(1, 1)
+            _write_record(w, old, new)
+    return w.getvalue()
+
+
+def decode_world(prev, data):
+    """The world `encode_world(prev, cur)` was made from: returns `cur`."""
+    r = BitReader(data)
+    prev_scene, prev_entities = prev
+    scene = _read_record(r, prev_scene)
+    removed = _read_ids(r)
+    added = _read_ids(r)
+    entities = dict(prev_entities)
+    for sid in removed:
+        del entities[sid]
+    kept = sorted(entities)
+    for sid in added:
+        entities[sid] = _read_record(r, _EMPTY_RECORD)
+    for sid in kept:
+        if r.read(1):
+            entities[sid] = _read_record(r, entities[sid])
+    return scene, entities
+
+
+class WorldIds:
+    """Small, reused stream ids for the objects of a scene."""
+
+    def __init__(self):
+        self._ids = {}
+        self._seen = {}
+        self._free = []
+        self._next = 0
+
+    def get(self, key):
+        sid = self._ids.get(key)
+        if sid is None:
+            sid = heapq.heappop(self._free) if self._free else self._next
+            if sid == self._next:
+                self._next += 1
+            self._ids[key] = sid
+        self._seen[key] = sid
+        return sid
+
+    def end_frame(self):
+        """Free the ids of the objects not seen since the last call."""
+        for key, sid in self._ids.items():
+            if key not in self._seen:
+                heapq.heappush(self._free, sid)
+        self._ids, self._seen = self._seen, {}
+
+
+def archetype_names():
+    """Enemy archetype names, by sprite id."""
+    return tuple(sorted(set(get_registry()) | {'enemy'}))
+
+
+def _character(kind, sprite, c, now):
+    flashing = c.flash_timer and now - c.flash_timer < c.flash_duration
+    return (kind, sprite, c.rect.x, c.rect.y, c.state_id, c.anim_index, c.facing, c.current_hp, c.max_hp,
+            FLAG_FLASH if flashing else 0)
+
+
+def capture(scene, ids, names):
+    """The world record table of a Gameplay scene, with entity ids from `ids`."""
+    cam = scene.camera
+    scene_record = (cam.x, cam.y, scene.kill_count, scene.mana, scene.max_mana, scene.enemy_spawn_limit,
+                    1 if scene.is_dead else 0)
+    now = scene.now
+    entities = {}
+    sprite_ids = {name: i for i, name in enumerate(names)}
+    for player in scene.players:
+        entities[ids.get(id(player))] = _character(KIND_PLAYER, 0, player, now)
+    for enemy in scene.enemies:
+        entities[ids.get(id(enemy))] = _character(KIND_ENEMY, sprite_ids.get(enemy.archetype.name, 0), enemy, now)
+
+    horde = getattr(scene, 'horde', None)
+    if horde is not None and horde.count:
+        # horde enemies have no identity beyond their (compacted) index
+        n = horde.count
+        sprite = sprite_ids.get('enemy', 0)
+        columns = [getattr(horde, name)[:n].tolist()
+                   for name in ('x', 'y', 'state', 'anim_index', 'facing', 'hp', 'flash_time')]
+        for i, (x, y, st, frame, facing, hp, flash) in enumerate(zip(*columns)):
+            flashing = flash > 0 and now - flash < horde.flash_duration
+            entities[ids.get(('horde', i))] = (KIND_ENEMY, sprite, int(x), int(y), int(st), int(frame), int(facing),
+                                               int(hp), horde.max_hp, FLAG_FLASH if flashing else 0)
+
+    for p in scene.projectiles:
+        if not p.finished:
+            entities[ids.get(id(p))] = (KIND_FIREBALL, 0, int(p.x), int(p.y), 0, p.frame_index,
+                                        1 if p.vx >= 0 else -1, 0, 0, 0)
+    for eff in scene.effects:
+        if eff.finished:
+            continue
+        if isinstance(eff, FireInBody):
+            if eff.enemy is None:
+                continue
+            center = eff.get_rect().center
+            entities[ids.get(id(eff))] = (KIND_FIRE_IN_BODY, 0, center[0], center[1], 0, eff.frame_index, 1, 0, 0, 0)
+        elif isinstance(eff, Hitspark):
+            entities[ids.get(id(eff))] = (KIND_HITSPARK, 0, eff.x, eff.y, 0, eff.frame_index, 1, 0, 0, 0)
+
+    pickup = scene.health_pickup
+    if pickup is not None:
+        entities[ids.get(id(pickup))] = (KIND_HEALTH, 0, pickup.rect.x, pickup.rect.y, 0, 0, 1, 0, 0, 0)
+    ids.end_frame()
+    return scene_record, entities
+
+
+def hello(scene, names):
+    """MSG_HELLO payload describing the scene being streamed."""
+    return json.dumps({
+        'version': STREAM_VERSION,
+        'scene': scene.__class__.__name__,
+        'screen': [scene.screen_width, scene.screen_height],
+        'world': [scene.world_width, scene.world_height],
+        'ground_y': scene.ground_y,
+        'archetypes': list(names),
+        'fields': list(FIELDS),
+        'scene_fields': list(SCENE_FIELDS),
+    }).encode('utf-8')
+
+
+def message(kind, tick, payload):
+    return _HEADER.pack(kind, tick & 0xFFFFFFFF, len(payload)) + payload
+
+
+class _Subscriber:
+    __slots__ = ('sock', 'pending', 'offset', 'queued', 'synced')
+
+    def __init__(self, sock):
+        self.sock = sock
+        # whole messages waiting to be sent; `offset` bytes of the first are out
+        self.pending = deque()
+        self.offset = 0
+        self.queued = 0
+        self.synced = False
+
+    def push(self, data):
+        self.pending.append(data)
+        self.queued += len(data)
+
+    def drop_backlog(self):
+        """Forget every message not started yet (the stream resumes with a keyframe)."""
+        while len(self.pending) > (1 if self.offset else 0):
+            self.queued -= len(self.pending.pop())
+        self.synced = False
+
+    def flush(self):
+        """Send what the socket takes; returns bytes sent, raises OSError if the peer is gone."""
+        sent = 0
+        while self.pending:
+            head = self.pending[0]
+            try:
+                n = self.sock.send(memoryview(head)[self.offset:])
+            except (BlockingIOError, InterruptedError):
+                break
+            sent += n
+            self.offset += n
+            if self.offset < len(head):
+                break
+            self.pending.popleft()
+            self.queued -= len(head)
+            self.offset = 0
+        return sent
+
+
+class WorldBroadcaster:
+    """Publishes a scene's world to local TCP subscribers (see the module docstring).
+
+    Non-blocking throughout: `publish()` accepts new subscribers, encodes
+    the tick once and queues it for everyone. A subscriber whose queue
+    exceeds `max_backlog` bytes has the unsent messages dropped and gets a
+    keyframe instead; one that disconnects is forgotten. Nothing is
+    captured while nobody is subscribed.
+
+    Counters: `ticks`, `keyframes`, `deltas` (encoded), `bytes_sent`.
+    """
+
+    def __init__(self, port=BROADCAST_PORT, host='127.0.0.1', keyframe_interval=BROADCAST_KEYFRAME_INTERVAL,
+                 max_backlog=BROADCAST_MAX_BACKLOG):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(4)
+        self.server.setblocking(False)
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.max_backlog = int(max_backlog)
+        self.subscribers = []
+        self.ids = WorldIds()
+        self.names = archetype_names()
+        self._scene = None
+        self._hello = None
+        self._prev = None
+
+        self.ticks = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.bytes_sent = 0
+
+    @property
+    def address(self):
+        return self.server.getsockname()
+
+    def publish(self, scene):
+        """Stream the current state of `scene` (call once per tick)."""
+        tick = self.ticks
+        self.ticks += 1
+        self._accept()
+        if not self.subscribers:
+            self._prev = None
+            return
+        if scene is not self._scene:
+            # new scene: fresh ids, and everyone starts over with its hello
+            self._scene = scene
+            self.ids = WorldIds()
+            self._hello = message(MSG_HELLO, tick, hello(scene, self.names))
+            self._prev = None
+            for sub in self.subscribers:
+                sub.push(self._hello)
+                sub.synced = False
+
+        world = capture(scene, self.ids, self.names)
+        periodic = self._prev is None or tick % self.keyframe_interval == 0
+        delta = None
+        keyframe = None
+        if not periodic:
+            delta = message(MSG_DELTA, tick, encode_world(self._prev, world))
+            self.deltas += 1
+        for sub in self.subscribers:
+            if periodic or not sub.synced:
+                if keyframe is None:
+                    keyframe = message(MSG_KEYFRAME, tick, encode_world(EMPTY_WORLD, world))
+                    self.keyframes += 1
+                sub.push(keyframe)
+                sub.synced = True
+            else:
+                sub.push(delta)
+        self._prev = world
+        self._flush()
+
+    def close(self):
+        for sub in self.subscribers:
+            try:
+                sub.sock.close()
+            except Exception:
+                pass
+        self.subscribers = []
+        try:
+            self.server.close()
+        except Exception:
+            pass
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _addr = self.server.accept()
+            except OSError:
+                return
+            sock.setblocking(False)
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+            sub = _Subscriber(sock)
+            if self._hello is not None:
+                sub.push(self._hello)
+            self.subscribers.append(sub)
+
+    def _flush(self):
+        alive = []
+        for sub in self.subscribers:
+            try:
+                self.bytes_sent += sub.flush()
+            except OSError:
+                try:
+                    sub.sock.close()
+                except Exception:
+                    pass
+                continue
+            if sub.queued > self.max_backlog:
+                sub.drop_backlog()
+                # the dropped messages may have included the scene's hello
+                if self._hello is not None:
+                    sub.push(self._hello)
+            alive.append(sub)
+        self.subscribers = alive
+
+
+class WorldStream:
+    """Rebuilds the broadcast world from stream bytes (a socket or a recording).
+
+    `feed(data)` parses the complete messages received so far; afterwards
+    `scene` (SCENE_FIELDS values) and `entities` ({id: FIELDS values}) hold
+    the latest world, `info` the last hello and `tick` its tick. Deltas
+    that arrive before the first keyframe are skipped. Byte counts per
+    message kind are kept for bandwidth reports.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.info = None
+        self.scene, self.entities = EMPTY_WORLD
+        self.tick = -1
+        self.synced = False
+        self.keyframes = 0
+        self.deltas = 0
+        self.keyframe_bytes = 0
+        self.delta_bytes = 0
+
+    def feed(self, data=b'', limit=None):
+        """Buffer `data` and decode up to `limit` world frames (all by default).
+
+        Returns how many world frames were decoded.
+        """
+        buf = self.buffer
+        buf += data
+        decoded = 0
+        start = 0
+        size = _HEADER.size
+        while len(buf) - start >= size and (limit is None or decoded < limit):
+            kind, tick, length = _HEADER.unpack_from(buf, start)
+            end = start + size + length
+            if len(buf) < end:
+                break
+            payload = bytes(buf[start + size:end])
+            start = end
+            if kind == MSG_HELLO:
+                self.info = json.loads(payload.decode('utf-8'))
+                self.scene, self.entities = EMPTY_WORLD
+                self.synced = False
+                continue
+            if kind == MSG_KEYFRAME:
+                self.scene, self.entities = decode_world(EMPTY_WORLD, payload)
+                self.synced = True
+                self.keyframes += 1
+                self.keyframe_bytes += size + length
+            elif kind == MSG_DELTA and self.synced:
+                self.scene, self.entities = decode_world((self.scene, self.entities), payload)
+                self.deltas += 1
+                self.delta_bytes += size + length
+            else:
+                continue
+            self.tick = tick
+            decoded += 1
+        del buf[:start]
+        return decoded
@@ -0,0 +1,71 @@
+from bisect import bisect_right
+
+
+class AnimationTimeline:
+    """Precompiled frame timing for one animation clip.
+
+    Built once from the clip's per-frame durations (ms): the cumulative end
+    time of every frame is stored, so the frame shown after `elapsed` ms is a
+    single `bisect` (or a division when every frame lasts the same) instead of
+    re-summing and scanning the durations each tick. Timelines hold no
+    per-instance state and are shared by every entity/effect playing the clip;
+    the owner only keeps the time the clip started.
+
+    `active` optionally marks the inclusive `(first, last)` frame range on
+    which an attack clip can land a hit; clips without it are active on
+    every frame.
+    """
+
+    __slots__ = ('name', 'durations', 'ends', 'total', 'count', 'step', 'active_first', 'active_last')
+
+    def __init__(self, durations, name=None, active=None):
+        durations = tuple(max(1, int(d)) for d in durations) or (100,)
+        self.name = name
+        self.durations = durations
+        ends = []
+        t = 0
+        for d in durations:
+            t += d
+            ends.append(t)
+        self.ends = tuple(ends)
+        self.total = t
+        self.count = len(durations)
+        # uniform clips resolve with a division, no search needed
+        self.step = durations[0] if len(set(durations)) == 1 else 0
+        if active is None:
+            self.active_first, self.active_last = 0, self.count - 1
+        else:
+            first, last = active
+            self.active_first = max(0, min(int(first), self.count - 1))
+            self.active_last = max(self.active_first, min(int(last), self.count - 1))
+
+    @classmethod
+    def uniform(cls, duration, count, name=None, active=None):
+        """A clip of `count` frames that each last `duration` ms."""
+        return cls((duration,) * max(1, int(count)), name, active)
+
+    def __repr__(self):
+        return f'AnimationTimeline({self.name!r}, {self.count} frames, {self.total} ms)'
+
+    def frame_at(self, elapsed, loop=True):
+        """Frame index shown `elapsed` ms after the clip started.
+
+        Looping clips wrap around; one-shot clips hold their last frame.
+        """
+        if elapsed <= 0:
+            return 0
+        if elapsed >= self.total:
+            if not loop:
+                return self.count - 1
+            elapsed %= self.total
+        if self.step:
+            return int(elapsed // self.step)
+        return bisect_right(self.ends, elapsed)
+
+    def is_active(self, frame):
+        """True if `frame` lies in the clip's hit-active window."""
+        return self.active_first <= frame <= self.active_last
+
+    def finished(self, elapsed):
+        """True once a one-shot clip has played its last frame in full."""
+        return elapsed >= self.total
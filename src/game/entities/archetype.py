@@ -0,0 +1,277 @@
+import json
+import os
+import pygame
+
+from ..settings import HITBOX_WIDTH, HITBOX_HEIGHT
+from .animation import AnimationTimeline
+from .states import STATE_NAMES
+
+# frame sets shared between archetypes that use the same sprite set:
+# (sprite_dir, sprites, width, height) -> {state: [frames]}
+_FRAME_SETS = {}
+
+# see set_placeholder_frames()
+_PLACEHOLDER_FRAMES = False
+
+
+def set_placeholder_frames(enabled=True):
+    """Skip decoding spritesheets for archetypes loaded from now on.
+
+    For simulations that never draw (tools/balance_sim.py): each state
+    gets its frame count of one blank frame of the right size, so the
+    animation timelines, and with them the simulation, are unchanged.
+    """
+    global _PLACEHOLDER_FRAMES
+    _PLACEHOLDER_FRAMES = bool(enabled)
+
+
+class Archetype:
+    """Immutable per-type data shared by every entity of one kind.
+
+    Holds everything that is the same for all instances of a type (sprite
+    size, hitbox geometry, movement constants, HP, timings, AI distances and
+    the frame-duration table) plus the animation frames, which are sliced
+    from the spritesheets once per archetype instead of once per entity, and
+    the compiled `AnimationTimeline` of every state. `state_frames` and
+    `state_clips` expose the same data as lists indexed by integer state id.
+
+    `hit_frames` maps an attack state to the inclusive `(first, last)` frame
+    range on which it can land a hit (frame data for its timeline).
+
+    `sprites` maps a state name to `(filename, frame_count)` inside
+    `assets/images/<sprite_dir>`. Archetypes with the same sprite set and
+    size share a single frame set.
+    """
+
+    __slots__ = ('name', 'width', 'height', 'hitbox_width', 'hitbox_height',
+                 'hitbox_offset_x', 'hitbox_offset_y', 'speed', 'gravity', 'knockback_decay',
+                 'jump_power', 'max_hp', 'hit_cooldown_duration', 'flash_duration',
+                 'detection_range', 'attack_distance', 'retreat_distance', 'attack_cooldown_duration',
+                 'frame_durations', 'hit_frames', 'sprite_dir', 'sprites', 'fallback_color', 'spawn_weight',
+                 'unlock_kills', '_animations', '_timelines', '_state_frames',
+                 '_state_clips')
+
+    def __init__(self, name, width, height, hitbox_width, hitbox_height, speed, gravity=0.6,
+                 knockback_decay=0.85, jump_power=0, max_hp=1, hit_cooldown_duration=300,
+                 flash_duration=180, detection_range=0, attack_distance=0, retreat_distance=0,
+                 attack_cooldown_duration=0, frame_durations=None, hit_frames=None, sprite_dir=None,
+                 sprites=None, fallback_color=(255, 0, 0, 128), spawn_weight=0, unlock_kills=0):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.hitbox_width = hitbox_width
+        self.hitbox_height = hitbox_height
+        self.hitbox_offset_x = (width - hitbox_width) // 2
+        self.hitbox_offset_y = (height - hitbox_height) // 2
+        self.speed = speed
+        self.gravity = gravity
+        self.knockback_decay = knockback_decay
+        self.jump_power = jump_power
+        self.max_hp = max_hp
+        self.hit_cooldown_duration = hit_cooldown_duration
+        self.flash_duration = flash_duration
+        self.detection_range = detection_range
+        self.attack_distance = attack_distance
+        self.retreat_distance = retreat_distance
+        self.attack_cooldown_duration = attack_cooldown_duration
+        self.frame_durations = dict(frame_durations or {})
+        self.hit_frames = {state: tuple(window) for state, window in (hit_frames or {}).items()}
+        self.sprite_dir = sprite_dir
+        self.sprites = dict(sprites or {})
+        self.fallback_color = tuple(fallback_color)
+        # random spawn selection: relative weight, and kills needed before it appears
+        self.spawn_weight = spawn_weight
+        self.unlock_kills = unlock_kills
+        self._animations = None
+        self._timelines = None
+        self._state_frames = None
+        self._state_clips = None
+
+    def __repr__(self):
+        return f'Archetype({self.name!r})'
+
+    @property
+    def animations(self):
+        """State name -> list of frames, loaded on first use and then shared."""
+        if self._animations is None:
+            frames = _FRAME_SETS.get(self._frame_key())
+            self._animations = frames if frames is not None else self.load_animations()
+        return self._animations
+
+    @property
+    def timelines(self):
+        """State name -> `AnimationTimeline`, compiled once from the frame counts and durations."""
+        if self._timelines is None:
+            durations = self.frame_durations
+            self._timelines = {
+                state: AnimationTimeline.uniform(durations.get(state, 100), len(frames), state,
+                                                 self.hit_frames.get(state))
+                for state, frames in self.animations.items() if frames
+            }
+        return self._timelines
+
+    @property
+    def state_frames(self):
+        """Frames per integer state id (None for states this type has no sprites for)."""
+        if self._state_frames is None:
+            animations = self.animations
+            self._state_frames = [animations.get(name) or None for name in STATE_NAMES]
+        return self._state_frames
+
+    @property
+    def state_clips(self):
+        """`AnimationTimeline` per integer state id (None where there are no frames)."""
+        if self._state_clips is None:
+            timelines = self.timelines
+            self._state_clips = [timelines.get(name) for name in STATE_NAMES]
+        return self._state_clips
+
+    def preload(self):
+        """Load the frames now if needed, so it does not happen mid-frame."""
+        return self.animations
+
+    def _frame_key(self):
+        return (self.sprite_dir or self.name, tuple(sorted(self.sprites.items())), self.width, self.height)
+
+    def _fallback_frame(self):
+        surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        surf.fill(self.fallback_color)
+        return surf
+
+    def load_animations(self):
+        """(Re)load and slice every spritesheet of this archetype."""
+        base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        assets_dir = os.path.join(base, 'assets', 'images', self.sprite_dir or self.name)
+
+        animations = {}
+        for state, (filename, frame_count) in self.sprites.items():
+            path = os.path.join(assets_dir, filename)
+            frames_list = []
+
+            if os.path.exists(path) and _PLACEHOLDER_FRAMES:
+                frames_list = [pygame.Surface((self.width, self.height), pygame.SRCALPHA)] * frame_count
+            elif os.path.exists(path):
+                try:
+                    if pygame.display.get_init():
+                        sheet = pygame.image.load(path).convert_alpha()
+                    else:
+                        sheet = pygame.image.load(path)
+                    sheet_w, sheet_h = sheet.get_size()
+
+                    frame_w = max(1, sheet_w // frame_count)
+
+                    for i in range(frame_count):
+                        rect = pygame.Rect(i * frame_w, 0, frame_w, sheet_h)
+                        frame = pygame.Surface(rect.size, pygame.SRCALPHA)
+                        frame.blit(sheet, (0, 0), rect)
+
+                        frame = pygame.transform.smoothscale(frame, (self.width, self.height))
+                        frames_list.append(frame)
+
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+                    frames_list = [self._fallback_frame()]
+            else:
+                print(f"File not found: {path}")
+
+            animations[state] = frames_list or [self._fallback_frame()]
+
+        # reuse the dict object so archetypes already sharing it see the reload
+        key = self._frame_key()
+        cached = _FRAME_SETS.get(key)
+        if cached is not None:
+            cached.clear()
+            cached.update(animations)
+            animations = cached
+        else:
+            _FRAME_SETS[key] = animations
+        self._animations = animations
+        # frame counts may have changed
+        self._timelines = None
+        self._state_frames = None
+        self._state_clips = None
+        return animations
+
+
+def shared(name):
+    """Read-only instance attribute forwarded to the entity's archetype."""
+    return property(lambda self: getattr(self.archetype, name), doc=f'Archetype `{name}` (read-only).')
+
+
+def _registry_path():
+    base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    return os.path.join(base, 'enemies.json')
+
+
+_ARCHETYPE_FIELDS = ('speed', 'gravity', 'knockback_decay', 'max_hp', 'hit_cooldown_duration',
+                     'flash_duration', 'detection_range', 'attack_distance', 'retreat_distance',
+                     'attack_cooldown_duration', 'frame_durations', 'hit_frames', 'spawn_weight',
+                     'unlock_kills', 'hitbox_width', 'hitbox_height')
+
+
+def load_registry(path=None):
+    """Build enemy archetypes from `enemies.json` (next to `config.json`).
+
+    The file has two sections: `sprite_sets` (asset folder, frame size and
+    `state: [filename, frame_count]` entries) and `archetypes`, whose entries
+    pick a `sprite_set`, set the parameters in `_ARCHETYPE_FIELDS` and may
+    `extends` another archetype to inherit everything they do not override.
+    Returns `{name: Archetype}`; raises on a missing or malformed file.
+    """
+    path = path or _registry_path()
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    sprite_sets = data.get('sprite_sets', {})
+    raw = data.get('archetypes', {})
+
+    resolved = {}
+
+    def _resolve(name, chain=()):
+        if name in resolved:
+            return resolved[name]
+        if name in chain:
+            raise ValueError(f'archetype inheritance cycle: {" -> ".join(chain + (name,))}')
+        entry = dict(raw[name])
+        parent = entry.pop('extends', None)
+        if parent:
+            merged = dict(_resolve(parent, chain + (name,)))
+            merged.update(entry)
+            entry = merged
+        resolved[name] = entry
+        return entry
+
+    registry = {}
+    for name in raw:
+        entry = _resolve(name)
+        sprite_set = sprite_sets[entry.get('sprite_set', name)]
+        params = {k: entry[k] for k in _ARCHETYPE_FIELDS if k in entry}
+        params.setdefault('hitbox_width', HITBOX_WIDTH)
+        params.setdefault('hitbox_height', HITBOX_HEIGHT)
+        registry[name] = Archetype(
+            name,
+            width=int(sprite_set.get('width', 304)),
+            height=int(sprite_set.get('height', 160)),
+            sprite_dir=sprite_set.get('dir', entry.get('sprite_set', name)),
+            sprites={state: (fn, int(count)) for state, (fn, count) in sprite_set.get('frames', {}).items()},
+            **params,
+        )
+    return registry
+
+
+_REGISTRY = None
+
+
+def get_registry():
+    """The enemy archetype registry, loaded once on first use."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        try:
+            _REGISTRY = load_registry()
+        except Exception as e:
+            print(f"Could not load enemy archetypes: {e}")
+            _REGISTRY = {}
+    return _REGISTRY
+
+
+def get_archetype(name, default=None):
+    return get_registry().get(name, default)
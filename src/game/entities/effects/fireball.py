@@ -1,31 +1,47 @@
 import os
 import pygame
 
+from .pool import Pooled
+from ..animation import AnimationTimeline
 
-class Fireball:
+
+class Fireball(Pooled):
     """Projectile fireball that uses a 3-frame horizontal sprite-sheet
 
     Expects assets/images/effects/fireBall.png with 3 frames. Each frame is
     roughly 48x12 (as provided by the user). Frames are scaled for visibility.
+
+    Instances are pooled: spawn with `Fireball.acquire(x, y, direction)`.
     """
 
+    __slots__ = ('speed', 'vx', 'vy', 'x', 'y', 'spawn_time', 'lifetime_ms', 'finished',
+                 'frame_index', 'frame_started', 'rect', 'radius')
+
     _frames = None
 
-    def __init__(self, x, y, direction, speed=12, lifetime_ms=3000):
+    FRAME_DURATIONS = (80, 80, 80)
+    TIMELINE = AnimationTimeline(FRAME_DURATIONS, 'fireball')
+
+    def __init__(self, x, y, direction, speed=12, lifetime_ms=3000, now=None):
+        self.rect = None
+        self.reset(x, y, direction, speed, lifetime_ms, now)
+
+    def reset(self, x, y, direction, speed=12, lifetime_ms=3000, now=None):
         # x,y is the spawn center position
         self.speed = speed
         self.vx = speed * (1 if direction >= 0 else -1)
         self.vy = 0
         self.x = x
         self.y = y
-        self.spawn_time = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
+        self.spawn_time = now
         self.lifetime_ms = lifetime_ms
         self.finished = False
 
         # animation state
         self.frame_index = 0
-        self.frame_started = pygame.time.get_ticks()
-        self.frame_durations = [80, 80, 80]
+        self.frame_started = now
 
         if Fireball._frames is None:
             Fireball._load_frames()
@@ -33,10 +49,15 @@ class Fireball:
         # default rect from first frame if available
         if Fireball._frames and len(Fireball._frames) > 0:
             fw, fh = Fireball._frames[0].get_size()
-            self.rect = pygame.Rect(int(self.x - fw // 2), int(self.y - fh // 2), fw, fh)
+            box = (int(self.x - fw // 2), int(self.y - fh // 2), fw, fh)
         else:
             self.radius = 14
-            self.rect = pygame.Rect(int(self.x - self.radius), int(self.y - self.radius), self.radius * 2, self.radius * 2)
+            box = (int(self.x - self.radius), int(self.y - self.radius), self.radius * 2, self.radius * 2)
+        # a recycled fireball keeps its Rect
+        if self.rect is None:
+            self.rect = pygame.Rect(box)
+        else:
+            self.rect.update(box)
 
     @classmethod
     def _load_frames(cls):
@@ -67,23 +88,16 @@ class Fireball:
                 pygame.draw.circle(surf, (255, 180, 60), (14, 14), 12)
                 cls._frames.append(surf)
 
-    def update(self, world_width=None, world_height=None):
+    def update(self, world_width=None, world_height=None, now=None):
         if self.finished:
             return
         self.x += self.vx
         self.y += self.vy
 
         # animation frame update
-        now = pygame.time.get_ticks()
-        elapsed = now - self.frame_started
-        dur_sum = sum(self.frame_durations)
-        t = elapsed % dur_sum
-        s = 0
-        for i, d in enumerate(self.frame_durations):
-            s += d
-            if t < s:
-                self.frame_index = i
-                break
+        if now is None:
+            now = pygame.time.get_ticks()
+        self.frame_index = self.TIMELINE.frame_at(now - self.frame_started)
 
         # update rect
         if Fireball._frames and len(Fireball._frames) > 0:
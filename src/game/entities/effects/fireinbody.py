@@ -1,31 +1,48 @@
 import os
 import pygame
 
+from .pool import Pooled
+from ..animation import AnimationTimeline
 
-class FireInBody:
+
+class FireInBody(Pooled):
     """Looping fire-in-body effect attached to an enemy.
 
     Loads `assets/images/effects/fireInBody.png` (4 frames horizontally).
     The effect is positioned relative to the enemy's rect center and will
     mark itself finished when the enemy's death animation has finished
     (same condition used when gameplay removes enemies).
+
+    Instances are pooled: spawn with `FireInBody.acquire(enemy, offset)`.
     """
 
+    __slots__ = ('enemy', 'frame_index', 'started', 'finished', 'offset_y')
+
     _frames = None
 
-    def __init__(self, enemy, impact_offset_y=0):
+    # per-frame duration
+    FRAME_DURATIONS = (120, 120, 120, 120)
+    TIMELINE = AnimationTimeline(FRAME_DURATIONS, 'fire_in_body')
+
+    def __init__(self, enemy, impact_offset_y=0, now=None):
+        self.reset(enemy, impact_offset_y, now)
+
+    def reset(self, enemy, impact_offset_y=0, now=None):
         self.enemy = enemy
         self.frame_index = 0
-        self.started = pygame.time.get_ticks()
+        self.started = pygame.time.get_ticks() if now is None else now
         self.finished = False
-        # per-frame duration
-        self.frame_durations = [120, 120, 120, 120]
         # offset relative to enemy center (pixels). Positive moves effect down
         self.offset_y = int(impact_offset_y)
 
         if FireInBody._frames is None:
             FireInBody._load_frames()
 
+    def release(self):
+        # do not keep the dead enemy alive through the pool
+        self.enemy = None
+        super().release()
+
     @classmethod
     def _load_frames(cls):
         base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -56,10 +73,11 @@ class FireInBody:
                 surf.fill((255, 140, 40))
                 cls._frames.append(surf)
 
-    def update(self):
+    def update(self, now=None):
         if self.finished:
             return
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         # if the enemy is in death state and its death_time passed the removal threshold, finish
         try:
             if getattr(self.enemy, 'current_hp', 0) <= 0 and getattr(self.enemy, 'death_time', 0) > 0 and now - self.enemy.death_time > 1000:
@@ -68,17 +86,8 @@ class FireInBody:
         except Exception:
             pass
 
-        # advance frame based on durations looping
-        total = 0
-        elapsed = now - self.started
-        dur_sum = sum(self.frame_durations)
-        t = elapsed % dur_sum
-        s = 0
-        for i, d in enumerate(self.frame_durations):
-            s += d
-            if t < s:
-                self.frame_index = i
-                break
+        # looping frame from the precompiled timeline
+        self.frame_index = self.TIMELINE.frame_at(now - self.started)
 
     def draw(self, surface, camera):
         if self.finished:
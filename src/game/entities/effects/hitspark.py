@@ -1,24 +1,38 @@
 import os
 import pygame
 
+from .pool import Pooled
+from ..animation import AnimationTimeline
 
-class Hitspark:
+
+class Hitspark(Pooled):
     """Simple 2-frame hit spark effect.
 
     Loads `assets/images/effects/hitspark.png` which is expected to contain
     2 horizontal frames (each ~80x39). The effect plays once and then marks
     itself finished. Frames are scaled up by 2x to match requested size.
+
+    Instances are pooled: spawn with `Hitspark.acquire(x, y)`.
     """
 
+    __slots__ = ('x', 'y', 'started', 'frame_index', 'finished')
+
     _frames = None
     _frame_w = 80
     _frame_h = 39
 
-    def __init__(self, x, y):
+    # default durations per frame (ms), shared by every instance
+    FRAME_DURATIONS = (80, 80)
+    TIMELINE = AnimationTimeline(FRAME_DURATIONS, 'hitspark')
+
+    def __init__(self, x, y, now=None):
+        self.reset(x, y, now)
+
+    def reset(self, x, y, now=None):
         # world coordinates where the center of the hitspark should be drawn
         self.x = int(x)
         self.y = int(y)
-        self.started = pygame.time.get_ticks()
+        self.started = pygame.time.get_ticks() if now is None else now
         self.frame_index = 0
         self.finished = False
 
@@ -26,9 +40,6 @@ class Hitspark:
         if Hitspark._frames is None:
             Hitspark._load_frames()
 
-        # default durations per frame (ms)
-        self.frame_durations = [80, 80]
-
     @classmethod
     def _load_frames(cls):
         base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -68,20 +79,18 @@ class Hitspark:
                 pygame.draw.ellipse(surf, (255, 220, 100), surf.get_rect())
                 cls._frames.append(surf)
 
-    def update(self):
+    def update(self, now=None):
         if self.finished:
             return
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         elapsed = now - self.started
-        total = 0
-        for i, d in enumerate(self.frame_durations):
-            total += d
-            if elapsed < total:
-                self.frame_index = i
-                break
-        else:
+        timeline = self.TIMELINE
+        if elapsed >= timeline.total:
             # animation finished
             self.finished = True
+            return
+        self.frame_index = timeline.frame_at(elapsed, loop=False)
 
     def draw(self, surface, camera):
         if self.finished:
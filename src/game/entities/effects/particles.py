@@ -0,0 +1,194 @@
+import math
+import pygame
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+
+# Emitter presets. Speeds are px/tick, life is in ticks, gravity is added to
+# vy every tick and drag multiplies the velocity every tick. `spread` is the
+# emission cone in degrees around `angle` (0 = right, 90 = down).
+PRESETS = {
+    'hit': {
+        'count': 18, 'colors': ((255, 236, 170), (255, 190, 80), (255, 255, 255)),
+        'speed': (3.0, 9.0), 'angle': 0, 'spread': 140, 'life': (8, 18),
+        'gravity': 0.35, 'drag': 0.88, 'size': (1, 3),
+    },
+    'kill': {
+        'count': 40, 'colors': ((150, 20, 24), (200, 40, 40), (90, 10, 14)),
+        'speed': (2.0, 7.0), 'angle': -90, 'spread': 220, 'life': (20, 40),
+        'gravity': 0.45, 'drag': 0.93, 'size': (2, 4),
+    },
+    'fire': {
+        'count': 28, 'colors': ((255, 210, 90), (255, 140, 40), (220, 60, 20)),
+        'speed': (1.5, 6.0), 'angle': -90, 'spread': 200, 'life': (14, 30),
+        'gravity': -0.12, 'drag': 0.9, 'size': (2, 4),
+    },
+    'trail': {
+        'count': 2, 'colors': ((255, 170, 60), (240, 90, 30)),
+        'speed': (0.3, 1.2), 'angle': -90, 'spread': 120, 'life': (8, 16),
+        'gravity': -0.08, 'drag': 0.92, 'size': (1, 3),
+    },
+    'dust': {
+        'count': 10, 'colors': ((150, 140, 125), (110, 102, 92)),
+        'speed': (0.5, 2.5), 'angle': -90, 'spread': 160, 'life': (16, 28),
+        'gravity': -0.02, 'drag': 0.9, 'size': (2, 4),
+    },
+}
+
+_MAX_SIZE = 4       # particle squares are 1..4 px, scaled by `scale`
+_FADE_LEVELS = 8    # alpha steps used while a particle fades out
+
+
+class ParticleSystem:
+    """Thousands of particles held in NumPy arrays.
+
+    Each particle has position, velocity, remaining/initial life, a palette
+    color, a size and per-particle gravity/drag (from the preset that emitted
+    it). `update()` integrates every live particle in one vectorized step and
+    compacts out the dead ones; `draw()` culls to the screen and renders all
+    visible particles with a single `Surface.blits` call using prebuilt
+    square stamps (one per color, size and fade level).
+
+    Emit with `emit(x, y, 'hit')` etc. (see `PRESETS`); 'dust' puffs up
+    where a knight lands (the `Land` event, see events.py). Without numpy the
+    system is disabled and every method is a no-op.
+    """
+
+    def __init__(self, capacity=4096, scale=2, presets=None):
+        self.presets = presets or PRESETS
+        self.capacity = int(capacity)
+        self.scale = max(1, int(scale))
+        self.count = 0
+        self.enabled = np is not None
+        if not self.enabled:
+            return
+
+        palette = []
+        for preset in self.presets.values():
+            for color in preset['colors']:
+                if color not in palette:
+                    palette.append(color)
+        self._palette = palette
+        self._color_ids = {
+            name: np.array([palette.index(c) for c in preset['colors']], dtype=np.int32)
+            for name, preset in self.presets.items()
+        }
+        self._stamps = self._build_stamps(palette)
+        self._rng = np.random.default_rng()
+
+        n = self.capacity
+        self.x = np.zeros(n, dtype=np.float32)
+        self.y = np.zeros(n, dtype=np.float32)
+        self.vx = np.zeros(n, dtype=np.float32)
+        self.vy = np.zeros(n, dtype=np.float32)
+        self.gravity = np.zeros(n, dtype=np.float32)
+        self.drag = np.ones(n, dtype=np.float32)
+        self.life = np.zeros(n, dtype=np.int32)
+        self.max_life = np.ones(n, dtype=np.int32)
+        self.color = np.zeros(n, dtype=np.int32)
+        self.size = np.zeros(n, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def _build_stamps(self, palette):
+        # flat list indexed by (color * _MAX_SIZE + size - 1) * _FADE_LEVELS + level
+        stamps = []
+        for color in palette:
+            for size in range(1, _MAX_SIZE + 1):
+                side = size * self.scale
+                for level in range(_FADE_LEVELS):
+                    surf = pygame.Surface((side, side), pygame.SRCALPHA)
+                    alpha = int(255 * (level + 1) / _FADE_LEVELS)
+                    surf.fill((color[0], color[1], color[2], alpha))
+                    stamps.append(surf)
+        return stamps
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, preset='hit', count=None, direction=1):
+        """Spawn particles of `preset` at world (x, y).
+
+        `direction` mirrors the emission cone horizontally (use the attacker's
+        facing so sparks fly away from the blow). Particles that do not fit in
+        the remaining capacity are dropped.
+        """
+        if not self.enabled:
+            return 0
+        p = self.presets[preset]
+        k = min(int(p['count'] if count is None else count), self.capacity - self.count)
+        if k <= 0:
+            return 0
+        rng = self._rng
+        sl = slice(self.count, self.count + k)
+
+        angle = math.radians(p['angle'])
+        if direction < 0:
+            angle = math.pi - angle
+        half = math.radians(p['spread']) / 2.0
+        theta = rng.uniform(angle - half, angle + half, k)
+        speed = rng.uniform(p['speed'][0], p['speed'][1], k)
+        life = rng.integers(p['life'][0], p['life'][1] + 1, k)
+
+        self.x[sl] = x
+        self.y[sl] = y
+        self.vx[sl] = np.cos(theta) * speed
+        self.vy[sl] = np.sin(theta) * speed
+        self.gravity[sl] = p['gravity']
+        self.drag[sl] = p['drag']
+        self.life[sl] = life
+        self.max_life[sl] = life
+        self.color[sl] = rng.choice(self._color_ids[preset], k)
+        self.size[sl] = rng.integers(p['size'][0], min(_MAX_SIZE, p['size'][1]) + 1, k)
+        self.count += k
+        return k
+
+    def update(self):
+        """Advance every particle by one tick and drop the expired ones."""
+        n = self.count
+        if not n:
+            return
+        vx = self.vx[:n]
+        vy = self.vy[:n]
+        drag = self.drag[:n]
+        vx *= drag
+        vy *= drag
+        vy += self.gravity[:n]
+        self.x[:n] += vx
+        self.y[:n] += vy
+        life = self.life[:n]
+        life -= 1
+
+        alive = life > 0
+        k = int(np.count_nonzero(alive))
+        if k == n:
+            return
+        for arr in (self.x, self.y, self.vx, self.vy, self.gravity, self.drag,
+                    self.life, self.max_life, self.color, self.size):
+            arr[:k] = arr[:n][alive]
+        self.count = k
+
+    def draw(self, surface, camera_x, camera_y):
+        """Blit every on-screen particle in one batch. Returns how many were drawn."""
+        n = self.count
+        if not n:
+            return 0
+        w, h = surface.get_size()
+        sx = (self.x[:n] - camera_x).astype(np.int32)
+        sy = (self.y[:n] - camera_y).astype(np.int32)
+        margin = _MAX_SIZE * self.scale
+        visible = (sx > -margin) & (sx < w) & (sy > -margin) & (sy < h)
+        idx = np.flatnonzero(visible)
+        if not len(idx):
+            return 0
+        level = (self.life[idx] * _FADE_LEVELS - 1) // self.max_life[idx]
+        stamp = (self.color[idx] * _MAX_SIZE + self.size[idx] - 1) * _FADE_LEVELS + level
+        stamps = self._stamps
+        half = (self.size[idx] * self.scale) // 2
+        xs = (sx[idx] - half).tolist()
+        ys = (sy[idx] - half).tolist()
+        surface.blits([(stamps[s], (px, py)) for s, px, py in zip(stamp.tolist(), xs, ys)], doreturn=False)
+        return len(idx)
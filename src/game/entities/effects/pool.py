@@ -0,0 +1,64 @@
+"""Free-list pooling for short-lived effects and projectiles.
+
+Effects are created on every hit/cast and die a few hundred ms later. Instead
+of allocating a new object each time, finished instances go back to a
+per-class free list and `acquire()` re-initializes one of them through
+`reset()`, which takes the same arguments as the constructor.
+"""
+
+
+class Pooled:
+    """Mixin giving a class its own free list.
+
+    Subclasses define `__slots__` and a `reset(...)` method that (re)initializes
+    every slot; their `__init__` should simply call `reset`.
+    """
+
+    __slots__ = ()
+
+    # upper bound on idle instances kept per class
+    POOL_LIMIT = 64
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._free = []
+
+    @classmethod
+    def acquire(cls, *args, **kwargs):
+        free = cls._free
+        if free:
+            obj = free.pop()
+            obj.reset(*args, **kwargs)
+            return obj
+        return cls(*args, **kwargs)
+
+    @classmethod
+    def drain(cls):
+        """Drop every idle instance kept for this class."""
+        del cls._free[:]
+
+    def release(self):
+        """Return this instance to its class pool. It must not be used afterwards."""
+        free = self.__class__._free
+        if len(free) < self.POOL_LIMIT:
+            free.append(self)
+
+
+def compact(items):
+    """Drop finished items from `items` in place, releasing pooled ones.
+
+    Survivors keep their order and the list object is reused, so callers that
+    hold a reference to it stay valid. Returns how many items were removed.
+    """
+    write = 0
+    for obj in items:
+        if getattr(obj, 'finished', False):
+            if isinstance(obj, Pooled):
+                obj.release()
+            continue
+        items[write] = obj
+        write += 1
+    removed = len(items) - write
+    if removed:
+        del items[write:]
+    return removed
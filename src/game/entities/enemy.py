@@ -1,8 +1,58 @@
-import os
 import pygame
-from ..settings import HITBOX_WIDTH, HITBOX_HEIGHT
-
-class Enemy:
+from ..settings import HITBOX_WIDTH, HITBOX_HEIGHT, ATTACK_RANGE, ATTACK_HEIGHT_FACTOR
+from .archetype import Archetype, shared, get_archetype
+from .effects.pool import Pooled
+from .states import (STATE_FLAGS, ON_FINISH, LOCKED, ATTACKING, STUNNED, DEAD, IDLE, RUN, ATTACK1, ATTACK2,
+                     HIT, DEATH, state_property)
+
+# level-of-detail tiers for Enemy.update (picked by Gameplay from the camera)
+LOD_FULL, LOD_REDUCED, LOD_FAR = range(3)
+
+# built-in stats, used when enemies.json has no 'enemy' entry
+ENEMY_ARCHETYPE = Archetype(
+    'enemy',
+    width=304,
+    height=160,
+    hitbox_width=HITBOX_WIDTH,
+    hitbox_height=HITBOX_HEIGHT,
+    speed=3.0,
+    gravity=0.6,
+    knockback_decay=0.85,
+    max_hp=4,
+    hit_cooldown_duration=300,
+    flash_duration=180,
+    detection_range=500,
+    attack_distance=200,
+    retreat_distance=150,
+    attack_cooldown_duration=2000,
+    frame_durations={
+        'idle': 100,
+        'run': 90,
+        'turn': 120,
+        'attack1': 80,
+        'attack2': 80,
+        'hit': 150,
+        'death': 100,
+    },
+    # frames on which each attack can land a hit (the blade is extended)
+    hit_frames={
+        'attack1': (1, 2),
+        'attack2': (2, 3),
+    },
+    sprite_dir='enemy',
+    sprites={
+        'idle': ('_Idle.png', 10),
+        'run': ('_Run.png', 10),
+        'turn': ('_TurnAround.png', 3),
+        'attack1': ('_Attack.png', 4),
+        'attack2': ('_Attack2.png', 6),
+        'hit': ('_Hit.png', 1),
+        'death': ('_Death.png', 10),
+    },
+)
+
+
+class Enemy(Pooled):
     """Enemy with sprite-based animations and AI behavior.
 
     Animations are loaded from src/assets/images/enemy spritesheets.
@@ -16,136 +66,118 @@ class Enemy:
     - Attack 2: 6 frames
     - Hit: 1 frame
     - Death: 10 frames
-    """
-
-    def __init__(self, x, y):
 
-        self.width = 304
-        self.height = 160
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-
-        self.hitbox_width = HITBOX_WIDTH
-        self.hitbox_height = HITBOX_HEIGHT
+    Per-type constants (sizes, speeds, distances, timings, frames) live in a
+    shared `Archetype` from the enemies.json registry; instances only carry
+    mutable state in `__slots__`. The current state is an integer id from
+    `states` (`state` gives its name). Enemies are pooled: `Enemy.acquire()`
+    recycles released instances through `reset()`.
+    """
 
-        self.hitbox_offset_x = (self.width - self.hitbox_width) // 2
-        self.hitbox_offset_y = (self.height - self.hitbox_height) // 2
+    __slots__ = ('archetype', 'rect', 'hitbox', 'attack_box', '_hitbox_x', '_hitbox_y',
+                 'vel_x', 'vel_y', 'on_ground', 'facing', 'state_id', 'anim_index', 'anim_start',
+                 'current_hp', 'hit_cooldown', 'death_time', 'flash_timer', 'attack_cooldown',
+                 'locked', '_next_attack_is_two', 'knockback_vel_x', 'swing', 'swing_hits')
+
+    state = state_property()
+
+    width = shared('width')
+    height = shared('height')
+    hitbox_width = shared('hitbox_width')
+    hitbox_height = shared('hitbox_height')
+    hitbox_offset_x = shared('hitbox_offset_x')
+    hitbox_offset_y = shared('hitbox_offset_y')
+    speed = shared('speed')
+    gravity = shared('gravity')
+    knockback_decay = shared('knockback_decay')
+    max_hp = shared('max_hp')
+    hit_cooldown_duration = shared('hit_cooldown_duration')
+    flash_duration = shared('flash_duration')
+    detection_range = shared('detection_range')
+    attack_distance = shared('attack_distance')
+    retreat_distance = shared('retreat_distance')
+    attack_cooldown_duration = shared('attack_cooldown_duration')
+    frame_durations = shared('frame_durations')
+    animations = shared('animations')
+
+    # idle enemies kept for reuse (see Gameplay._remove_dead_enemies)
+    POOL_LIMIT = 32
+
+    def __init__(self, x, y, archetype=None, now=None):
+        self.archetype = None
+        self.rect = pygame.Rect(x, y, 0, 0)
+        # persistent collision rects, refreshed by get_hitbox()/get_attack_box()
+        # instead of allocating a new Rect per call
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.attack_box = pygame.Rect(0, 0, ATTACK_RANGE, 8)
+        self.reset(x, y, archetype, now)
+
+    def reset(self, x, y, archetype=None, now=None):
+        """(Re)initialize every slot for a fresh enemy at (x, y).
+
+        Used by `__init__` and by `Enemy.acquire()` when a pooled enemy is
+        recycled; the rects are resized in place rather than reallocated.
+        """
+        # an Archetype, a registry name from enemies.json, or None for 'enemy'
+        if not isinstance(archetype, Archetype):
+            archetype = get_archetype(archetype or 'enemy') or get_archetype('enemy', ENEMY_ARCHETYPE)
+        if archetype is not self.archetype:
+            self.archetype = archetype
+            self.hitbox.size = (int(self.hitbox_width), int(self.hitbox_height))
+            self.attack_box.height = max(8, int(self.hitbox_height * ATTACK_HEIGHT_FACTOR))
+            # frames are sliced once per archetype and shared by every enemy
+            archetype.preload()
+
+        self.rect.update(x, y, self.width, self.height)
+        self._hitbox_x = None
+        self._hitbox_y = None
 
-        self.speed = 3.0
         self.vel_x = 0
         self.vel_y = 0
-        self.gravity = 0.6
         self.on_ground = False
-        self.facing = 1  
+        self.facing = 1
 
-        self.animations = {}  
-        self.state = 'idle'
+        self.state_id = IDLE
         self.anim_index = 0
-        self.last_anim_time = pygame.time.get_ticks()
-
-        self.frame_durations = {
-            'idle': 100,
-            'run': 90,
-            'turn': 120,
-            'attack1': 80,
-            'attack2': 80,
-            'hit': 150,
-            'death': 100,
-        }
-
-        self.max_hp = 4  
-        self.current_hp = 4
+        self.anim_start = pygame.time.get_ticks() if now is None else now
+
+        # attack instance counter and the targets the current swing has hit
+        self.swing = 0
+        self.swing_hits = None
+
+        self.current_hp = self.max_hp
         self.hit_cooldown = 0
-        self.hit_cooldown_duration = 300  
-        self.death_time = 0  
+        self.death_time = 0
 
         self.flash_timer = 0
-        self.flash_duration = 180
 
-        self.detection_range = 500  
-        self.attack_distance = 200  
-        self.retreat_distance = 150  
         self.attack_cooldown = 0
-        self.attack_cooldown_duration = 2000  
-        self.locked = False  
+        self.locked = False
 
-    # internal pursuit tracking removed (not used externally)
-        self._next_attack_is_two = False  
+        self._next_attack_is_two = False
 
         self.knockback_vel_x = 0
-        self.knockback_decay = 0.85
-
-        self._load_sprites()
 
     def _load_sprites(self):
-        """Load sprites from spritesheet files in src/assets/images/enemy.
-
-        Asset files (individual spritesheets):
-        - _Idle.png: 10 frames
-        - _Run.png: 10 frames
-        - _TurnAround.png: 3 frames
-        - _Attack.png: 4 frames (Attack 1)
-        - _Attack2.png: 6 frames (Attack 2)
-        - _Hit.png: 1 frame
-        - _Death.png: 10 frames
+        """Reload this enemy type's spritesheets (shared by all enemies of the type)."""
+        self.archetype.load_animations()
+
+    def update(self, player, world_width, world_height, ground_y, now=None, lod=LOD_FULL, think=True):
+        """Advance one tick.
+
+        `lod` trades fidelity for cost on enemies the camera cannot see:
+        LOD_FULL runs everything; LOD_REDUCED keeps physics and state
+        transitions but only runs the AI when `think` is set and does not
+        resolve animation frames; LOD_FAR is a coarse kinematic step only,
+        skipped entirely while the enemy is at rest on the ground. Animation
+        and cooldowns are time-based, so promotion back to LOD_FULL shows the
+        right frame and cooldown state on the first full tick.
         """
-        base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-        assets_dir = os.path.join(base, 'assets', 'images', 'enemy')
-
-        mapping = {
-            'idle': ('_Idle.png', 10),
-            'run': ('_Run.png', 10),
-            'turn': ('_TurnAround.png', 3),
-            'attack1': ('_Attack.png', 4),
-            'attack2': ('_Attack2.png', 6),
-            'hit': ('_Hit.png', 1),
-            'death': ('_Death.png', 10),
-        }
-
-        for state, (filename, frame_count) in mapping.items():
-            path = os.path.join(assets_dir, filename)
-            frames_list = []
-
-            if os.path.exists(path):
-                try:
-
-                    if pygame.display.get_init():
-                        sheet = pygame.image.load(path).convert_alpha()
-                    else:
-                        sheet = pygame.image.load(path)
-                    sheet_w, sheet_h = sheet.get_size()
-
-                    frame_w = sheet_w // frame_count
-
-                    for i in range(frame_count):
-                        rect = pygame.Rect(i * frame_w, 0, frame_w, sheet_h)
-                        frame = pygame.Surface(rect.size, pygame.SRCALPHA)
-                        frame.blit(sheet, (0, 0), rect)
-
-                        frame = pygame.transform.smoothscale(frame, (self.width, self.height))
-                        frames_list.append(frame)
-
-                except Exception as e:
-                    print(f"Error loading {path}: {e}")
-
-                    surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                    surf.fill((255, 0, 0, 128))
-                    frames_list.append(surf)
-            else:
-                print(f"File not found: {path}")
-
-                surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                surf.fill((255, 0, 0, 128))
-                frames_list.append(surf)
-
-            if frames_list:
-                self.animations[state] = frames_list
-            else:
-
-                surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                surf.fill((255, 0, 0, 128))
-                self.animations[state] = [surf]
+        if lod == LOD_FAR and self.on_ground and not self.vel_x and not self.knockback_vel_x:
+            return
+        if now is None:
+            now = pygame.time.get_ticks()
 
-    def update(self, player, world_width, world_height, ground_y):
         self.vel_y += self.gravity
 
         self.knockback_vel_x *= self.knockback_decay
@@ -155,9 +187,10 @@ class Enemy:
         self.rect.x += int(self.vel_x + self.knockback_vel_x)
         self.rect.y += int(self.vel_y)
 
-        my_hitbox = self.get_hitbox()
-        player_hitbox = player.get_hitbox()
-        if my_hitbox.colliderect(player_hitbox):
+        if lod == LOD_FAR:
+            # nothing to chase out here; just settle on the ground
+            self.vel_x = 0
+        elif self.get_hitbox().colliderect(player.get_hitbox()):
             self.vel_x = 0
 
         if self.rect.bottom >= ground_y:
@@ -175,45 +208,56 @@ class Enemy:
             overlap = hb.right - world_width
             self.rect.x -= overlap
 
-        now = pygame.time.get_ticks()
         if self.hit_cooldown > 0 and now - self.hit_cooldown >= self.hit_cooldown_duration:
             self.hit_cooldown = 0
 
         if self.attack_cooldown > 0 and now - self.attack_cooldown >= self.attack_cooldown_duration:
             self.attack_cooldown = 0
 
-        if self.state == 'death':
-            self._update_animation(loop=False)
+        if lod == LOD_FAR:
             return
+        animate = lod == LOD_FULL
 
-        if self.state == 'hit':
-            finished = self._update_animation(loop=False)
-            if finished:
-                self.locked = False
-                self.vel_x = 0
-                self._set_state('idle')
+        # hit and death play out without AI
+        if STATE_FLAGS[self.state_id] & (STUNNED | DEAD):
+            self._play_one_shot(now, animate)
             return
 
-        self._update_ai(player, now)
+        if think:
+            self._update_ai(player, now)
 
-        if self.state.startswith('attack'):
-            finished = self._update_animation(loop=False)
-            if finished:
-                self.locked = False
-                self.vel_x = 0
-                self._set_state('idle')
+        if STATE_FLAGS[self.state_id] & ATTACKING:
+            self._play_one_shot(now, animate)
             return
 
         if self.on_ground:
             if abs(self.vel_x) > 0.5:
-                self._set_state('run')
+                self._set_state(RUN, now)
             else:
-                self._set_state('idle')
+                self._set_state(IDLE, now)
         else:
 
-            self._set_state('run')
+            self._set_state(RUN, now)
 
-        self._update_animation(loop=True)
+        if animate:
+            self._update_animation(now, loop=True)
+
+    def _play_one_shot(self, now, animate=True):
+        """Play a locked clip (attack, hit, death) and take its `ON_FINISH` transition.
+
+        With `animate` off the frame is not resolved; only the clip's end is checked.
+        """
+        sid = self.state_id
+        nxt = ON_FINISH[sid]
+        if animate:
+            finished = self._update_animation(now, loop=False)
+        else:
+            clip = self.archetype.state_clips[sid]
+            finished = clip is None or now - self.anim_start >= clip.total
+        if finished and nxt >= 0:
+            self.locked = False
+            self.vel_x = 0
+            self._set_state(nxt, now)
 
     def _update_ai(self, player, now):
         """Update AI to pursue and attack player while maintaining safe distance.
@@ -229,7 +273,7 @@ class Enemy:
         self.facing = 1 if player.rect.centerx > self.rect.centerx else -1
 
         # if stunned or dying, don't move
-        if self.state in ('hit', 'death') or self.state.startswith('attack'):
+        if STATE_FLAGS[self.state_id] & LOCKED:
             self.vel_x = 0
             return
 
@@ -242,7 +286,7 @@ class Enemy:
 
             # attempt attack if in range
             if dist < self.attack_distance and self.attack_cooldown == 0:
-                self.attack()
+                self.attack(now)
                 self.vel_x = 0
                 return
 
@@ -253,7 +297,7 @@ class Enemy:
         # attack if within attack distance
         if dist < self.attack_distance:
             if self.attack_cooldown == 0:
-                self.attack()
+                self.attack(now)
             self.vel_x = 0
             return
 
@@ -265,31 +309,35 @@ class Enemy:
         # default: idle
         self.vel_x = 0
 
-    def attack(self):
+    def attack(self, now=None):
         """Trigger an attack. Alternates between attack1 and attack2."""
-        if self.state.startswith('attack') or self.state == 'death':
+        if STATE_FLAGS[self.state_id] & (ATTACKING | DEAD):
             return
+        if now is None:
+            now = pygame.time.get_ticks()
 
         self._next_attack_is_two = not self._next_attack_is_two
-        new_state = 'attack2' if self._next_attack_is_two else 'attack1'
+        new_state = ATTACK2 if self._next_attack_is_two else ATTACK1
 
-        self._set_state(new_state)
-        self.attack_cooldown = pygame.time.get_ticks()
+        self._set_state(new_state, now)
+        self.attack_cooldown = now
         self.locked = True
         self.vel_x = 0
 
-    def take_damage(self, amount=1, knockback_direction=1):
+    def take_damage(self, amount=1, knockback_direction=1, now=None):
         """Enemy receives damage and gets knocked back.
 
         Args:
             amount: Amount of damage to take (default 1)
             knockback_direction: Direction of knockback (1 for right, -1 for left)
+            now: Current tick time in ms (defaults to pygame.time.get_ticks())
 
         Returns:
             True if enemy dies (HP <= 0), False otherwise
         """
 
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         if self.hit_cooldown > 0 and now - self.hit_cooldown < self.hit_cooldown_duration:
             return False
 
@@ -302,50 +350,68 @@ class Enemy:
         self.knockback_vel_x = knockback_strength * knockback_direction
 
         if self.current_hp > 0:
-            self._set_state('hit')
+            self._set_state(HIT, now)
             self.locked = True
         else:
-            self._set_state('death')
+            self._set_state(DEATH, now)
             self.death_time = now  
             self.current_hp = 0
             return True
 
         return False
 
-    def _set_state(self, new_state):
-        """Change animation state."""
-        if new_state == self.state:
+    def _set_state(self, new_state, now=None):
+        """Switch to integer state `new_state`, restarting its clip."""
+        if new_state == self.state_id:
             return
-        self.state = new_state
+        self.state_id = new_state
         self.anim_index = 0
-        self.last_anim_time = pygame.time.get_ticks()
+        self.anim_start = pygame.time.get_ticks() if now is None else now
+        # every attack is a new swing with an empty hit registry
+        self.swing_hits = None
+        if STATE_FLAGS[new_state] & ATTACKING:
+            self.swing += 1
+
+    def attack_active(self):
+        """True while an attack is on one of its hit-active frames (see `hit_frames`)."""
+        sid = self.state_id
+        if not STATE_FLAGS[sid] & ATTACKING:
+            return False
+        clip = self.archetype.state_clips[sid]
+        return clip is None or clip.is_active(self.anim_index)
+
+    def register_hit(self, target):
+        """Record that the current swing hit `target`.
+
+        Returns False if this swing already hit it: each swing lands on a
+        given target at most once.
+        """
+        hits = self.swing_hits
+        if hits is None:
+            self.swing_hits = [target]
+            return True
+        if target in hits:
+            return False
+        hits.append(target)
+        return True
 
-    def _update_animation(self, loop=True):
-        """Advance animation frames based on time.
+    def _update_animation(self, now, loop=True):
+        """Resolve the current frame from the time spent in this state.
 
         Args:
+            now: Current tick time in ms.
             loop: If True, animation loops. If False, stays on last frame and returns True when done.
 
         Returns:
-            True if a non-looping animation finished on this update.
+            True once a non-looping animation has finished.
         """
-        now = pygame.time.get_ticks()
-        key = self.state
-        frames = self.animations.get(key, None)
-        if not frames:
+        clip = self.archetype.state_clips[self.state_id]
+        if clip is None:
             return True
 
-        dur = self.frame_durations.get(key, 100)
-        if now - self.last_anim_time >= dur:
-            self.anim_index += 1
-            self.last_anim_time = now
-            if self.anim_index >= len(frames):
-                if loop:
-                    self.anim_index = 0
-                else:
-                    self.anim_index = len(frames) - 1
-                    return True
-        return False
+        elapsed = now - self.anim_start
+        self.anim_index = clip.frame_at(elapsed, loop)
+        return not loop and elapsed >= clip.total
 
     def draw(self, surface, camera_x=0, camera_y=0):
         """Draw enemy sprite with camera offset.
@@ -355,7 +421,7 @@ class Enemy:
             camera_x: Camera X position in world
             camera_y: Camera Y position in world
         """
-        frames = self.animations.get(self.state, None)
+        frames = self.archetype.state_frames[self.state_id]
         if not frames:
 
             pygame.draw.rect(surface, (200, 0, 0), self.rect)
@@ -382,14 +448,15 @@ class Enemy:
                 overlay.fill((255, 255, 255, 180))
                 surface.blit(overlay, (screen_x, screen_y))
 
-    def draw_at(self, surface, pos):
+    def draw_at(self, surface, pos, now=None):
         """Draw enemy sprite at a specific screen position.
 
         Args:
             surface: pygame surface to draw on
             pos: tuple (x, y) position on screen in pixels
+            now: Time the hit flash is measured at (defaults to pygame.time.get_ticks())
         """
-        frames = self.animations.get(self.state, None)
+        frames = self.archetype.state_frames[self.state_id]
         if not frames:
 
             pygame.draw.rect(surface, (200, 0, 0), (*pos, self.width, self.height))
@@ -402,7 +469,8 @@ class Enemy:
 
         surface.blit(frame, pos)
 
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         if getattr(self, 'flash_timer', 0) and now - self.flash_timer < self.flash_duration:
             try:
                 white_frame = frame.copy()
@@ -418,12 +486,35 @@ class Enemy:
         """Get the actual hitbox for body collision detection.
 
         Returns a rect centered on the enemy body for realistic collision.
+
+        The rect is owned by the enemy and only recomputed when `rect` has
+        moved since the last call; copy it before mutating or keeping it.
         """
 
-        hitbox_x = int(self.rect.x + self.hitbox_offset_x)
-        hitbox_y = int(self.rect.y + self.hitbox_offset_y)
+        rect = self.rect
+        if rect.x != self._hitbox_x or rect.y != self._hitbox_y:
+            self._hitbox_x = rect.x
+            self._hitbox_y = rect.y
+            self.hitbox.x = int(rect.x + self.hitbox_offset_x)
+            self.hitbox.y = int(rect.y + self.hitbox_offset_y)
+        return self.hitbox
 
-        return pygame.Rect(hitbox_x, hitbox_y, int(self.hitbox_width), int(self.hitbox_height))
+    def get_attack_box(self):
+        """Area in front of the hitbox reached by a melee swing.
+
+        ATTACK_RANGE wide, ATTACK_HEIGHT_FACTOR of the hitbox height, vertically
+        centered on it and placed on the side the enemy is facing. Like
+        `get_hitbox()` the rect is persistent and must not be mutated.
+        """
+
+        hb = self.get_hitbox()
+        box = self.attack_box
+        if self.facing > 0:
+            box.left = hb.right
+        else:
+            box.right = hb.left
+        box.y = hb.top + (hb.height - box.height) // 2
+        return box
 
 
     def is_alive(self):
@@ -10,6 +10,8 @@ class Health:
     - Has a rect and simple draw/get_hitbox helpers.
     """
 
+    _image = None
+
     def __init__(self, x, y):
         # visual size of the pickup
         self.width = 48
@@ -19,8 +21,11 @@ class Health:
         # small hitbox within the sprite
         self.hitbox_inset = 8
 
-        self.image = None
-        self._load_image()
+        # the image is loaded once and shared by every pickup
+        if Health._image is None:
+            self._load_image()
+            Health._image = self.image
+        self.image = Health._image
 
     def _load_image(self):
         base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
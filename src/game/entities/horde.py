@@ -0,0 +1,372 @@
+import pygame
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from .enemy import Enemy
+from .states import (STATE_NAMES, STATE_FLAGS, ON_FINISH, ENEMY_STATE_COUNT, LOCKED, ATTACKING, STUNNED,
+                     DEAD, IDLE, RUN, ATTACK1, ATTACK2, HIT, DEATH)
+
+# the horde only uses the enemy states; a code indexes straight into the
+# per-state tables below
+ENEMY_STATES = STATE_NAMES[:ENEMY_STATE_COUNT]
+
+
+class Horde:
+    """Struct-of-arrays simulation of many enemies backed by NumPy.
+
+    Reproduces `Enemy.update`/`Enemy._update_ai`/`Enemy.take_damage` one tick
+    at a time, but for every enemy at once: gravity, knockback decay, ground
+    and world clamping, distance-based AI decisions, cooldown expiry and
+    animation frame advance are all array operations. Per-type data (sprites,
+    frame durations, speeds, ranges) is read once from a template `Enemy` and
+    shared by every member; flipped and flash frames are precomputed.
+
+    Enemy `i` lives at index `i` of each array; `count` entries are live.
+    """
+
+    # the per-enemy arrays (compacted together, copied by snapshots)
+    STATE_FIELDS = ('x', 'y', 'vel_x', 'vel_y', 'knockback', 'on_ground', 'facing', 'next_two',
+                    'state', 'anim_index', 'anim_time', 'hp', 'hit_cooldown', 'attack_cooldown',
+                    'death_time', 'flash_time', 'hit_by_swing', 'swing_landed')
+
+    def __init__(self, template=None, capacity=256):
+        if np is None:
+            raise RuntimeError('Horde mode requires numpy')
+        if template is None:
+            template = Enemy(0, 0)
+
+        self.width = template.width
+        self.height = template.height
+        self.hitbox_w = int(template.hitbox_width)
+        self.hitbox_h = int(template.hitbox_height)
+        self.hitbox_off_x = int(template.hitbox_offset_x)
+        self.hitbox_off_y = int(template.hitbox_offset_y)
+        self.speed = float(template.speed)
+        self.gravity = float(template.gravity)
+        self.knockback_decay = float(template.knockback_decay)
+        self.max_hp = int(template.max_hp)
+        self.hit_cooldown_duration = int(template.hit_cooldown_duration)
+        self.detection_range = template.detection_range
+        self.attack_distance = template.attack_distance
+        self.retreat_distance = template.retreat_distance
+        self.attack_cooldown_duration = int(template.attack_cooldown_duration)
+        self.flash_duration = int(template.flash_duration)
+
+        fallback = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        source = [template.animations.get(name) or [fallback] for name in ENEMY_STATES]
+        # frames are cropped to their opaque area: with hundreds of enemies on
+        # screen, blitting is fill-bound and most of each frame is transparent
+        self.frames = [[self._crop(f) for f in seq] for seq in source]
+        self.frames_flipped = [[self._crop(pygame.transform.flip(f, True, False)) for f in seq] for seq in source]
+        self.frames_flash = [[(self._flash(f), off) for f, off in seq] for seq in self.frames]
+        self.frames_flash_flipped = [[(self._flash(f), off) for f, off in seq] for seq in self.frames_flipped]
+        self.frame_count = np.array([len(seq) for seq in self.frames], dtype=np.int64)
+        self.frame_duration = np.array([template.frame_durations.get(name, 100) for name in ENEMY_STATES],
+                                       dtype=np.int64)
+        # per-state clip length: one-shot clips finish once it has elapsed
+        self.clip_length = self.frame_duration * self.frame_count
+        # the compiled state machine as lookup tables
+        self.state_flags = np.array(STATE_FLAGS[:ENEMY_STATE_COUNT], dtype=np.int64)
+        self.on_finish = np.array(ON_FINISH[:ENEMY_STATE_COUNT], dtype=np.int64)
+        # attack frame data: inclusive hit-active frame window per state
+        clips = template.archetype.state_clips[:ENEMY_STATE_COUNT]
+        self.hit_first = np.array([c.active_first if c else 0 for c in clips], dtype=np.int64)
+        self.hit_last = np.array([c.active_last if c else 0 for c in clips], dtype=np.int64)
+
+        self.count = 0
+        self._alloc(max(1, int(capacity)))
+
+    @staticmethod
+    def _crop(frame):
+        bounds = frame.get_bounding_rect()
+        if bounds.width == 0 or bounds.height == 0:
+            bounds = pygame.Rect(0, 0, 1, 1)
+        return frame.subsurface(bounds).copy(), bounds.topleft
+
+    @staticmethod
+    def _flash(frame):
+        white = frame.copy()
+        white.fill((255, 255, 255), special_flags=pygame.BLEND_RGB_ADD)
+        return white
+
+    def _alloc(self, capacity):
+        old = getattr(self, 'x', None)
+        n = self.count
+        arrays = {
+            'x': np.int64, 'y': np.int64,
+            'vel_x': np.float64, 'vel_y': np.float64, 'knockback': np.float64,
+            'on_ground': np.bool_, 'facing': np.int64, 'next_two': np.bool_,
+            'state': np.int64, 'anim_index': np.int64, 'anim_time': np.int64,
+            'hp': np.int64, 'hit_cooldown': np.int64, 'attack_cooldown': np.int64,
+            'death_time': np.int64, 'flash_time': np.int64,
+            # per-swing hit registries: the player swing that last hit each
+            # enemy, and whether each enemy's own swing already landed
+            'hit_by_swing': np.int64, 'swing_landed': np.bool_,
+        }
+        for name, dtype in arrays.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                arr[:n] = getattr(self, name)[:n]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, xs, y, now):
+        """Append enemies at world x positions `xs` (rect top-left) and row `y`."""
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        k = len(xs)
+        if not k:
+            return
+        if self.count + k > self.capacity:
+            self._alloc(max(self.count + k, self.capacity * 2))
+        sl = slice(self.count, self.count + k)
+        self.x[sl] = xs
+        self.y[sl] = int(y)
+        for name in ('vel_x', 'vel_y', 'knockback', 'on_ground', 'next_two', 'anim_index',
+                     'hit_cooldown', 'attack_cooldown', 'death_time', 'flash_time', 'hit_by_swing',
+                     'swing_landed'):
+            getattr(self, name)[sl] = 0
+        self.facing[sl] = 1
+        self.state[sl] = IDLE
+        self.anim_time[sl] = now
+        self.hp[sl] = self.max_hp
+        self.count += k
+
+    def compact(self, keep):
+        """Keep only live entries where boolean mask `keep` (length `count`) is set."""
+        n = self.count
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        for name in self.STATE_FIELDS:
+            arr = getattr(self, name)
+            arr[:k] = arr[:n][keep]
+        self.count = k
+
+    # -- shared helpers -------------------------------------------------
+
+    def _set_state(self, mask, new_state, now):
+        """Vectorized `Enemy._set_state`: reset animation only where the state changes."""
+        st = self.state[:self.count]
+        change = mask & (st != new_state)
+        if np.ndim(new_state):
+            st[change] = new_state[change]
+        else:
+            st[change] = new_state
+        self.anim_index[:self.count][change] = 0
+        self.anim_time[:self.count][change] = now
+        # a new swing starts with an empty hit registry
+        self.swing_landed[:self.count][change] = False
+
+    def has_flag(self, flag):
+        """Mask of live enemies whose current state has `flag` (see `states`)."""
+        return (self.state_flags[self.state[:self.count]] & flag) != 0
+
+    def attack_active(self):
+        """Mask of enemies whose attack is on a hit-active frame (vectorized `Enemy.attack_active`)."""
+        n = self.count
+        st = self.state[:n]
+        idx = self.anim_index[:n]
+        return self.has_flag(ATTACKING) & (idx >= self.hit_first[st]) & (idx <= self.hit_last[st])
+
+    def register_swing(self, mask, swing):
+        """Of the enemies in `mask`, those not yet hit by attacker swing id `swing`; marks them hit."""
+        hit = self.hit_by_swing[:self.count]
+        new = mask & (hit != swing)
+        hit[new] = swing
+        return new
+
+    def _play_one_shot(self, mask, now):
+        """Vectorized `Enemy._play_one_shot`: advance locked clips and take `ON_FINISH`."""
+        n = self.count
+        done = self._advance(mask, now, loop=False)
+        done &= self.on_finish[self.state[:n]] >= 0
+        self.vel_x[:n][done] = 0
+        self._set_state(done, self.on_finish[self.state[:n]], now)
+        return done
+
+    def _advance(self, mask, now, loop):
+        """Vectorized `Enemy._update_animation`. Returns the 'finished' mask when not looping.
+
+        `anim_time` is the time the current state started; the frame is
+        elapsed // frame_duration, wrapped or clamped like `AnimationTimeline.frame_at`.
+        """
+        n = self.count
+        st = self.state[:n]
+        elapsed = np.maximum(now - self.anim_time[:n], 0)
+        frame = elapsed // self.frame_duration[st]
+        nfr = self.frame_count[st]
+        if loop:
+            frame %= nfr
+        else:
+            np.minimum(frame, nfr - 1, out=frame)
+        idx = self.anim_index[:n]
+        idx[mask] = frame[mask]
+        if loop:
+            return np.zeros_like(mask)
+        return mask & (elapsed >= self.clip_length[st])
+
+    def hitboxes(self):
+        """Return (left, top) arrays of the live enemies' body hitboxes."""
+        n = self.count
+        return self.x[:n] + self.hitbox_off_x, self.y[:n] + self.hitbox_off_y
+
+    def overlaps(self, rect):
+        """Boolean mask of live enemies whose hitbox overlaps `rect` (pygame colliderect rules)."""
+        hx, hy = self.hitboxes()
+        return ((hx < rect.right) & (rect.left < hx + self.hitbox_w)
+                & (hy < rect.bottom) & (rect.top < hy + self.hitbox_h))
+
+    # -- simulation -------------------------------------------------------
+
+    def update(self, player, world_width, ground_y, now):
+        n = self.count
+        if not n:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        vx = self.vel_x[:n]
+        vy = self.vel_y[:n]
+        kb = self.knockback[:n]
+
+        # physics
+        vy += self.gravity
+        kb *= self.knockback_decay
+        kb[np.abs(kb) < 0.1] = 0
+        x += np.trunc(vx + kb).astype(np.int64)
+        y += np.trunc(vy).astype(np.int64)
+
+        phb = player.get_hitbox()
+        vx[self.overlaps(phb)] = 0
+
+        grounded = y + self.height >= ground_y
+        y[grounded] = ground_y - self.height
+        vy[grounded] = 0
+        self.on_ground[:n] = grounded
+
+        hx = x + self.hitbox_off_x
+        x -= np.minimum(hx, 0)
+        x -= np.maximum(hx + self.hitbox_w - world_width, 0)
+
+        # cooldown expiry
+        hc = self.hit_cooldown[:n]
+        hc[(hc > 0) & (now - hc >= self.hit_cooldown_duration)] = 0
+        ac = self.attack_cooldown[:n]
+        ac[(ac > 0) & (now - ac >= self.attack_cooldown_duration)] = 0
+
+        # death / hit play out without AI
+        reacting = self.has_flag(STUNNED | DEAD)
+        self._play_one_shot(reacting, now)
+        active = ~reacting
+
+        # AI (Enemy._update_ai)
+        px = player.rect.centerx
+        cx = x + self.width // 2
+        toward = np.where(px > cx, 1, -1)
+        self.facing[:n][active] = toward[active]
+        locked = active & self.has_flag(LOCKED)
+        vx[locked] = 0
+        thinking = active & ~locked
+
+        dist = np.abs(px - cx)
+        ready = ac == 0
+        body = self.overlaps(phb)
+        retreat = thinking & (dist < self.retreat_distance)
+        back_off = retreat & body
+        vx[back_off] = -self.speed * toward[back_off]
+        hold = retreat & ~body
+        vx[hold] = 0
+        in_range = thinking & ~retreat & (dist < self.attack_distance)
+        vx[in_range] = 0
+        strike = (hold & (dist < self.attack_distance) & ready) | (in_range & ready)
+        if strike.any():
+            nt = self.next_two[:n]
+            nt[strike] = ~nt[strike]
+            self._set_state(strike, np.where(nt, ATTACK2, ATTACK1), now)
+            ac[strike] = now
+        chase = thinking & ~retreat & ~in_range & (dist < self.detection_range)
+        vx[chase] = self.speed * toward[chase]
+        vx[thinking & ~retreat & ~in_range & ~chase] = 0
+
+        # attack animation, then locomotion for everyone else
+        in_attack = active & self.has_flag(ATTACKING)
+        self._play_one_shot(in_attack, now)
+
+        moving = active & ~in_attack
+        want = np.where(grounded & (np.abs(vx) <= 0.5), IDLE, RUN)
+        self._set_state(moving, want, now)
+        self._advance(moving, now, loop=True)
+
+    def take_damage(self, mask, amount, knockback_direction, now):
+        """Vectorized `Enemy.take_damage`.
+
+        Returns (damaged, killed) boolean masks. `amount` and
+        `knockback_direction` may be scalars or per-enemy arrays.
+        """
+        n = self.count
+        hc = self.hit_cooldown[:n]
+        hp = self.hp[:n]
+        damaged = mask & ~((hc > 0) & (now - hc < self.hit_cooldown_duration))
+        amount = np.broadcast_to(amount, (n,))
+        hp[damaged] -= amount[damaged]
+        hc[damaged] = now
+        self.flash_time[:n][damaged] = now
+        self.knockback[:n][damaged] = 15 * np.broadcast_to(knockback_direction, (n,))[damaged]
+        survived = damaged & (hp > 0)
+        self._set_state(survived, HIT, now)
+        killed = damaged & (hp <= 0)
+        self._set_state(killed, DEATH, now)
+        self.death_time[:n][killed] = now
+        hp[killed] = 0
+        return damaged, killed
+
+    def attack_boxes(self, attack_range, height_factor):
+        """Per-enemy melee boxes as (left, top, width, height) arrays, like Gameplay builds them."""
+        hx, hy = self.hitboxes()
+        ah = max(8, int(self.hitbox_h * height_factor))
+        top = hy + (self.hitbox_h - ah) // 2
+        left = np.where(self.facing[:self.count] > 0, hx + self.hitbox_w, hx - attack_range)
+        return left, top, attack_range, ah
+
+    def expired(self, now):
+        """Mask of enemies whose death animation finished more than a second ago."""
+        n = self.count
+        return (self.hp[:n] <= 0) & (now - self.death_time[:n] > 1000)
+
+    # -- rendering --------------------------------------------------------
+
+    def draw(self, surface, camera_x, camera_y, screen_width, now):
+        """Blit every on-screen enemy in one `Surface.blits` call. Returns visible indices."""
+        n = self.count
+        if not n:
+            return np.empty(0, dtype=np.int64)
+        sx = self.x[:n] - camera_x
+        visible = np.flatnonzero((sx + self.width > 0) & (sx < screen_width))
+        if not len(visible):
+            return visible
+        sy = self.y[:n] - camera_y
+        flashing = (self.flash_time[:n] > 0) & (now - self.flash_time[:n] < self.flash_duration)
+        state = self.state
+        idx = self.anim_index
+        facing = self.facing
+        frame_count = self.frame_count
+        seq = []
+        for i in visible.tolist():
+            st = state[i]
+            j = idx[i] % frame_count[st]
+            if facing[i] < 0:
+                frame, (ox, oy) = self.frames_flipped[st][j]
+                flash = self.frames_flash_flipped[st][j][0]
+            else:
+                frame, (ox, oy) = self.frames[st][j]
+                flash = self.frames_flash[st][j][0]
+            pos = (int(sx[i]) + ox, int(sy[i]) + oy)
+            seq.append((frame, pos))
+            if flashing[i]:
+                seq.append((flash, pos))
+        surface.blits(seq, doreturn=False)
+        return visible
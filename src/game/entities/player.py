@@ -1,126 +1,145 @@
-import os
 import pygame
-from ..settings import HITBOX_WIDTH, HITBOX_HEIGHT
+from ..settings import HITBOX_WIDTH, HITBOX_HEIGHT, ATTACK_RANGE, ATTACK_HEIGHT_FACTOR
+from .archetype import Archetype, shared
+from .states import (STATE_FLAGS, ON_FINISH, LOCKED, ATTACKING, DEAD, IDLE, RUN, TURN, ATTACK1, ATTACK2,
+                     HIT, DEATH, JUMP, JUMP_TRANS, FALL, state_property)
+
+PLAYER_ARCHETYPE = Archetype(
+    'player',
+    width=304,
+    height=160,
+    hitbox_width=HITBOX_WIDTH,
+    hitbox_height=HITBOX_HEIGHT,
+    speed=5,
+    jump_power=-12,
+    gravity=0.6,
+    knockback_decay=0.85,
+    max_hp=5,
+    hit_cooldown_duration=1000,
+    flash_duration=180,
+    frame_durations={
+        'idle': 100,
+        'run': 80,
+        'turn': 80,
+        'attack1': 80,
+        'attack2': 70,
+        'jump': 120,
+        'jump_trans': 80,
+        'fall': 120,
+        'fall_trans': 80,
+        'hit': 250,
+        'death': 100,
+    },
+    # frames on which each attack can land a hit (the blade is extended)
+    hit_frames={
+        'attack1': (1, 2),
+        'attack2': (2, 3),
+    },
+    sprite_dir='player',
+    sprites={
+        'idle': ('_Idle.png', 10),
+        'run': ('_Run.png', 10),
+        'turn': ('_TurnAround.png', 3),
+        'attack1': ('_Attack.png', 4),
+        'attack2': ('_Attack2.png', 6),
+        'jump': ('_Jump.png', 3),
+        'jump_trans': ('_JumpFallInbetween.png', 2),
+        'fall': ('_Fall.png', 3),
+        'hit': ('_Hit.png', 1),
+        'death': ('_Death.png', 10),
+    },
+    fallback_color=(255, 0, 255),
+)
+
 
 class Player:
+    """Player character: input handling, physics, melee attacks and animations.
+
+    Per-type constants (sizes, speeds, timings, frames) live in the shared
+    `PLAYER_ARCHETYPE`; instances only carry mutable state in `__slots__`.
+    The current state is an integer id from `states` (`state` gives its name).
+    """
+
+    __slots__ = ('archetype', 'rect', 'hitbox', 'attack_box', '_hitbox_x', '_hitbox_y',
+                 'vel_x', 'vel_y', 'on_ground', 'facing', 'knockback_vel_x', 'state_id', 'anim_index',
+                 'anim_start', '_next_attack_is_two', 'locked', 'current_hp', 'hit_cooldown',
+                 'flash_timer', 'swing', 'swing_hits', 'attack_range')
+
+    state = state_property()
+
+    width = shared('width')
+    height = shared('height')
+    hitbox_width = shared('hitbox_width')
+    hitbox_height = shared('hitbox_height')
+    hitbox_offset_x = shared('hitbox_offset_x')
+    hitbox_offset_y = shared('hitbox_offset_y')
+    speed = shared('speed')
+    jump_power = shared('jump_power')
+    gravity = shared('gravity')
+    knockback_decay = shared('knockback_decay')
+    max_hp = shared('max_hp')
+    hit_cooldown_duration = shared('hit_cooldown_duration')
+    flash_duration = shared('flash_duration')
+    frame_durations = shared('frame_durations')
+    animations = shared('animations')
+
+    def __init__(self, x, y, archetype=None):
+        self.archetype = archetype or PLAYER_ARCHETYPE
 
-    def __init__(self, x, y):
-        self.width = 304
-        self.height = 160
         self.rect = pygame.Rect(x, y, self.width, self.height)
 
-        self.hitbox_width = HITBOX_WIDTH
-        self.hitbox_height = HITBOX_HEIGHT
-        self.hitbox_offset_x = (self.width - self.hitbox_width) // 2
+        # persistent collision rects, refreshed by get_hitbox()/get_attack_box()
+        # instead of allocating a new Rect per call
+        self.hitbox = pygame.Rect(0, 0, int(self.hitbox_width), int(self.hitbox_height))
+        self.attack_box = pygame.Rect(0, 0, ATTACK_RANGE, max(8, int(self.hitbox_height * ATTACK_HEIGHT_FACTOR)))
+        # reach of a swing in px; a tuning value, so reset() leaves it alone
+        self.attack_range = ATTACK_RANGE
+
+        self.reset(x, y)
 
-        self.hitbox_offset_y = (self.height - self.hitbox_height) // 2
+        self.archetype.preload()
+
+    def reset(self, x, y, now=None):
+        """Put the player back at (x, y) with full health, idle and unlocked.
+
+        Reuses the rects and the (shared) frames; `Gameplay.restart()` calls
+        it instead of constructing a new player.
+        """
+        self.rect.topleft = (x, y)
+        self._hitbox_x = None
+        self._hitbox_y = None
 
-        self.speed = 5
         self.vel_x = 0
         self.vel_y = 0
-        self.jump_power = -12
-        self.gravity = 0.6
         self.on_ground = False
-        self.facing = 1  
+        self.facing = 1
 
         self.knockback_vel_x = 0
-        self.knockback_decay = 0.85
 
-        self.animations = {}  
-        self.state = 'idle'
+        self.state_id = IDLE
         self.anim_index = 0
-        self.last_anim_time = pygame.time.get_ticks()
-
-        self.frame_durations = {
-            'idle': 100,
-            'run': 80,
-            'turn': 80,
-            'attack1': 80,
-            'attack2': 70,
-            'jump': 120,
-            'jump_trans': 80,
-            'fall': 120,
-            'fall_trans': 80,
-            'hit': 250,
-            'death': 100,
-        }
+        self.anim_start = pygame.time.get_ticks() if now is None else now
+
+        # attack instance counter and the targets the current swing has hit
+        self.swing = 0
+        self.swing_hits = None
 
         self._next_attack_is_two = False
 
         self.locked = False
 
-        self.max_hp = 5
-        self.current_hp = 5
-        self.hit_cooldown = 0  
-        self.hit_cooldown_duration = 1000  
+        self.current_hp = self.max_hp
+        self.hit_cooldown = 0
 
         self.flash_timer = 0
-        self.flash_duration = 180  
-
-        self._load_sprites()
 
     def _load_sprites(self):
-        """Load and slice spritesheets from assets/images/player.
-
-        Assumes files are named like `_Idle.png`, `_Run.png`, etc. Frame counts follow the spec.
-        """
-        base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-        assets_dir = os.path.join(base, 'assets', 'images', 'player')
-
-        mapping = {
-            'idle': ('Idle', 10),
-            'run': ('Run', 10),
-            'turn': ('TurnAround', 3),
-            'attack1': ('Attack', 4),
-            'attack2': ('Attack2', 6),
-            'jump': ('Jump', 3),
-            'jump_trans': ('JumpFallInbetween', 2),
-            'fall': ('Fall', 3),
-            'hit': ('Hit', 1),
-            'death': ('Death', 10),
-        }
-
-        for state, (name, frames) in mapping.items():
-            fname = f'_{name}.png'
-            path = os.path.join(assets_dir, fname)
-            if not os.path.exists(path):
-
-                surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                surf.fill((255, 0, 255))
-                self.animations[state] = [surf]
-                continue
-
-            try:
-                if pygame.display.get_init():
-                    sheet = pygame.image.load(path).convert_alpha()
-                else:
-                    sheet = pygame.image.load(path)
-            except Exception:
-
-                sheet = None
-
-            if sheet is None:
-                surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                surf.fill((255, 0, 255))
-                self.animations[state] = [surf]
-                continue
-            sheet_w, sheet_h = sheet.get_size()
-
-            frame_w = max(1, sheet_w // frames)
-            frames_list = []
-            for i in range(frames):
-                rect = pygame.Rect(i * frame_w, 0, frame_w, sheet_h)
-                frame = pygame.Surface(rect.size, pygame.SRCALPHA)
-                frame.blit(sheet, (0, 0), rect)
-
-                frame = pygame.transform.smoothscale(frame, (self.width, self.height))
-                frames_list.append(frame)
-
-            self.animations[state] = frames_list
+        """Reload the player spritesheets from assets/images/player (shared by all players)."""
+        self.archetype.load_animations()
 
     def handle_input(self, keys):
 
-        if self.locked or self.state == 'death':
+        if self.locked or self.state_id == DEATH:
             self.vel_x = 0
             return
 
@@ -135,28 +154,28 @@ class Player:
             self.vel_y = self.jump_power
             self.on_ground = False
 
-    def attack(self):
+    def attack(self, now=None):
         """Trigger an attack. Alternates between attack1 and attack2 for variety."""
-        if self.state.startswith('attack') or self.state == 'death':
+        if STATE_FLAGS[self.state_id] & (ATTACKING | DEAD):
             return
         self._next_attack_is_two = not self._next_attack_is_two
-        self.state = 'attack2' if self._next_attack_is_two else 'attack1'
-        self.anim_index = 0
-        self.last_anim_time = pygame.time.get_ticks()
+        self._set_state(ATTACK2 if self._next_attack_is_two else ATTACK1, now)
 
         self.locked = True
 
-    def take_damage(self, amount=1):
+    def take_damage(self, amount=1, now=None):
         """Player receives damage. Activates hit animation and cooldown.
 
         Args:
             amount: Amount of damage to take (default 1)
+            now: Current tick time in ms (defaults to pygame.time.get_ticks())
 
         Returns:
             True if player dies (HP <= 0), False otherwise
         """
 
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         if self.hit_cooldown > 0 and now - self.hit_cooldown < self.hit_cooldown_duration:
             return False
 
@@ -166,24 +185,31 @@ class Player:
         self.flash_timer = now
 
         if self.current_hp > 0:
-            self._set_state('hit')
+            self._set_state(HIT, now)
             self.locked = True
         else:
 
-            self._set_state('death')
+            self._set_state(DEATH, now)
             self.current_hp = 0
             return True
 
         return False
 
-    def _set_state(self, new_state):
-        if new_state == self.state:
+    def _set_state(self, new_state, now=None):
+        """Switch to integer state `new_state`, restarting its clip."""
+        if new_state == self.state_id:
             return
-        self.state = new_state
+        self.state_id = new_state
         self.anim_index = 0
-        self.last_anim_time = pygame.time.get_ticks()
+        self.anim_start = pygame.time.get_ticks() if now is None else now
+        # every attack is a new swing with an empty hit registry
+        self.swing_hits = None
+        if STATE_FLAGS[new_state] & ATTACKING:
+            self.swing += 1
 
-    def update(self, screen_width, screen_height, ground_y):
+    def update(self, screen_width, screen_height, ground_y, now=None):
+        if now is None:
+            now = pygame.time.get_ticks()
 
         self.vel_y += self.gravity
 
@@ -211,85 +237,74 @@ class Player:
         else:
             self.on_ground = False
 
-        if self.state == 'death':
-
-            self._update_animation(loop=False)
-            return
-
-        if self.state == 'hit':
-            finished = self._update_animation(loop=False)
-            if finished:
-
+        sid = self.state_id
+        if STATE_FLAGS[sid] & LOCKED:
+            # hit, death and attacks play out; control returns when the clip ends
+            nxt = ON_FINISH[sid]
+            if self._update_animation(now, loop=False) and nxt >= 0:
                 self.locked = False
-                if abs(self.vel_x) > 0:
-                    self._set_state('run')
-                else:
-                    self._set_state('idle')
-            return
-
-        if self.state.startswith('attack'):
-            finished = self._update_animation(loop=False)
-            if finished:
-
-                self.locked = False
-                if abs(self.vel_x) > 0:
-                    self._set_state('run')
-                else:
-                    self._set_state('idle')
+                if nxt == IDLE and abs(self.vel_x) > 0:
+                    nxt = RUN
+                self._set_state(nxt, now)
             return
 
         if not self.on_ground:
+            has_trans = self.archetype.state_frames[JUMP_TRANS] is not None
             if self.vel_y < 0:
-
-                if self.state == 'fall' and 'jump_trans' in self.animations:
-                    self._set_state('jump_trans')
-                else:
-                    self._set_state('jump')
+                self._set_state(JUMP_TRANS if sid == FALL and has_trans else JUMP, now)
             else:
-
-                if self.state == 'jump' and 'jump_trans' in self.animations:
-                    self._set_state('jump_trans')
-                else:
-                    self._set_state('fall')
+                self._set_state(JUMP_TRANS if sid == JUMP and has_trans else FALL, now)
         else:
 
             if abs(self.vel_x) > 0:
 
                 if (self.vel_x > 0 and self.facing < 0) or (self.vel_x < 0 and self.facing > 0):
-                    self._set_state('turn')
+                    self._set_state(TURN, now)
                 else:
-                    self._set_state('run')
+                    self._set_state(RUN, now)
             else:
-                self._set_state('idle')
+                self._set_state(IDLE, now)
 
-        self._update_animation(loop=True)
+        self._update_animation(now, loop=True)
 
-    def _update_animation(self, loop=True):
-        """Advance animation frames based on time.
+    def attack_active(self):
+        """True while an attack is on one of its hit-active frames (see `hit_frames`)."""
+        sid = self.state_id
+        if not STATE_FLAGS[sid] & ATTACKING:
+            return False
+        clip = self.archetype.state_clips[sid]
+        return clip is None or clip.is_active(self.anim_index)
+
+    def register_hit(self, target):
+        """Record that the current swing hit `target`.
 
-        Returns True if a non-looping animation finished on this update.
+        Returns False if this swing already hit it: each swing lands on a
+        given target at most once.
         """
-        now = pygame.time.get_ticks()
-        key = self.state
-        frames = self.animations.get(key, None)
-        if not frames:
+        hits = self.swing_hits
+        if hits is None:
+            self.swing_hits = [target]
             return True
+        if target in hits:
+            return False
+        hits.append(target)
+        return True
 
-        dur = self.frame_durations.get(key, 100)
-        if now - self.last_anim_time >= dur:
-            self.anim_index += 1
-            self.last_anim_time = now
-            if self.anim_index >= len(frames):
-                if loop:
-                    self.anim_index = 0
-                else:
+    def _update_animation(self, now, loop=True):
+        """Resolve the current frame from the time spent in this state.
 
-                    self.anim_index = len(frames) - 1
-                    return True
-        return False
+        Returns True once a non-looping animation has finished.
+        """
+        clip = self.archetype.state_clips[self.state_id]
+        if clip is None:
+            return True
+
+        elapsed = now - self.anim_start
+        self.anim_index = clip.frame_at(elapsed, loop)
+        return not loop and elapsed >= clip.total
 
     def draw(self, surface):
-        frames = self.animations.get(self.state, None)
+        frames = self.archetype.state_frames[self.state_id]
         if not frames:
 
             pygame.draw.rect(surface, (0, 200, 0), self.rect)
@@ -316,14 +331,15 @@ class Player:
                 overlay.fill((255, 255, 255, 180))
                 surface.blit(overlay, self.rect.topleft)
 
-    def draw_at(self, surface, pos):
+    def draw_at(self, surface, pos, now=None):
         """Draw player sprite at a specific screen position (used by camera system).
 
         Args:
             surface: pygame surface to draw on
             pos: tuple (x, y) position on screen in pixels
+            now: Time the hit flash is measured at (defaults to pygame.time.get_ticks())
         """
-        frames = self.animations.get(self.state, None)
+        frames = self.archetype.state_frames[self.state_id]
         if not frames:
 
             pygame.draw.rect(surface, (0, 200, 0), (*pos, self.width, self.height))
@@ -336,7 +352,8 @@ class Player:
 
         surface.blit(frame, pos)
 
-        now = pygame.time.get_ticks()
+        if now is None:
+            now = pygame.time.get_ticks()
         if getattr(self, 'flash_timer', 0) and now - self.flash_timer < self.flash_duration:
             try:
                 white_frame = frame.copy()
@@ -353,9 +370,34 @@ class Player:
 
         Returns a rect centered on the player body for realistic collision.
         Same dimensions as enemy hitbox for consistency.
+
+        The rect is owned by the player and only recomputed when `rect` has
+        moved since the last call; copy it before mutating or keeping it.
         """
 
-        hitbox_x = int(self.rect.x + self.hitbox_offset_x)
-        hitbox_y = int(self.rect.y + self.hitbox_offset_y)
+        rect = self.rect
+        if rect.x != self._hitbox_x or rect.y != self._hitbox_y:
+            self._hitbox_x = rect.x
+            self._hitbox_y = rect.y
+            self.hitbox.x = int(rect.x + self.hitbox_offset_x)
+            self.hitbox.y = int(rect.y + self.hitbox_offset_y)
+        return self.hitbox
+
+    def get_attack_box(self):
+        """Area in front of the hitbox reached by a melee swing.
+
+        `attack_range` wide (ATTACK_RANGE unless changed), ATTACK_HEIGHT_FACTOR
+        of the hitbox height, vertically centered on it and placed on the side
+        the player is facing. Like `get_hitbox()` the rect is persistent and
+        must not be mutated.
+        """
 
-        return pygame.Rect(hitbox_x, hitbox_y, int(self.hitbox_width), int(self.hitbox_height))
\ No newline at end of file
+        hb = self.get_hitbox()
+        box = self.attack_box
+        box.width = self.attack_range
+        if self.facing > 0:
+            box.left = hb.right
+        else:
+            box.right = hb.left
+        box.y = hb.top + (hb.height - box.height) // 2
+        return box
\ No newline at end of file
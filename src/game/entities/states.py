@@ -0,0 +1,78 @@
+"""Compiled character state machine shared by Player, Enemy and Horde.
+
+States are small integers so per-tick checks are a tuple index and a bit
+test instead of string comparisons. `STATE_SPEC` is the readable source:
+each state has a set of flags and the state to enter when its one-shot
+clip finishes. It is compiled at import into parallel tuples indexed by
+state id (`STATE_NAMES`, `STATE_FLAGS`, `ON_FINISH`), which the vectorized
+horde can turn into NumPy lookup tables.
+"""
+
+# -- flags ------------------------------------------------------------------
+
+LOOPING = 1 << 0     # the clip repeats; otherwise it plays once and holds
+LOCKED = 1 << 1      # movement input / AI decisions are ignored
+ATTACKING = 1 << 2   # the melee attack box is live
+STUNNED = 1 << 3     # hit reaction: plays out without AI
+DEAD = 1 << 4        # terminal; the entity is removed after its death clip
+AIRBORNE = 1 << 5    # jump/fall family (player only)
+
+# -- spec -------------------------------------------------------------------
+
+# (name, flags, state entered when the clip finishes or None to stay)
+# The first seven states are the ones enemies use; keep them first so the
+# horde's per-state tables stay compact.
+STATE_SPEC = (
+    ('idle', LOOPING, None),
+    ('run', LOOPING, None),
+    ('turn', LOOPING, None),
+    ('attack1', LOCKED | ATTACKING, 'idle'),
+    ('attack2', LOCKED | ATTACKING, 'idle'),
+    ('hit', LOCKED | STUNNED, 'idle'),
+    ('death', LOCKED | DEAD, None),
+    ('jump', LOOPING | AIRBORNE, None),
+    ('jump_trans', LOOPING | AIRBORNE, None),
+    ('fall', LOOPING | AIRBORNE, None),
+    ('fall_trans', LOOPING | AIRBORNE, None),
+)
+
+STATE_NAMES = tuple(name for name, _flags, _next in STATE_SPEC)
+STATE_IDS = {name: i for i, name in enumerate(STATE_NAMES)}
+STATE_FLAGS = tuple(flags for _name, flags, _next in STATE_SPEC)
+# -1 = no transition (looping clips, and death which holds its last frame)
+ON_FINISH = tuple(-1 if nxt is None else STATE_IDS[nxt] for _name, _flags, nxt in STATE_SPEC)
+
+IDLE = STATE_IDS['idle']
+RUN = STATE_IDS['run']
+TURN = STATE_IDS['turn']
+ATTACK1 = STATE_IDS['attack1']
+ATTACK2 = STATE_IDS['attack2']
+HIT = STATE_IDS['hit']
+DEATH = STATE_IDS['death']
+JUMP = STATE_IDS['jump']
+JUMP_TRANS = STATE_IDS['jump_trans']
+FALL = STATE_IDS['fall']
+FALL_TRANS = STATE_IDS['fall_trans']
+
+# states an enemy can be in (Horde sizes its tables to these)
+ENEMY_STATE_COUNT = DEATH + 1
+
+
+def state_id(name):
+    """Integer id of state `name` (raises KeyError for unknown names)."""
+    return STATE_IDS[name]
+
+
+def state_property():
+    """`state` as a name, backed by the entity's integer `state_id` slot.
+
+    Reading returns the state name; assigning a name switches `state_id`
+    without resetting the animation (use `_set_state` for that).
+    """
+    def _get(self):
+        return STATE_NAMES[self.state_id]
+
+    def _set(self, name):
+        self.state_id = STATE_IDS[name]
+
+    return property(_get, _set, doc='Current state name (backed by `state_id`).')
@@ -0,0 +1,384 @@
+"""Gym-style training environments over the headless Gameplay.
+
+`GameEnv` wraps one `TrainingGameplay` (scenes/training.py):
+
+    env = GameEnv(seed=1)
+    obs, info = env.reset()
+    obs, reward, terminated, truncated, info = env.step(IN_RIGHT | IN_ATTACK)
+
+An action is the knight's input bits from game/netplay.py (`IN_LEFT`,
+`IN_RIGHT`, `IN_JUMP`, `IN_ATTACK`, `IN_CAST`), so the action space is the
+integers `0 .. ACTION_COUNT - 1`; attack and cast are presses, the others
+are held for the step. An observation is a float32 vector of
+`OBS_SIZE` values: `PLAYER_FEATURES` followed by `ENEMY_FEATURES` for the
+`ENV_OBS_ENEMIES` nearest enemies (nearest first, zero rows when there are
+fewer). Enemy positions are relative to the knight and scaled by the
+screen size; everything else is roughly in [-1, 1]. The reward is
+`ENV_REWARD_KILL` per kill plus `ENV_REWARD_DAMAGE` per point of HP lost
+plus `ENV_REWARD_DEATH` on death; an episode terminates when the knight
+dies and is truncated after `max_steps` steps.
+
+`VecGameEnv` steps N environments in lockstep over a pool of worker
+processes. Actions, observations, rewards and done flags live in one
+shared-memory block, so a step sends each worker a single short message
+and nothing else is pickled unless an episode ended. Finished episodes
+are reset in place (the returned row is the new episode's first
+observation; the last one is in that env's info as `final_observation`).
+
+Both require numpy.
+"""
+import os
+import multiprocessing
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+try:
+    from multiprocessing import shared_memory
+except Exception:
+    shared_memory = None
+
+import pygame
+
+from .settings import (ENV_MAX_STEPS, ENV_OBS_ENEMIES, ENV_REWARD_KILL, ENV_REWARD_DAMAGE, ENV_REWARD_DEATH)
+from .netplay import IN_LEFT, IN_RIGHT, IN_JUMP, IN_ATTACK, IN_CAST
+from .entities.states import STATE_FLAGS, ATTACKING, LOCKED, STUNNED, DEAD
+from .headless import init_headless, HeadlessApp
+
+ACTION_COUNT = (IN_LEFT | IN_RIGHT | IN_JUMP | IN_ATTACK | IN_CAST) + 1
+
+PLAYER_FEATURES = ('x', 'y', 'vel_x', 'vel_y', 'on_ground', 'facing', 'hp', 'mana', 'attack_ready',
+                   'locked', 'attacking', 'enemies')
+ENEMY_FEATURES = ('present', 'dx', 'dy', 'facing', 'hp', 'attacking', 'stunned', 'dying')
+OBS_SIZE = len(PLAYER_FEATURES) + ENV_OBS_ENEMIES * len(ENEMY_FEATURES)
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError('The training environment requires numpy')
+
+
+class GameEnv:
+    """One headless Gameplay episode at a time behind `reset()`/`step()`.
+
+    `seed` seeds the first episode; each later `reset()` without a seed
+    uses the next integer, so a run of episodes is reproducible.
+    `frame_skip` repeats each action for that many ticks (presses only on
+    the first) and sums the rewards. `render=False` skips loading the
+    images only drawing needs (see `TrainingGameplay`).
+    """
+
+    def __init__(self, seed=0, frame_skip=1, max_steps=ENV_MAX_STEPS, app=None, render=True):
+        _require_numpy()
+        from .scenes.training import TrainingGameplay
+
+        if pygame.display.get_surface() is None:
+            init_headless()
+        self.app = app if app is not None else HeadlessApp()
+        self.frame_skip = max(1, int(frame_skip))
+        self.max_steps = int(max_steps)
+        self._next_seed = int(seed)
+        self.scene = TrainingGameplay(self.app, seed, render=render)
+        self.app.current_scene = self.scene
+        self.steps = 0
+        self.episode_return = 0.0
+
+    def reset(self, seed=None):
+        """Start a new episode; returns `(observation, info)`."""
+        if seed is None:
+            seed = self._next_seed
+        self._next_seed = int(seed) + 1
+        self.scene.reset(seed)
+        self.steps = 0
+        self.episode_return = 0.0
+        return self.observe(), self._info()
+
+    def step(self, action):
+        """Apply `action` (input bits); returns `(observation, reward, terminated, truncated, info)`."""
+        scene = self.scene
+        player = scene.player
+        action = int(action)
+        kills = scene.kill_count
+        hp = player.current_hp
+        for i in range(self.frame_skip):
+            scene.step(action if i == 0 else action & ~(IN_ATTACK | IN_CAST))
+            if scene.is_dead:
+                break
+        self.steps += 1
+
+        reward = ENV_REWARD_KILL * (scene.kill_count - kills)
+        reward += ENV_REWARD_DAMAGE * max(0, hp - player.current_hp)
+        terminated = scene.is_dead
+        if terminated:
+            reward += ENV_REWARD_DEATH
+        truncated = not terminated and self.steps >= self.max_steps
+        self.episode_return += reward
+
+        info = self._info()
+        if terminated or truncated:
+            info['episode'] = {'return': self.episode_return, 'length': self.steps, 'kills': scene.kill_count}
+        return self.observe(), reward, terminated, truncated, info
+
+    def _info(self):
+        return {'kills': self.scene.kill_count, 'tick': self.scene.sim_tick}
+
+    def observe(self, out=None):
+        """The observation vector of the current state, written into `out` if given."""
+        if out is None:
+            out = np.zeros(OBS_SIZE, dtype=np.float32)
+        scene = self.scene
+        player = scene.player
+        rect = player.rect
+        sw = float(scene.screen_width)
+        sh = float(scene.screen_height)
+        flags = STATE_FLAGS[player.state_id]
+        now = scene.now
+        enemies = scene.enemies
+        out[:len(PLAYER_FEATURES)] = (
+            rect.x / scene.world_width,
+            rect.y / scene.world_height,
+            player.vel_x / player.speed,
+            player.vel_y / -player.jump_power,
+            1.0 if player.on_ground else 0.0,
+            player.facing,
+            player.current_hp / player.max_hp,
+            scene.mana / scene.max_mana,
+            1.0 if now - scene.last_attack_time >= scene.attack_cooldown_ms else 0.0,
+            1.0 if flags & LOCKED else 0.0,
+            1.0 if flags & ATTACKING else 0.0,
+            len(enemies) / 10.0,
+        )
+        out[len(PLAYER_FEATURES):] = 0.0
+
+        if enemies:
+            cx, cy = rect.centerx, rect.centery
+            nearest = sorted(enemies, key=lambda e: abs(e.rect.centerx - cx))[:ENV_OBS_ENEMIES]
+            width = len(ENEMY_FEATURES)
+            base = len(PLAYER_FEATURES)
+            for enemy in nearest:
+                er = enemy.rect
+                flags = STATE_FLAGS[enemy.state_id]
+                out[base:base + width] = (
+                    1.0,
+                    (er.centerx - cx) / sw,
+                    (er.centery - cy) / sh,
+                    enemy.facing,
+                    enemy.current_hp / enemy.max_hp,
+                    1.0 if flags & ATTACKING else 0.0,
+                    1.0 if flags & STUNNED else 0.0,
+                    1.0 if flags & DEAD else 0.0,
+                )
+                base += width
+        return out
+
+
+class _VecBuffers:
+    """numpy views of the shared block: actions, observations, rewards, done flags."""
+
+    def __init__(self, buf, num_envs):
+        offset = 0
+        self.views = []
+        for name, dtype, shape in (('observations', np.float32, (num_envs, OBS_SIZE)),
+                                   ('rewards', np.float32, (num_envs,)),
+                                   ('actions', np.int32, (num_envs,)),
+                                   ('terminated', np.bool_, (num_envs,)),
+                                   ('truncated', np.bool_, (num_envs,))):
+            view = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+            setattr(self, name, view)
+            self.views.append(name)
+            offset += view.nbytes
+        self.nbytes = offset
+
+    @classmethod
+    def size(cls, num_envs):
+        return num_envs * (OBS_SIZE * 4 + 4 + 4 + 1 + 1)
+
+    def release(self):
+        # the shared block cannot be closed while views into it exist
+        for name in self.views:
+            setattr(self, name, None)
+
+
+def _step_envs(envs, first, buffers):
+    """Step `envs` (rows `first`...) from the shared actions; returns {row: info} of finished episodes."""
+    finished = {}
+    actions = buffers.actions
+    for i, env in enumerate(envs):
+        row = first + i
+        obs, reward, terminated, truncated, info = env.step(actions[row])
+        buffers.rewards[row] = reward
+        buffers.terminated[row] = terminated
+        buffers.truncated[row] = truncated
+        if terminated or truncated:
+            info['final_observation'] = obs
+            obs, _info = env.reset()
+            finished[row] = info
+        buffers.observations[row] = obs
+    return finished
+
+
+def _reset_envs(envs, first, buffers, seed):
+    for i, env in enumerate(envs):
+        obs, _info = env.reset(None if seed is None else seed + first + i)
+        buffers.observations[first + i] = obs
+
+
+def _worker(conn, shm_name, num_envs, first, count, seed, frame_skip, max_steps, render):
+    init_headless()
+    # attached only: the parent owns the block and unlinks it on close()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buffers = _VecBuffers(shm.buf, num_envs)
+    envs = []
+    try:
+        envs = [GameEnv(seed + first + i, frame_skip, max_steps, render=render) for i in range(count)]
+        conn.send(('ready', None))
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == 'step':
+                conn.send(('ok', _step_envs(envs, first, buffers)))
+            elif cmd == 'reset':
+                _reset_envs(envs, first, buffers, arg)
+                conn.send(('ok', None))
+            elif cmd == 'close':
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception as exc:
+        try:
+            conn.send(('error', repr(exc)))
+        except Exception:
+            pass
+    finally:
+        buffers.release()
+        shm.close()
+
+
+class VecGameEnv:
+    """`num_envs` GameEnvs stepped in lockstep by a pool of worker processes.
+
+    Environments are split into contiguous slices, one per worker
+    (`workers` defaults to one per CPU, capped at `num_envs`; 0 runs them
+    all in this process). Env `i` starts from seed `seed + i`. Nothing is
+    drawn, so by default the envs skip the render-only images
+    (`render=False`, see `GameEnv`).
+
+    `reset()` returns the observation array and `step(actions)` returns
+    `(observations, rewards, terminated, truncated, infos)`; the arrays are
+    views of the shared block, overwritten by the next call, and `infos`
+    is a list with an empty dict for every env whose episode goes on.
+    """
+
+    def __init__(self, num_envs, workers=None, seed=0, frame_skip=1, max_steps=ENV_MAX_STEPS, context=None,
+                 render=False):
+        _require_numpy()
+        if shared_memory is None:
+            raise RuntimeError('VecGameEnv requires multiprocessing.shared_memory (Python 3.8+)')
+        self.num_envs = int(num_envs)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(0, min(int(workers), self.num_envs))
+        self.seed = int(seed)
+        self.closed = False
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_VecBuffers.size(self.num_envs))
+        self.buffers = _VecBuffers(self._shm.buf, self.num_envs)
+        self._conns = []
+        self._procs = []
+        self._local = None
+        try:
+            if workers == 0:
+                self._local = [GameEnv(self.seed + i, frame_skip, max_steps, render=render)
+                               for i in range(self.num_envs)]
+            else:
+                ctx = multiprocessing.get_context(context)
+                base, extra = divmod(self.num_envs, workers)
+                first = 0
+                for w in range(workers):
+                    count = base + (1 if w < extra else 0)
+                    parent, child = ctx.Pipe()
+                    proc = ctx.Process(target=_worker, daemon=True,
+                                       args=(child, self._shm.name, self.num_envs, first, count, self.seed,
+                                             frame_skip, max_steps, render))
+                    proc.start()
+                    child.close()
+                    self._conns.append(parent)
+                    self._procs.append(proc)
+                    first += count
+                self._gather()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def workers(self):
+        return len(self._procs)
+
+    def _gather(self):
+        """Wait for every worker's reply; returns the merged payloads."""
+        merged = {}
+        errors = []
+        for conn in self._conns:
+            try:
+                status, payload = conn.recv()
+            except EOFError:
+                status, payload = 'error', 'worker exited'
+            if status == 'error':
+                errors.append(payload)
+            elif payload:
+                merged.update(payload)
+        if errors:
+            raise RuntimeError('VecGameEnv worker failed: ' + '; '.join(errors))
+        return merged
+
+    def reset(self, seed=None):
+        """Reset every env (env `i` from `seed + i` if given); returns the observations."""
+        if self._local is not None:
+            _reset_envs(self._local, 0, self.buffers, seed)
+        else:
+            for conn in self._conns:
+                conn.send(('reset', seed))
+            self._gather()
+        return self.buffers.observations
+
+    def step(self, actions):
+        """Step every env with its action; see the class docstring for the result."""
+        buffers = self.buffers
+        buffers.actions[:] = actions
+        if self._local is not None:
+            finished = _step_envs(self._local, 0, buffers)
+        else:
+            for conn in self._conns:
+                conn.send(('step', None))
+            finished = self._gather()
+        infos = [finished.get(row) or {} for row in range(self.num_envs)]
+        return buffers.observations, buffers.rewards, buffers.terminated, buffers.truncated, infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send(('close', None))
+            except Exception:
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self.buffers.release()
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
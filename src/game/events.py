@@ -0,0 +1,349 @@
+"""Gameplay events and the per-frame bus that carries them to presentation.
+
+The simulation does not play sounds, shake the camera or spray particles
+itself: it reports what happened (`Hit`, `PlayerHurt`, `Cast`, ...) to the
+scene's `EventBus`, and once per frame `flush()` hands the whole batch to
+every subscriber. Subscribers look at the batch as a whole, so reactions
+are coalesced: three enemies hit by one swing give one hit-stop, one
+shake and one layered hit sound, not three; particle bursts are capped per
+frame (`ParticleReactions.max_bursts`).
+
+With no subscriber the bus drops events on arrival, which is how headless
+scenes (training, balance runs) unhook presentation entirely; a muted bus
+(netplay resimulation) does the same for a while. Only cosmetic reactions
+belong here: hitspark and fire effects are simulation state (they are in
+snapshots and the spectator stream) and stay in the scene.
+"""
+from collections import namedtuple
+
+# Layered DSP presets passed to AudioManager.play_sound_effect on melee hits
+# and kills. Kept at module level so tools (benchmarks) process the exact
+# same variants the game caches.
+ATTACK_SFX_LAYERS = [
+    {'pitch': 1.0, 'bitcrush': 0, 'gain': 0.6},
+    {'pitch': 1.2, 'bitcrush': 2, 'gain': 0.4},
+]
+HIT_SFX_LAYERS = [
+    {'pitch': 1.0, 'bitcrush': 0, 'gain': 0.5},
+    {'pitch': 0.8, 'bitcrush': 3, 'gain': 0.5},
+]
+DIE_SFX_LAYERS = [
+    {'pitch': 1.0, 'bitcrush': 0, 'gain': 0.5},
+    {'pitch': 0.85, 'bitcrush': 4, 'gain': 0.5},
+]
+
+# a knight started a swing
+Swing = namedtuple('Swing', 'x y direction')
+# a knight spent its mana on a fireball
+Cast = namedtuple('Cast', 'x y direction')
+# a knight's swing landed on an enemy (world position of the enemy)
+Hit = namedtuple('Hit', 'x y direction killed')
+# a fireball burnt an enemy (world position of the impact)
+FireHit = namedtuple('FireHit', 'x y direction')
+# an enemy's swing landed on the knight; `fatal` when it took the last HP
+PlayerHurt = namedtuple('PlayerHurt', 'x y direction fatal')
+# the knight's death was registered (the death menu follows)
+PlayerDeath = namedtuple('PlayerDeath', 'x y')
+# enemies finished dying this tick
+Kill = namedtuple('Kill', 'count total')
+# the concurrent enemy limit went up
+SpawnLimit = namedtuple('SpawnLimit', 'limit')
+# a knight picked something up ('health')
+Pickup = namedtuple('Pickup', 'kind x y')
+# a projectile moved on (one per projectile and tick); `direction` points backwards
+Trail = namedtuple('Trail', 'x y direction')
+# a knight touched the ground after a jump or fall (x, y at its feet)
+Land = namedtuple('Land', 'x y direction')
+
+EVENT_TYPES = (Swing, Cast, Hit, FireHit, PlayerHurt, PlayerDeath, Kill, SpawnLimit, Pickup, Trail, Land)
+EVENT_NAMES = tuple(kind.__name__ for kind in EVENT_TYPES)
+
+
+class EventBatch:
+    """The events emitted during one frame, grouped by type.
+
+    Within a type the events keep their emission order. `get(Hit)` returns
+    the hits (an empty tuple when there were none), `Hit in batch` tells
+    whether there was any.
+    """
+
+    __slots__ = ('_events', 'count')
+
+    def __init__(self):
+        self._events = {}
+        self.count = 0
+
+    def add(self, event):
+        events = self._events.get(type(event))
+        if events is None:
+            self._events[type(event)] = [event]
+        else:
+            events.append(event)
+        self.count += 1
+
+    def get(self, kind):
+        return self._events.get(kind, ())
+
+    def kinds(self):
+        return self._events.keys()
+
+    def clear(self):
+        self._events.clear()
+        self.count = 0
+
+    def __contains__(self, kind):
+        return kind in self._events
+
+    def __len__(self):
+        return self.count
+
+
+class EventBus:
+    """Collects the events of a frame and delivers them in one `flush()`.
+
+    Subscribers are callables taking an `EventBatch`; they run in the order
+    they subscribed and are called on every flush, also with an empty batch,
+    so per-frame work (particle motion) can live in them too. Events emitted
+    while no one listens, or while `muted`, are dropped.
+    """
+
+    def __init__(self):
+        self.subscribers = []
+        self.muted = False
+        self._batch = EventBatch()
+        # the batch being delivered; events emitted by subscribers go to the next frame
+        self._spare = EventBatch()
+
+    @property
+    def enabled(self):
+        """Whether emitted events are kept; callers may skip building events otherwise."""
+        return bool(self.subscribers) and not self.muted
+
+    def subscribe(self, handler):
+        self.subscribers.append(handler)
+        return handler
+
+    def unsubscribe(self, handler):
+        try:
+            self.subscribers.remove(handler)
+        except ValueError:
+            pass
+
+    def emit(self, event):
+        if self.muted or not self.subscribers:
+            return
+        self._batch.add(event)
+
+    def clear(self):
+        """Drop the events of the current frame without delivering them."""
+        self._batch.clear()
+
+    def flush(self):
+        """Deliver the current frame's batch to every subscriber and start a new one.
+
+        Returns how many events were delivered.
+        """
+        batch = self._batch
+        self._batch, self._spare = self._spare, batch
+        count = batch.count
+        try:
+            for handler in tuple(self.subscribers):
+                try:
+                    handler(batch)
+                except Exception:
+                    pass
+        finally:
+            batch.clear()
+        return count
+
+
+class SoundReactions:
+    """Plays the sound effects of a frame's events through `scene.app.audio`.
+
+    One sound per kind of outcome and frame: any number of melee hits play
+    the layered attack and hit sounds once (and the layered death sound if
+    one of them killed), which also covers the plain swing sound and the
+    hit variant of fireball impacts and wounds in the same frame.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+
+    def __call__(self, batch):
+        if not batch.count:
+            return
+        audio = self.scene.app.audio
+
+        if Cast in batch:
+            try:
+                # play launch SFX (file in assets/sounds/playereffects/fireBallSFX.mp3)
+                audio.play_sound_effect('playereffects/fireBallSFX.mp3', volume=0.95)
+            except Exception:
+                try:
+                    audio.play_sound('playereffects/fireBallSFX.mp3')
+                except Exception:
+                    pass
+
+        hits = batch.get(Hit)
+        if hits:
+            try:
+                audio.play_sound_effect('attack', pitch=1.1, bitcrush=1, distortion=0.03, volume=0.9,
+                                        layers=ATTACK_SFX_LAYERS, async_process=True, cache=True)
+                audio.play_sound_effect('hit', pitch=0.95, bitcrush=2, distortion=0.06, volume=1.0,
+                                        layers=HIT_SFX_LAYERS, async_process=True, cache=True)
+                if any(hit.killed for hit in hits):
+                    audio.play_sound_effect('die', pitch=0.9, bitcrush=3, distortion=0.12, volume=0.9,
+                                            layers=DIE_SFX_LAYERS, async_process=True, cache=True)
+            except Exception:
+                pass
+        elif Swing in batch:
+            try:
+                audio.play_sound_effect('attack', pitch=1.1, bitcrush=1, distortion=0.03, volume=0.9)
+            except Exception:
+                pass
+
+        hurt = batch.get(PlayerHurt)
+        if not hits and (hurt or FireHit in batch):
+            try:
+                audio.play_variant('hit')
+            except Exception:
+                pass
+        if any(event.fatal for event in hurt):
+            try:
+                audio.play_variant('die')
+                # restart() brings the battle music back
+                self.scene.game_over_music = True
+                audio.crossfade_music('game_over', fade_ms=1000)
+            except Exception:
+                pass
+
+        if SpawnLimit in batch:
+            try:
+                audio.play_sound_effect('alert/demonLaugh.mp3', pitch=0.95, volume=0.95)
+            except Exception:
+                try:
+                    audio.play_sound('alert/demonLaugh.mp3')
+                except Exception:
+                    pass
+
+        if Pickup in batch:
+            try:
+                audio.play_sound_effect('heal')
+            except Exception:
+                pass
+
+        if PlayerDeath in batch:
+            try:
+                audio.set_sfx_volume(0)
+            except Exception:
+                pass
+
+
+class CameraReactions:
+    """Hit-stop, screen shake and zoom punch, at most once per frame.
+
+    A wound to the knight shakes and zooms harder than the knight's own hits;
+    when both happen in one frame the stronger feedback wins. Slow motion
+    goes through the scene's `_slow_motion` hook, which fixed-step scenes
+    turn off.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+
+    def __call__(self, batch):
+        hurt = PlayerHurt in batch
+        if not hurt and Hit not in batch:
+            return
+        scene = self.scene
+        try:
+            scene._slow_motion(duration_ms=220, scale=0.35)
+        except Exception:
+            pass
+        try:
+            scene.camera.start_shake(duration_ms=260, magnitude=10 if hurt else 8)
+        except Exception:
+            pass
+        try:
+            scene.app.trigger_zoom(duration_ms=220, magnitude=1.08 if hurt else 1.06)
+        except Exception:
+            pass
+
+
+class ParticleReactions:
+    """Emits the particle bursts of a frame's events and moves `scene.particles` on.
+
+    At most `max_bursts` bursts per kind of event are emitted in a frame, so
+    a swing through a crowd costs no more than a few enemies' worth.
+    """
+
+    max_bursts = 8
+
+    def __init__(self, scene):
+        self.scene = scene
+
+    def __call__(self, batch):
+        particles = self.scene.particles
+        if batch.count:
+            limit = self.max_bursts
+            emit = particles.emit
+            try:
+                for event in batch.get(Hit)[:limit]:
+                    emit(event.x, event.y, 'hit', direction=event.direction)
+                    if event.killed:
+                        emit(event.x, event.y, 'kill', direction=event.direction)
+                for event in batch.get(FireHit)[:limit]:
+                    emit(event.x, event.y, 'fire', direction=event.direction)
+                    emit(event.x, event.y, 'kill', direction=event.direction)
+                for event in batch.get(PlayerHurt)[:limit]:
+                    emit(event.x, event.y, 'hit', direction=event.direction)
+                for event in batch.get(Trail):
+                    emit(event.x, event.y, 'trail', direction=event.direction)
+                for event in batch.get(Land)[:limit]:
+                    emit(event.x, event.y, 'dust', direction=event.direction)
+            except Exception:
+                pass
+        particles.update()
+
+
+class EventCounter:
+    """Telemetry subscriber: how many events of each type were emitted.
+
+    `counts` maps the event type name to its total; `frames` counts the
+    flushes and `busy_frames` those that delivered at least one event.
+    `take()` returns the counts since the previous `take()`. Gameplay
+    subscribes one when `--telemetry` is on, and `GameApp` logs `take()`
+    with every frame record.
+    """
+
+    def __init__(self):
+        self.counts = dict.fromkeys(EVENT_NAMES, 0)
+        self._recent = dict.fromkeys(EVENT_NAMES, 0)
+        self.frames = 0
+        self.busy_frames = 0
+
+    def __call__(self, batch):
+        self.frames += 1
+        if not batch.count:
+            return
+        self.busy_frames += 1
+        counts = self.counts
+        recent = self._recent
+        for kind in batch.kinds():
+            name = kind.__name__
+            n = len(batch.get(kind))
+            counts[name] = counts.get(name, 0) + n
+            recent[name] = recent.get(name, 0) + n
+
+    def take(self):
+        """Counts per type (`EVENT_NAMES` order) since the last call, and start over."""
+        recent = self._recent
+        values = tuple(recent[name] for name in EVENT_NAMES)
+        for name in EVENT_NAMES:
+            recent[name] = 0
+        return values
+
+
+def presentation(scene):
+    """The subscribers that turn a Gameplay scene's events into sound, camera feedback and particles."""
+    return [SoundReactions(scene), CameraReactions(scene), ParticleReactions(scene)]
@@ -0,0 +1,64 @@
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame  # noqa: E402
+from .utils.audio import NullAudio  # noqa: E402
+from .scene_assets import SceneAssets  # noqa: E402
+
+
+def init_headless(size=None):
+    """Initialise pygame without a real window or sound device.
+
+    Uses SDL's dummy video/audio drivers so scenes, entities and audio DSP
+    can be exercised on CI boxes or servers. Returns the display surface.
+    """
+    from .settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # no window to turn SIGINT/SIGTERM into QUIT events for; leave them to
+    # Python so worker processes can be interrupted and terminated
+    os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+    pygame.init()
+    if size is None:
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    # a display mode is required for convert_alpha() in the asset loaders
+    return pygame.display.set_mode(size)
+
+
+class HeadlessApp:
+    """Minimal stand-in for `GameApp` that scenes can be constructed with.
+
+    Provides the attributes and hooks scenes reach for (`screen`, `audio`,
+    `trigger_slow_motion`, `trigger_zoom`, `change_scene`, ...) without
+    running the main loop.
+    """
+
+    def __init__(self, audio=None, size=None):
+        from .settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+
+        if size is None:
+            size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.screen = pygame.Surface(size)
+        self.audio = audio if audio is not None else NullAudio()
+        self.running = True
+        self.FPS = FPS
+        self.time_scale = 1.0
+        self.slow_motion_end = 0
+        self.current_scene = None
+        self.assets = SceneAssets()
+
+    def change_scene(self, scene):
+        self.current_scene = scene(self)
+        self.assets.prune(self.current_scene)
+
+    def go_to_menu(self):
+        self.running = False
+
+    def trigger_slow_motion(self, duration_ms=200, scale=0.3):
+        self.time_scale = max(0.01, min(1.0, scale))
+        self.slow_motion_end = pygame.time.get_ticks() + int(duration_ms)
+
+    def trigger_zoom(self, duration_ms=220, magnitude=1.08):
+        return None
@@ -0,0 +1,386 @@
+"""Two-player netplay with rollback over UDP.
+
+Peers never exchange game state, only their inputs: one byte of button
+bits per player and tick (`IN_LEFT` ... `IN_CAST`). Each side runs the same
+deterministic simulation (`NetplayGameplay`, fixed-step clock, shared RNG
+seed) and `RollbackSession` keeps the two in step:
+
+- local inputs are scheduled `input_delay` ticks ahead, which hides that
+  much latency outright;
+- a remote input that has not arrived yet is predicted (held buttons are
+  repeated, presses are not) and the tick is simulated right away;
+- when the real input differs from the prediction the scene is restored
+  from the snapshot taken before that tick and the ticks since are
+  resimulated, muted (see `snapshot.py` for the state format);
+- at most `max_rollback` ticks are ever unconfirmed; beyond that the
+  session waits for the peer instead of simulating (a stall).
+
+Every packet repeats all local inputs the peer has not acknowledged yet,
+so lost or reordered datagrams need no retransmission logic, and carries
+the state hash of the newest tick confirmed on both sides so desyncs are
+detected. `LossyLink` wraps a transport with artificial delay, jitter and
+loss for testing on one machine (see tools/netplay_harness.py).
+"""
+import heapq
+import random
+import socket
+import struct
+import time
+
+import pygame
+
+from .settings import FPS, NETPLAY_EPOCH_MS, NETPLAY_INPUT_DELAY, NETPLAY_MAX_ROLLBACK
+from .snapshot import state_hash
+
+IN_LEFT = 1
+IN_RIGHT = 2
+IN_JUMP = 4
+IN_ATTACK = 8
+IN_CAST = 16
+# buttons that stay down across ticks; only these are repeated by prediction
+HELD_BITS = IN_LEFT | IN_RIGHT | IN_JUMP
+
+# the keys Player.handle_input reads, by the input bit they stand for
+_KEY_BITS = {
+    pygame.K_LEFT: IN_LEFT, pygame.K_a: IN_LEFT,
+    pygame.K_RIGHT: IN_RIGHT, pygame.K_d: IN_RIGHT,
+    pygame.K_SPACE: IN_JUMP, pygame.K_w: IN_JUMP, pygame.K_UP: IN_JUMP,
+}
+
+# kind, ack tick, hash tick, hash, first input tick, input count; the
+# input bytes follow
+_PACKET = struct.Struct('<BiiIiB')
+PACKET_INPUTS = 1
+MAX_INPUTS_PER_PACKET = 255
+
+# how many ticks of state hashes are kept for comparison with the peer
+_HASH_HISTORY = 120
+
+
+def tick_time(tick):
+    """Simulation time (ms) of `tick` on the fixed-step netplay clock."""
+    return NETPLAY_EPOCH_MS + tick * 1000 // FPS
+
+
+def encode_keys(keys):
+    """Movement bits of a `pygame.key.get_pressed()` state."""
+    bits = 0
+    for key, bit in _KEY_BITS.items():
+        if keys[key]:
+            bits |= bit
+    return bits
+
+
+class InputKeys:
+    """Read-only key state built from input bits, for `Player.handle_input`."""
+
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        return bool(self.bits & _KEY_BITS.get(key, 0))
+
+
+def encode_packet(ack, hash_tick, hash_value, first_tick, inputs):
+    return _PACKET.pack(PACKET_INPUTS, ack, hash_tick, hash_value, first_tick, len(inputs)) + bytes(inputs)
+
+
+def decode_packet(data):
+    """(ack, hash_tick, hash, first_tick, input bytes), or None for a malformed packet."""
+    if len(data) < _PACKET.size:
+        return None
+    kind, ack, hash_tick, hash_value, first_tick, count = _PACKET.unpack_from(data)
+    if kind != PACKET_INPUTS or len(data) != _PACKET.size + count:
+        return None
+    return ack, hash_tick, hash_value, first_tick, data[_PACKET.size:]
+
+
+class UdpTransport:
+    """Non-blocking UDP socket talking to a single peer.
+
+    Binds `host:port` (port 0 picks a free one, see `address`). Without a
+    `peer` the first address a datagram arrives from becomes the peer, so
+    the hosting side does not need to know where the other one is.
+    """
+
+    def __init__(self, port=0, peer=None, host='127.0.0.1'):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.peer = peer
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def send(self, data):
+        if self.peer is None:
+            return
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError:
+            # peer not listening yet or buffer full: the next packet repeats the inputs
+            pass
+
+    def receive(self):
+        """Every datagram waiting from the peer."""
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except OSError:
+                break
+            if self.peer is None:
+                self.peer = addr
+            if addr == self.peer:
+                packets.append(data)
+        return packets
+
+    def close(self):
+        try:
+            self.sock.close()
+        except Exception:
+            pass
+
+
+class LossyLink:
+    """Transport wrapper that delays, jitters and drops outgoing packets.
+
+    Each send is dropped with probability `loss`, otherwise handed to the
+    wrapped transport `delay_ms` plus up to `jitter_ms` later, so packets
+    also arrive out of order. Pending packets go out on the next
+    `send()`/`receive()` call. Seed it for reproducible runs.
+    """
+
+    def __init__(self, transport, delay_ms=0, jitter_ms=0, loss=0.0, seed=None, clock=time.perf_counter):
+        self.transport = transport
+        self.delay_ms = max(0.0, float(delay_ms))
+        self.jitter_ms = max(0.0, float(jitter_ms))
+        self.loss = max(0.0, min(1.0, float(loss)))
+        self.rng = random.Random(seed)
+        self.clock = clock
+        # (due time, sequence, packet)
+        self._queue = []
+        self._seq = 0
+        self.dropped = 0
+
+    @property
+    def address(self):
+        return self.transport.address
+
+    def send(self, data):
+        self.flush()
+        if self.loss and self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        due = self.clock() + (self.delay_ms + self.rng.uniform(0.0, self.jitter_ms)) / 1000.0
+        heapq.heappush(self._queue, (due, self._seq, data))
+        self._seq += 1
+
+    def flush(self):
+        """Hand every packet whose delay has passed to the transport."""
+        now = self.clock()
+        queue = self._queue
+        while queue and queue[0][0] <= now:
+            self.transport.send(heapq.heappop(queue)[2])
+
+    def receive(self):
+        self.flush()
+        return self.transport.receive()
+
+    def close(self):
+        self.transport.close()
+
+
+class RollbackSession:
+    """Keeps a two-player scene in step with a remote peer (see the module docstring).
+
+    The scene provides `snapshot()`, `restore(data)` and
+    `simulate(inputs, tick, resim)`, which runs one tick with the input
+    bits of both players (`resim` is True while replaying after a
+    rollback, when sound and particles should stay silent). Call
+    `advance(bits)` once per frame with the local player's bits; it returns
+    False when the session stalled waiting for the peer and the bits were
+    not consumed.
+
+    Counters: `rollbacks`, `resimulated` (ticks replayed), `resim_ms` (CPU
+    time spent replaying), `stalls`, `desyncs` (hash mismatches with the
+    peer, first one at `desync_tick`), `sent` and `received` packets.
+    """
+
+    def __init__(self, scene, local_index, transport, input_delay=NETPLAY_INPUT_DELAY,
+                 max_rollback=NETPLAY_MAX_ROLLBACK):
+        self.scene = scene
+        self.local = int(local_index)
+        self.remote = 1 - self.local
+        self.transport = transport
+        self.input_delay = max(0, int(input_delay))
+        self.max_rollback = max(1, int(max_rollback))
+        # next tick to simulate
+        self.tick = 0
+        # known input bits per player, by tick; the first input_delay ticks
+        # are empty on both sides
+        self.inputs = ({}, {})
+        for t in range(self.input_delay):
+            self.inputs[0][t] = self.inputs[1][t] = 0
+        # every remote input up to this tick has arrived
+        self.confirmed = self.input_delay - 1
+        # the peer has every local input up to this tick
+        self.peer_ack = self.input_delay - 1
+        # remote bits the unconfirmed simulated ticks were run with
+        self.predicted = {}
+        # state at the start of each tick that may still be rolled back
+        self.snapshots = {}
+        # hash of the state at the end of each recent tick
+        self.hashes = {}
+        # hashes reported by the peer, compared once the local tick is final
+        self.remote_hashes = {}
+        self._rollback_from = None
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.resim_ms = 0.0
+        self.stalls = 0
+        self.desyncs = 0
+        self.desync_tick = -1
+        self.sent = 0
+        self.received = 0
+
+    def advance(self, local_bits):
+        """Schedule the local input and simulate one tick, unless too far ahead of the peer."""
+        self.poll()
+        if self.tick - self.confirmed > self.max_rollback:
+            self.stalls += 1
+            self._send()
+            return False
+        self.inputs[self.local][self.tick + self.input_delay] = local_bits & 0xFF
+        self._simulate(self.tick, False)
+        self.tick += 1
+        self._trim()
+        self._send()
+        return True
+
+    def idle(self):
+        """Exchange packets without simulating (e.g. after the last tick of a test run)."""
+        self.poll()
+        self._send()
+
+    def poll(self):
+        """Take in the peer's packets and roll back if a prediction was wrong."""
+        remote = self.inputs[self.remote]
+        for data in self.transport.receive():
+            packet = decode_packet(data)
+            if packet is None:
+                continue
+            self.received += 1
+            ack, hash_tick, hash_value, first, bits = packet
+            if ack > self.peer_ack:
+                self.peer_ack = ack
+            if hash_tick >= 0:
+                self.remote_hashes[hash_tick] = hash_value
+            for t, b in enumerate(bits, first):
+                if t <= self.confirmed or t in remote:
+                    continue
+                remote[t] = b
+                if t < self.tick and self.predicted.pop(t, b) != b:
+                    if self._rollback_from is None or t < self._rollback_from:
+                        self._rollback_from = t
+        while self.confirmed + 1 in remote:
+            self.confirmed += 1
+        if self._rollback_from is not None:
+            self._rollback()
+        self._check_hashes()
+
+    def confirmed_hashes(self):
+        """{tick: hash} of the recent ticks that can no longer change."""
+        final = min(self.confirmed, self.tick - 2)
+        return {t: h for t, h in self.hashes.items() if t <= final}
+
+    def stats(self):
+        return {
+            'ticks': self.tick,
+            'confirmed': self.confirmed,
+            'rollbacks': self.rollbacks,
+            'resimulated': self.resimulated,
+            'resim_ms': self.resim_ms,
+            'stalls': self.stalls,
+            'desyncs': self.desyncs,
+            'desync_tick': self.desync_tick,
+            'sent': self.sent,
+            'received': self.received,
+        }
+
+    def close(self):
+        self.transport.close()
+
+    # -- internals ----------------------------------------------------------
+
+    def _simulate(self, tick, resim):
+        data = self.scene.snapshot()
+        self.snapshots[tick] = data
+        self.hashes[tick - 1] = state_hash(data)
+        remote = self.inputs[self.remote].get(tick)
+        if remote is None:
+            # repeat the held buttons of the newest confirmed input
+            remote = self.inputs[self.remote].get(self.confirmed, 0) & HELD_BITS
+            self.predicted[tick] = remote
+        inputs = [0, 0]
+        inputs[self.local] = self.inputs[self.local][tick]
+        inputs[self.remote] = remote
+        self.scene.simulate(inputs, tick, resim)
+
+    def _rollback(self):
+        start = self._rollback_from
+        self._rollback_from = None
+        t0 = time.perf_counter()
+        self.scene.restore(self.snapshots[start])
+        for t in range(start, self.tick):
+            self._simulate(t, True)
+        self.resim_ms += (time.perf_counter() - t0) * 1000.0
+        self.rollbacks += 1
+        self.resimulated += self.tick - start
+
+    def _check_hashes(self):
+        final = min(self.confirmed, self.tick - 2)
+        oldest = self.tick - _HASH_HISTORY
+        for t in list(self.remote_hashes):
+            if t > final:
+                continue
+            theirs = self.remote_hashes.pop(t)
+            mine = self.hashes.get(t)
+            if mine is not None and mine != theirs:
+                self.desyncs += 1
+                if self.desync_tick < 0:
+                    self.desync_tick = t
+        for t in [t for t in self.remote_hashes if t < oldest]:
+            del self.remote_hashes[t]
+
+    def _trim(self):
+        # confirmed ticks are never rolled back
+        for t in [t for t in self.snapshots if t <= self.confirmed]:
+            del self.snapshots[t]
+        oldest = self.tick - _HASH_HISTORY
+        for t in [t for t in self.hashes if t < oldest]:
+            del self.hashes[t]
+        # local inputs: kept until the peer has them and no resimulation needs them
+        local = self.inputs[self.local]
+        for t in [t for t in local if t <= self.peer_ack and t <= self.confirmed and t < self.tick]:
+            del local[t]
+        # remote inputs: the newest confirmed one seeds the prediction
+        remote = self.inputs[self.remote]
+        for t in [t for t in remote if t < self.confirmed and t < self.tick]:
+            del remote[t]
+
+    def _send(self):
+        local = self.inputs[self.local]
+        last = self.tick - 1 + self.input_delay
+        first = max(self.peer_ack + 1, last - MAX_INPUTS_PER_PACKET + 1)
+        bits = [local[t] for t in range(first, last + 1)]
+        hash_tick = min(self.confirmed, self.tick - 2)
+        hash_value = self.hashes.get(hash_tick)
+        if hash_value is None:
+            hash_tick, hash_value = -1, 0
+        self.transport.send(encode_packet(self.confirmed, hash_tick, hash_value, first, bits))
+        self.sent += 1
@@ -0,0 +1,58 @@
+RESTART = 'restart'
+SESSION = 'session'
+
+
+class SceneAssets:
+    """Expensive scene objects retained across scene changes.
+
+    Scenes fetch what is costly to rebuild (layer images, pools) with
+    `get(owner, key, factory, scope)`: the object is built once and handed
+    back to later scenes instead of being reconstructed. The scope is the
+    retention policy:
+
+    - RESTART: kept only while the current scene is still an `owner`
+      instance, i.e. across `change_scene(self.__class__)` restarts; dropped
+      (and `release` called on it) as soon as another scene takes over.
+    - SESSION: kept for the whole run, e.g. assets every visit to the scene
+      loads identically.
+
+    The app calls `prune(scene)` after every scene change.
+    """
+
+    def __init__(self):
+        # key -> (object, owner class, scope, release callable or None)
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, owner, key, factory, scope=RESTART, release=None):
+        """The retained object for `key`, built with `factory()` on first use."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry[0]
+        obj = factory()
+        self._entries[key] = (obj, owner, scope, release)
+        return obj
+
+    def prune(self, scene):
+        """Release RESTART entries whose owner is not the class of `scene`."""
+        for key, (obj, owner, scope, release) in list(self._entries.items()):
+            if scope == RESTART and not isinstance(scene, owner):
+                self._drop(key, obj, release)
+
+    def clear(self):
+        """Release every retained object."""
+        for key, (obj, _owner, _scope, release) in list(self._entries.items()):
+            self._drop(key, obj, release)
+
+    def _drop(self, key, obj, release):
+        del self._entries[key]
+        if release is not None:
+            try:
+                release(obj)
+            except Exception:
+                pass
@@ -1,14 +1,25 @@
 import pygame
 import random
-from ..settings import WHITE, ATTACK_RANGE, ATTACK_HEIGHT_FACTOR
+from ..settings import (WHITE, ATTACK_RANGE, LOD_MARGIN, LOD_FAR_DISTANCE, LOD_AI_INTERVAL, SPAWN_BUDGET_MS,
+                        SPAWN_MIN_PLAYER_DISTANCE)
 from ..entities.player import Player
-from ..entities.enemy import Enemy
+from ..entities.enemy import Enemy, LOD_FULL, LOD_REDUCED, LOD_FAR
+from ..entities.archetype import get_registry
+from ..entities.states import ATTACK1
 from ..entities.effects import Hitspark
 from ..entities.effects.fireinbody import FireInBody
 from ..entities.health import Health
 from ..entities.effects.fireball import Fireball
+from ..entities.effects.pool import compact
+from ..entities.effects.particles import ParticleSystem
 from ..camera import Camera
 from ..background import ParallaxBackground
+from ..spatial import SpatialGrid
+from ..spawn_director import SpawnDirector
+from ..scene_assets import RESTART, SESSION
+from ..snapshot import pack_gameplay, unpack_gameplay, state_hash as snapshot_hash
+from ..events import (EventBus, EventCounter, presentation, Swing, Cast, Hit, FireHit, PlayerHurt, PlayerDeath, Kill,
+                      SpawnLimit, Pickup, Trail, Land)
 
 class Gameplay:
     def __init__(self, app):
@@ -22,19 +33,60 @@ class Gameplay:
 
         self.ground_y = self.world_height - 150
 
+        # simulation time of the current tick (see _clock)
+        self.now = self._clock()
+
         self.player = Player(400, self.ground_y - 160)
+        # every knight in the scene (netplay adds a second one)
+        self.players = [self.player]
+
+        # broad phase for every collision/proximity query (enemies, pickups)
+        self.spatial = SpatialGrid(self.world_width)
+
+        # dead enemies go back to the Enemy pool, which outlives restarts of
+        # this scene and is drained when another scene takes over
+        self._retained('enemy_pool', lambda: Enemy, RESTART, release=lambda cls: cls.drain())
 
         self.enemies = []
-        test_enemy = Enemy(1000, self.ground_y - 160)
+        test_enemy = Enemy.acquire(1000, self.ground_y - 160)
         self.enemies.append(test_enemy)
+        self.spatial.insert(test_enemy, test_enemy.get_hitbox(), 'enemy')
+
+        # off-screen level of detail: tick counter that staggers reduced-rate
+        # AI, and how many enemies ran in each tier last tick
+        self.lod_enabled = True
+        self.lod_tick = 0
+        self.lod_counts = [0, 0, 0]
+
+        # every random decision of the simulation draws from this generator,
+        # so its state is part of the rollback snapshot
+        self.rng = random.Random()
+
+        # builds and places enemies within a per-frame time budget
+        self.spawner = SpawnDirector(self.world_width, self.ground_y - 160, budget_ms=SPAWN_BUDGET_MS,
+                                     min_player_distance=SPAWN_MIN_PLAYER_DISTANCE,
+                                     pick_archetype=self._pick_archetype, rng=self.rng)
 
         self.kill_count = 0
         # maximum concurrent enemies allowed (starts at current count)
         self.enemy_spawn_limit = max(1, len(self.enemies))
-        # next kill count at which to increase enemy_spawn_limit
-        self.next_kill_threshold = 5
+        # next kill count at which to increase enemy_spawn_limit, and the
+        # kills between one increase and the next
+        self.kill_threshold_step = 5
+        self.next_kill_threshold = self.kill_threshold_step
 
         self.effects = []
+        # vectorized hit/kill/fire particles (no-op without numpy)
+        self.particles = ParticleSystem()
+        # hits, kills, casts, ... reach sound, camera and particles through
+        # here, coalesced once per frame (see events.py)
+        self.events = EventBus()
+        self.presentation = []
+        self.set_presentation(True)
+        # per-frame event counts for the --telemetry capture
+        self.event_counter = None
+        if getattr(app, 'telemetry', None) is not None:
+            self.event_counter = self.events.subscribe(EventCounter())
         # transient on-screen alert when a new soldier joins the battle
         self.spawn_alert = None  # dict with keys: start, duration_ms, limit
         # mana system for spells
@@ -50,7 +102,10 @@ class Gameplay:
 
         self.camera = Camera(self.screen_width, self.screen_height, self.world_width, self.world_height)
 
-        self.background = ParallaxBackground(self.screen_width, self.screen_height, self.world_width, self.ground_y)
+        # the layers are identical every visit: load them once per session
+        self.background = self._retained(
+            ('background', self.screen_width, self.screen_height, self.world_width, self.ground_y),
+            self._make_background, SESSION)
 
         try:
             prev_scene = getattr(self.app, 'current_scene', None)
@@ -74,6 +129,11 @@ class Gameplay:
             except Exception:
                 pass
 
+        # volumes restart() puts back: death mutes the sound effects
+        self._remember_volumes()
+        # set once the death crossfade to the game-over track has run
+        self.game_over_music = False
+
         self.font = self._choose_game_font(28)
 
         self.is_dead = False
@@ -92,6 +152,114 @@ class Gameplay:
         self.pause_options = ['CONTINUAR', 'CONFIGURAÇÃO', 'VOLTAR PARA O MENU']
         self.config_overlay = None
 
+        self._snapshot_initial_state()
+
+    # -- restart ----------------------------------------------------------
+
+    # scalar attributes restored verbatim by restart()
+    _RESTART_FIELDS = ('mana', 'kill_count', 'enemy_spawn_limit', 'next_kill_threshold',
+                       'next_health_spawn_time', 'last_attack_time', 'lod_tick')
+
+    def _snapshot_initial_state(self):
+        """Record the opening state that `restart()` restores in place.
+
+        Only positions, archetypes and counters are kept; frames, fonts, the
+        background and the music are left alone on restart.
+        """
+        pickup = self.health_pickup
+        self._initial_state = {
+            'player': self.player.rect.topleft,
+            'enemies': tuple((e.rect.x, e.rect.y, e.archetype) for e in self.enemies),
+            'health_pickup': None if pickup is None else pickup.rect.topleft,
+            'fields': tuple((name, getattr(self, name)) for name in self._RESTART_FIELDS),
+        }
+
+    def restart(self):
+        """Restart the level in place from the snapshot taken by `__init__`.
+
+        Enemies go back through the pool, effects and projectiles are
+        released, and the player is reset; no asset is loaded. The volumes
+        muted at death are put back, and the battle music keeps playing
+        unless the death crossfade replaced it with the game-over track.
+        """
+        state = self._initial_state
+        now = self.now = self._clock()
+
+        self._recycle_enemies()
+        for x, y, archetype in state['enemies']:
+            self._add_enemy(Enemy.acquire(x, y, archetype, now))
+        self.player.reset(*state['player'], now=now)
+
+        for items in (self.effects, self.projectiles):
+            for obj in items:
+                obj.finished = True
+            compact(items)
+        self.particles.clear()
+        self.events.clear()
+
+        self.spatial.clear('health')
+        self.health_pickup = None
+        if state['health_pickup'] is not None:
+            self.health_pickup = Health(*state['health_pickup'])
+            self.spatial.insert(self.health_pickup, self.health_pickup.get_hitbox(), 'health')
+
+        for name, value in state['fields']:
+            setattr(self, name, value)
+        self.spawn_alert = None
+
+        self.is_dead = False
+        self.death_time = 0
+        self.death_menu_active = False
+        self.death_menu_index = 0
+        self.paused = False
+        self.pause_index = 0
+        self.config_overlay = None
+
+        # drop the slow motion / zoom / shake of the killing blow
+        self.app.time_scale = 1.0
+        self.app.slow_motion_end = 0
+        if hasattr(self.app, '_zoom_start'):
+            self.app._zoom_start = 0
+            self.app._zoom_duration = 0
+        self.camera.shake_end = 0
+        self.camera.offset_x = self.camera.offset_y = 0
+        self.camera.update(self.player.rect)
+
+        self._restore_volumes()
+        if self.game_over_music:
+            self.game_over_music = False
+            try:
+                self.app.audio.stop_battle_music()
+                self.app.audio.start_battle_music(('battlemusic1', 'battlemusic2'), crossfade_s=3.0)
+            except Exception:
+                pass
+
+    def _remember_volumes(self):
+        audio = self.app.audio
+        self._volumes = (getattr(audio, 'music_volume', None), getattr(audio, 'sfx_volume', None),
+                         getattr(audio, 'master_volume', None))
+
+    def _restore_volumes(self):
+        music, sfx, master = self._volumes
+        audio = self.app.audio
+        try:
+            if music is not None:
+                audio.set_music_volume(music)
+            if sfx is not None:
+                audio.set_sfx_volume(sfx)
+            if master is not None:
+                audio.set_master_volume(master)
+        except Exception:
+            pass
+
+    def set_presentation(self, enabled):
+        """Hook the sound, camera and particle reactions to `self.events`, or unhook them all."""
+        for handler in self.presentation:
+            self.events.unsubscribe(handler)
+        self.presentation = presentation(self) if enabled else []
+        for handler in self.presentation:
+            self.events.subscribe(handler)
+
     def _choose_game_font(self, size, bold=False):
         preferred = [
             'PressStart2P',
@@ -140,32 +308,8 @@ class Gameplay:
                     if choice == 'REINICIAR FASE':
 
                         try:
-
-                            try:
-                                from ..utils.config import load_config
-                                cfg = load_config()
-                                try:
-                                    self.app.audio.set_music_volume(cfg.get('music_volume', 0.6))
-                                    self.app.audio.set_sfx_volume(cfg.get('sfx_volume', 1.0))
-                                    self.app.audio.set_master_volume(cfg.get('master_volume', 1.0))
-                                except Exception:
-                                    pass
-                            except Exception:
-                                pass
-                            self.app.change_scene(self.__class__)
+                            self.restart()
                         except Exception:
-
-                            try:
-                                from ..utils.config import load_config
-                                cfg = load_config()
-                                try:
-                                    self.app.audio.set_music_volume(cfg.get('music_volume', 0.6))
-                                    self.app.audio.set_sfx_volume(cfg.get('sfx_volume', 1.0))
-                                    self.app.audio.set_master_volume(cfg.get('master_volume', 1.0))
-                                except Exception:
-                                    pass
-                            except Exception:
-                                pass
                             self.app.go_to_menu()
                     else:
 
@@ -200,18 +344,7 @@ class Gameplay:
                         if rect.collidepoint(mx, my):
                             if opt == 'REINICIAR FASE':
                                 try:
-                                    from ..utils.config import load_config
-                                    try:
-                                        cfg = load_config()
-                                        try:
-                                            self.app.audio.set_music_volume(cfg.get('music_volume', 0.6))
-                                            self.app.audio.set_sfx_volume(cfg.get('sfx_volume', 1.0))
-                                            self.app.audio.set_master_volume(cfg.get('master_volume', 1.0))
-                                        except Exception:
-                                            pass
-                                    except Exception:
-                                        pass
-                                    self.app.change_scene(self.__class__)
+                                    self.restart()
                                 except Exception:
                                     self.app.go_to_menu()
                             else:
@@ -242,39 +375,10 @@ class Gameplay:
             # Spell cast with SHIFT
             if event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
                 try:
-                    # cannot cast while alert is active or while locked
+                    # cannot cast while alert is active
                     if getattr(self, 'spawn_alert', None):
                         return
-                    if getattr(self.player, 'locked', False):
-                        return
-                    if self.mana >= self.max_mana:
-                        # consume mana
-                        self.mana = 0
-                        # play cast animation and lock player
-                        try:
-                            self.player.attack()
-                        except Exception:
-                            try:
-                                self.player._set_state('attack1')
-                            except Exception:
-                                pass
-                        # spawn fireball from player's center
-                        try:
-                            hb = self.player.get_hitbox()
-                            fx = hb.centerx
-                            fy = hb.centery
-                            fb = Fireball(fx, fy, self.player.facing)
-                            self.projectiles.append(fb)
-                        except Exception:
-                            pass
-                        try:
-                            # play launch SFX (file in assets/sounds/playereffects/fireBallSFX.mp3)
-                            self.app.audio.play_sound_effect('playereffects/fireBallSFX.mp3', volume=0.95)
-                        except Exception:
-                            try:
-                                self.app.audio.play_sound('playereffects/fireBallSFX.mp3')
-                            except Exception:
-                                pass
+                    self._cast_fireball(self._clock())
                 except Exception:
                     pass
             if event.key == pygame.K_ESCAPE:
@@ -307,184 +411,333 @@ class Gameplay:
                 return
 
             if event.key in (pygame.K_LCTRL, pygame.K_RCTRL):
-                now = pygame.time.get_ticks()
-                if now - self.last_attack_time >= self.attack_cooldown_ms:
-                    self.last_attack_time = now
-                    try:
-                        self.app.audio.play_sound_effect('attack', pitch=1.1, bitcrush=1, distortion=0.03, volume=0.9)
-                    except Exception:
-                        pass
-                    self.player.attack()
+                self._try_attack(self._clock())
+
+    def _clock(self):
+        """Simulation time (ms) for the current tick; netplay runs a fixed-step clock instead."""
+        return pygame.time.get_ticks()
+
+    def _read_keys(self):
+        """Key state the player moves by this tick; the training scene feeds input bits instead."""
+        return pygame.key.get_pressed()
+
+    def _try_attack(self, now):
+        """Start a swing of `self.player` unless the attack cooldown is running."""
+        if now - self.last_attack_time < self.attack_cooldown_ms:
+            return False
+        self.last_attack_time = now
+        self.events.emit(Swing(self.player.rect.centerx, self.player.rect.centery, self.player.facing))
+        self.player.attack(now)
+        return True
+
+    def _cast_fireball(self, now):
+        """Spend a full mana bar on a fireball from `self.player`. Returns True if cast."""
+        if self.player.locked or self.mana < self.max_mana:
+            return False
+        # consume mana
+        self.mana = 0
+        # play cast animation and lock player
+        try:
+            self.player.attack(now)
+        except Exception:
+            try:
+                self.player._set_state(ATTACK1, now)
+            except Exception:
+                pass
+        # spawn fireball from player's center
+        try:
+            hb = self.player.get_hitbox()
+            fb = Fireball.acquire(hb.centerx, hb.centery, self.player.facing, now=now)
+            self.projectiles.append(fb)
+            self.events.emit(Cast(hb.centerx, hb.centery, self.player.facing))
+        except Exception:
+            pass
+        return True
 
     def update(self):
 
         # Pause updates when paused, when config overlay is open, or when a spawn alert is active
         if self.paused or self.config_overlay or getattr(self, 'spawn_alert', None):
+            if getattr(self, 'spawn_alert', None):
+                # the game is frozen behind the alert: build the newcomers now
+                self._prewarm_spawns()
             return
 
-        now = pygame.time.get_ticks()
+        # one clock read per tick, shared by every animation below
+        now = self.now = self._clock()
 
         if not self.is_dead:
-            keys = pygame.key.get_pressed()
+            keys = self._read_keys()
             self.player.handle_input(keys)
-            self.player.update(self.world_width, self.world_height, self.ground_y)
+            self._update_player(self.player, now)
 
-            for enemy in self.enemies:
-                enemy.update(self.player, self.world_width, self.world_height, self.ground_y)
+            self._update_enemies(now)
 
             self._check_player_attack_collision()
 
             self._check_enemy_attack_collision()
 
             # Count deaths that have finished their death animation and remove them.
-            deaths_this_frame = 0
-            for enemy in self.enemies:
-                if enemy.current_hp <= 0 and now - enemy.death_time > 1000:
-                    deaths_this_frame += 1
+            deaths_this_frame = self._remove_dead_enemies(now)
 
             if deaths_this_frame:
-                self.kill_count += deaths_this_frame
+                self._register_kills(deaths_this_frame)
 
-                # reward mana per kill
-                try:
-                    self.mana = min(self.max_mana, self.mana + self.mana_per_kill * deaths_this_frame)
-                except Exception:
-                    pass
+            # Maintain enemy count up to the current spawn limit
+            self._replenish_enemies()
 
-                while self.kill_count >= self.next_kill_threshold and self.enemy_spawn_limit < 10:
-                    self.enemy_spawn_limit += 1
-                    self.next_kill_threshold += 5
-                    try:
-                        self.app.audio.play_sound_effect('alert/demonLaugh.mp3', pitch=0.95, volume=0.95)
-                    except Exception:
-                        try:
-                            self.app.audio.play_sound('alert/demonLaugh.mp3')
-                        except Exception:
-                            pass
-                    try:
-                        self._trigger_spawn_alert(self.enemy_spawn_limit)
-                    except Exception:
-                        pass
+            self._update_projectiles(now)
 
-            # Remove dead enemies now
-            self.enemies = [e for e in self.enemies if not (e.current_hp <= 0 and now - e.death_time > 1000)]
+            self._update_health_pickup(now)
 
-            # Maintain enemy count up to the current spawn limit
-            while len(self.enemies) < self.enemy_spawn_limit:
-                self._spawn_new_enemy()
+            self._check_health_collision()
 
-            # update projectiles
-            try:
-                for p in self.projectiles:
-                    try:
-                        p.update(self.world_width, self.world_height)
-                    except Exception:
-                        pass
-                # check collisions: fireball -> enemies
-                for p in list(self.projectiles):
-                    if getattr(p, 'finished', False):
-                        continue
-                    phb = p.get_hitbox()
-                    for enemy in self.enemies:
-                        try:
-                            if phb.colliderect(enemy.get_hitbox()):
-                                # Apply damage via enemy.take_damage so enemy plays its death animation.
-                                try:
-                                    # attempt to deal exactly the enemy's remaining HP
-                                    remaining = getattr(enemy, 'current_hp', 0)
-                                    if remaining <= 0:
-                                        remaining = getattr(enemy, 'max_hp', 1)
-                                    enemy.take_damage(remaining, 0)
-                                except Exception:
-                                    try:
-                                        enemy.current_hp = 0
-                                        enemy.death_time = pygame.time.get_ticks()
-                                    except Exception:
-                                        pass
+            self._update_effects(now)
 
-                                # determine impact offset (so the fire effect anchors where projectile hit)
-                                try:
-                                    try:
-                                        impact_y = phb.centery
-                                    except Exception:
-                                        impact_y = p.get_hitbox().centery
-                                    offset = int(impact_y - enemy.rect.centery)
-                                except Exception:
-                                    offset = 0
+            if self.player.current_hp <= 0 and not self.is_dead:
+                self.is_dead = True
+                self.death_time = now
+                self.events.emit(PlayerDeath(self.player.rect.centerx, self.player.rect.centery))
 
-                                # attach persistent fire-in-body effect that follows the enemy at impact offset
-                                try:
-                                    self.effects.append(FireInBody(enemy, impact_offset_y=offset))
-                                except Exception:
-                                    pass
+        else:
 
-                                # play the same hit variant sound used elsewhere
-                                try:
-                                    self.app.audio.play_variant('hit')
-                                except Exception:
-                                    pass
+            elapsed_ms = now - self.death_time
+            if not self.death_menu_active and elapsed_ms >= self.death_menu_delay_ms:
+                self.death_menu_active = True
+                self.death_menu_index = 0
 
-                                p.finished = True
-                                break
-                        except Exception:
-                            pass
-                # remove finished
-                self.projectiles = [p for p in self.projectiles if not getattr(p, 'finished', False)]
-            except Exception:
-                pass
+        try:
+            self.camera.update(self.player.rect)
+        except Exception:
+            pass
 
-            if self.health_pickup is None:
+        # the frame's reactions: sounds, shake/zoom, particles
+        self.events.flush()
 
-                if self.next_health_spawn_time == 0:
-                    self._spawn_health()
-                else:
+        self._publish()
 
-                    if now >= self.next_health_spawn_time:
-                        self._spawn_health()
-            else:
+    def _publish(self):
+        # optional spectator/recording stream (--broadcast, see broadcast.py)
+        broadcaster = getattr(self.app, 'broadcaster', None)
+        if broadcaster is not None:
+            try:
+                broadcaster.publish(self)
+            except Exception:
+                pass
 
+    def _update_projectiles(self, now):
+        try:
+            for p in self.projectiles:
                 try:
-                    self.health_pickup.update()
+                    p.update(self.world_width, self.world_height, now)
+                    if not p.finished:
+                        self.events.emit(Trail(p.x, p.y, -p.vx))
                 except Exception:
                     pass
+            self._check_projectile_hits()
+            # remove finished (in place; pooled projectiles are recycled)
+            compact(self.projectiles)
+        except Exception:
+            pass
 
-            self._check_health_collision()
+    def _update_health_pickup(self, now):
+        if self.health_pickup is None:
 
-            try:
-                for eff in self.effects:
-                    try:
-                        eff.update()
-                    except Exception:
-                        pass
+            if self.next_health_spawn_time == 0:
+                self._spawn_health()
+            else:
 
-                self.effects = [e for e in self.effects if not getattr(e, 'finished', False)]
+                if now >= self.next_health_spawn_time:
+                    self._spawn_health()
+        else:
+
+            try:
+                self.health_pickup.update()
             except Exception:
                 pass
 
-            if self.player.current_hp <= 0 and not self.is_dead:
-                self.is_dead = True
-                self.death_time = now
-
+    def _update_effects(self, now):
+        try:
+            for eff in self.effects:
                 try:
-
-                    self.app.audio.set_sfx_volume(0)
+                    eff.update(now)
                 except Exception:
                     pass
 
-        else:
+            compact(self.effects)
+        except Exception:
+            pass
 
-            elapsed_ms = now - self.death_time
-            if not self.death_menu_active and elapsed_ms >= self.death_menu_delay_ms:
-                self.death_menu_active = True
-                self.death_menu_index = 0
+    def enemy_count(self):
+        return len(self.enemies)
+
+    def _update_enemies(self, now):
+        self.lod_tick += 1
+        tick = self.lod_tick
+        counts = self.lod_counts
+        counts[:] = (0, 0, 0)
+
+        # the camera view in world x (last tick's; LOD_MARGIN covers the scroll)
+        view_left = self.camera.x - LOD_MARGIN
+        view_right = self.camera.x + self.screen_width + LOD_MARGIN
+        player_x = self.player.rect.centerx
+
+        for i, enemy in enumerate(self.enemies):
+            rect = enemy.rect
+            if not self.lod_enabled or (rect.right > view_left and rect.left < view_right):
+                lod = LOD_FULL
+            elif (rect.right > view_left - LOD_FAR_DISTANCE and rect.left < view_right + LOD_FAR_DISTANCE) \
+                    or abs(rect.centerx - player_x) < enemy.detection_range + LOD_MARGIN:
+                lod = LOD_REDUCED
+            else:
+                lod = LOD_FAR
+            counts[lod] += 1
+            # reduced-tier enemies think on staggered ticks
+            think = lod == LOD_FULL or (tick + i) % LOD_AI_INTERVAL == 0
+            x, y = rect.x, rect.y
+            enemy.update(self.player, self.world_width, self.world_height, self.ground_y, now, lod, think)
+            if rect.x != x or rect.y != y:
+                self.spatial.move(enemy, enemy.get_hitbox(), 'enemy')
+
+    def _remove_dead_enemies(self, now):
+        """Drop enemies whose death animation has finished. Returns how many were removed.
+
+        Removed enemies are released to the Enemy pool for the next spawn;
+        effects still attached to them are finished first.
+        """
+        deaths = 0
+        for enemy in self.enemies:
+            if enemy.current_hp <= 0 and now - enemy.death_time > 1000:
+                deaths += 1
+        if deaths:
+            alive = []
+            dead = []
+            for e in self.enemies:
+                if e.current_hp <= 0 and now - e.death_time > 1000:
+                    self.spatial.remove(e)
+                    dead.append(e)
+                else:
+                    alive.append(e)
+            self.enemies = alive
+            for eff in self.effects:
+                if getattr(eff, 'enemy', None) in dead:
+                    eff.finished = True
+            for e in dead:
+                e.release()
+        return deaths
+
+    # -- rollback snapshots -------------------------------------------------
+
+    def snapshot(self):
+        """The simulation state as bytes (see snapshot.py); undo with `restore()`."""
+        return pack_gameplay(self)
+
+    def restore(self, data):
+        """Put the simulation back in the state of a `snapshot()`."""
+        unpack_gameplay(self, data)
+
+    def state_hash(self):
+        """32-bit checksum of the simulation state, for desync detection."""
+        return snapshot_hash(self.snapshot())
+
+    def _make_background(self):
+        return ParallaxBackground(self.screen_width, self.screen_height, self.world_width, self.ground_y)
+
+    def _recycle_enemies(self):
+        """Release every enemy of this scene to the pool (before a restart)."""
+        for enemy in self.enemies:
+            enemy.release()
+        self.enemies = []
+        self.spatial.clear('enemy')
+        self.spawner.clear()
+
+    def _retained(self, key, factory, scope=RESTART, release=None):
+        """`factory()` kept by the app's SceneAssets under `key` (see scene_assets.py)."""
+        assets = getattr(self.app, 'assets', None)
+        if assets is None:
+            return factory()
+        return assets.get(Gameplay, key, factory, scope, release)
+
+    def _register_kills(self, count):
+        self.kill_count += count
+        self.events.emit(Kill(count, self.kill_count))
 
+        # reward mana per kill
         try:
-            self.camera.update(self.player.rect)
+            self.mana = min(self.max_mana, self.mana + self.mana_per_kill * count)
         except Exception:
             pass
 
+        while self.kill_count >= self.next_kill_threshold and self.enemy_spawn_limit < 10:
+            self.enemy_spawn_limit += 1
+            self.next_kill_threshold += self.kill_threshold_step
+            self.events.emit(SpawnLimit(self.enemy_spawn_limit))
+            try:
+                self._trigger_spawn_alert(self.enemy_spawn_limit)
+            except Exception:
+                pass
+
+    def _replenish_enemies(self):
+        missing = self.enemy_spawn_limit - len(self.enemies)
+        for enemy in self.spawner.fill(missing, self.player.rect.centerx, now=self.now):
+            self._add_enemy(enemy)
+
+    def _prewarm_spawns(self):
+        """Preload the archetypes and pre-build the enemies the next ticks will place."""
+        self.spawner.prewarm(self.enemy_spawn_limit - len(self.enemies), archetypes=get_registry().values())
+
+    def _add_enemy(self, enemy):
+        self.enemies.append(enemy)
+        self.spatial.insert(enemy, enemy.get_hitbox(), 'enemy')
+
+    def _check_projectile_hits(self):
+        # check collisions: fireball -> enemies
+        for p in self.projectiles:
+            if getattr(p, 'finished', False):
+                continue
+            phb = p.get_hitbox()
+            for enemy in self.spatial.query(phb, 'enemy'):
+                try:
+                    # Apply damage via enemy.take_damage so enemy plays its death animation.
+                    try:
+                        # attempt to deal exactly the enemy's remaining HP
+                        remaining = getattr(enemy, 'current_hp', 0)
+                        if remaining <= 0:
+                            remaining = getattr(enemy, 'max_hp', 1)
+                        enemy.take_damage(remaining, 0, self.now)
+                    except Exception:
+                        try:
+                            enemy.current_hp = 0
+                            enemy.death_time = self.now
+                        except Exception:
+                            pass
+
+                    # determine impact offset (so the fire effect anchors where projectile hit)
+                    try:
+                        try:
+                            impact_y = phb.centery
+                        except Exception:
+                            impact_y = p.get_hitbox().centery
+                        offset = int(impact_y - enemy.rect.centery)
+                    except Exception:
+                        offset = 0
+
+                    # attach persistent fire-in-body effect that follows the enemy at impact offset
+                    try:
+                        self.effects.append(FireInBody.acquire(enemy, impact_offset_y=offset, now=self.now))
+                    except Exception:
+                        pass
+                    self.events.emit(FireHit(phb.centerx, phb.centery, p.vx))
+
+                    p.finished = True
+                    break
+                except Exception:
+                    pass
+
     def _close_config(self):
         self.config_overlay = None
+        # the new volumes are the ones a restart goes back to
+        self._remember_volumes()
 
     def _trigger_spawn_alert(self, limit):
         """Set up a transient on-screen alert when a new enemy joins.
@@ -505,13 +758,7 @@ class Gameplay:
 
         self.background.draw(screen, self.camera)
 
-        for enemy in self.enemies:
-            enemy_screen_rect = self.camera.apply(enemy.rect)
-
-            if enemy_screen_rect.right > 0 and enemy_screen_rect.left < self.screen_width:
-                enemy.draw_at(screen, enemy_screen_rect.topleft)
-
-                self._draw_enemy_hp(screen, enemy, enemy_screen_rect)
+        self._render_enemies(screen)
 
         if getattr(self, 'health_pickup', None):
             try:
@@ -524,7 +771,7 @@ class Gameplay:
         player_screen_rect = self.camera.apply(self.player.rect)
 
         if player_screen_rect.right > 0 and player_screen_rect.left < self.screen_width:
-            self.player.draw_at(screen, player_screen_rect.topleft)
+            self.player.draw_at(screen, player_screen_rect.topleft, self.now)
 
         try:
             for eff in self.effects:
@@ -545,6 +792,11 @@ class Gameplay:
         except Exception:
             pass
 
+        try:
+            self.particles.draw(screen, self.camera.x + self.camera.offset_x, self.camera.y + self.camera.offset_y)
+        except Exception:
+            pass
+
         instr = self.font.render('Esc - Voltar ao Menu', True, WHITE)
         screen.blit(instr, (10, 10))
 
@@ -657,6 +909,15 @@ class Gameplay:
         if self.config_overlay:
             self.config_overlay.render(screen)
 
+    def _render_enemies(self, screen):
+        for enemy in self.enemies:
+            enemy_screen_rect = self.camera.apply(enemy.rect)
+
+            if enemy_screen_rect.right > 0 and enemy_screen_rect.left < self.screen_width:
+                enemy.draw_at(screen, enemy_screen_rect.topleft, self.now)
+
+                self._draw_enemy_hp(screen, enemy, enemy_screen_rect)
+
     def _render_pause(self, screen):
         w, h = screen.get_size()
         overlay = pygame.Surface((w, h), pygame.SRCALPHA)
@@ -831,170 +1092,87 @@ class Gameplay:
         screen.blit(hint, (w // 2 - hint.get_width() // 2, base_y + len(self.death_menu_options) * 56 + 8))
 
     def _check_player_attack_collision(self):
-        """Check if player's attack hit any enemies with improved hitbox detection."""
-
-        if not self.player.state.startswith('attack'):
-            return
-
-        player_hb = self.player.get_hitbox()
-        attack_range = ATTACK_RANGE
+        """Land the player's current swing on the enemies its attack box overlaps.
 
-        attack_height = max(8, int(player_hb.height * ATTACK_HEIGHT_FACTOR))
-        attack_y = player_hb.top + (player_hb.height - attack_height) // 2
-
-        if self.player.facing > 0:
-            attack_rect = pygame.Rect(player_hb.right, attack_y, attack_range, attack_height)
-        else:
-            attack_rect = pygame.Rect(player_hb.left - attack_range, attack_y, attack_range, attack_height)
-
-        for enemy in self.enemies:
-            enemy_hitbox = enemy.get_hitbox()
-            if attack_rect.colliderect(enemy_hitbox):
+        Only runs on the clip's hit-active frames, and each swing hits a given
+        enemy once. Every hit is reported as a `Hit` event; the screen feedback
+        and sounds they cause are coalesced into one per frame (events.py).
+        """
 
-                damage_amount = 2
-                knockback_dir = 1 if self.player.facing > 0 else -1
-                killed = enemy.take_damage(damage_amount, knockback_dir)
+        player = self.player
+        if not player.attack_active():
+            return
 
-                knockback_strength = 10
-                self.player.knockback_vel_x = knockback_strength * (-self.player.facing)
+        attack_rect = player.get_attack_box()
+        knockback_dir = 1 if player.facing > 0 else -1
 
-                now = pygame.time.get_ticks()
+        hits = 0
+        for enemy in self.spatial.query(attack_rect, 'enemy'):
+            if not player.register_hit(enemy):
+                continue
+            hits += 1
 
-                try:
-                    self.app.trigger_slow_motion(duration_ms=220, scale=0.35)
-                except Exception:
-                    pass
-                try:
-                    self.camera.start_shake(duration_ms=260, magnitude=8)
-                except Exception:
-                    pass
+            damage_amount = 2
+            killed = enemy.take_damage(damage_amount, knockback_dir, self.now)
 
+            try:
                 try:
-                    self.app.audio.play_sound_effect(
-                        'attack',
-                        pitch=1.1,
-                        bitcrush=1,
-                        distortion=0.03,
-                        volume=0.9,
-                        layers=[
-                            {'pitch': 1.0, 'bitcrush': 0, 'gain': 0.6},
-                            {'pitch': 1.2, 'bitcrush': 2, 'gain': 0.4},
-                        ],
-                        async_process=True,
-                        cache=True,
-                    )
-
-                    self.app.audio.play_sound_effect(
-                        'hit',
-                        pitch=0.95,
-                        bitcrush=2,
-                        distortion=0.06,
-                        volume=1.0,
-                        layers=[
-                            {'pitch': 1.0, 'bitcrush': 0, 'gain': 0.5},
-                            {'pitch': 0.8, 'bitcrush': 3, 'gain': 0.5},
-                        ],
-                        async_process=True,
-                        cache=True,
-                    )
+                    hit_x, hit_y = enemy.get_hitbox().center
                 except Exception:
-                    pass
+                    hit_x, hit_y = enemy.rect.centerx, enemy.rect.centery
+                self.effects.append(Hitspark.acquire(hit_x, hit_y, self.now))
+                self.events.emit(Hit(hit_x, hit_y, player.facing, bool(killed)))
+            except Exception:
+                pass
 
-                try:
-                    try:
-                        hit_x, hit_y = enemy.get_hitbox().center
-                    except Exception:
-                        hit_x, hit_y = enemy.rect.centerx, enemy.rect.centery
-                    self.effects.append(Hitspark(hit_x, hit_y))
-                except Exception:
-                    pass
-                try:
-                    self.app.trigger_zoom(duration_ms=220, magnitude=1.06)
-                except Exception:
-                    pass
+        if not hits:
+            return
 
-                if killed:
+        knockback_strength = 10
+        player.knockback_vel_x = knockback_strength * (-player.facing)
 
-                    try:
+    def _update_player(self, player, now):
+        """Move `player` one tick and report a landing (dust) to the event bus."""
+        airborne = not player.on_ground
+        player.update(self.world_width, self.world_height, self.ground_y, now)
+        if airborne and player.on_ground:
+            self.events.emit(Land(player.rect.centerx, player.rect.bottom, player.facing))
 
-                        self.app.audio.play_sound_effect(
-                            'die',
-                            pitch=0.9,
-                            bitcrush=3,
-                            distortion=0.12,
-                            volume=0.9,
-                            layers=[
-                                {'pitch': 1.0, 'bitcrush': 0, 'gain': 0.5},
-                                {'pitch': 0.85, 'bitcrush': 4, 'gain': 0.5},
-                            ],
-                            async_process=True,
-                            cache=True,
-                        )
-                    except Exception:
-                        pass
+    def _slow_motion(self, duration_ms, scale):
+        # hit-stop feedback (CameraReactions); netplay keeps a fixed tick rate and skips it
+        self.app.trigger_slow_motion(duration_ms=duration_ms, scale=scale)
 
     def _check_enemy_attack_collision(self):
         """Check if any enemy is attacking and hitting the player."""
-        for enemy in self.enemies:
+        player_hitbox = self.player.get_hitbox()
+        # only enemies within attack reach of the player's hitbox can land a hit
+        nearby = self.spatial.query_range(player_hitbox.left - ATTACK_RANGE, player_hitbox.right + ATTACK_RANGE, 'enemy')
+        for enemy in nearby:
 
-            if enemy.state != 'attack1' and enemy.state != 'attack2':
+            # only hit-active frames count, and each swing lands at most once
+            if not enemy.attack_active():
                 continue
 
-            attack_range = ATTACK_RANGE
-            enemy_hb = enemy.get_hitbox()
+            attack_rect = enemy.get_attack_box()
 
-            attack_height = max(8, int(enemy_hb.height * ATTACK_HEIGHT_FACTOR))
-            attack_y = enemy_hb.top + (enemy_hb.height - attack_height) // 2
-
-            if enemy.facing > 0:
-                attack_rect = pygame.Rect(enemy_hb.right, attack_y, attack_range, attack_height)
-            else:
-                attack_rect = pygame.Rect(enemy_hb.left - attack_range, attack_y, attack_range, attack_height)
-
-            player_hitbox = self.player.get_hitbox()
-
-            if attack_rect.colliderect(player_hitbox):
+            if attack_rect.colliderect(player_hitbox) and enemy.register_hit(self.player):
 
                 damage_amount = 1
-                self.player.take_damage(damage_amount)
+                self.player.take_damage(damage_amount, self.now)
 
                 knockback_strength = 15
                 self.player.knockback_vel_x = knockback_strength * (-enemy.facing)
 
-                try:
-                    self.app.trigger_slow_motion(duration_ms=220, scale=0.35)
-                except Exception:
-                    pass
-                try:
-                    self.camera.start_shake(duration_ms=260, magnitude=10)
-                except Exception:
-                    pass
-                try:
-                    self.app.trigger_zoom(duration_ms=220, magnitude=1.08)
-                except Exception:
-                    pass
-
                 try:
                     try:
                         px, py = player_hitbox.center
                     except Exception:
                         px, py = self.player.rect.centerx, self.player.rect.centery
-                    self.effects.append(Hitspark(px, py))
+                    self.effects.append(Hitspark.acquire(px, py, self.now))
+                    self.events.emit(PlayerHurt(px, py, enemy.facing, self.player.current_hp <= 0))
                 except Exception:
                     pass
 
-                try:
-                    self.app.audio.play_variant('hit')
-                except Exception:
-                    pass
-
-                if self.player.current_hp <= 0:
-                    try:
-                        self.app.audio.play_variant('die')
-                        self.app.audio.crossfade_music('game_over', fade_ms=1000)
-                    except Exception:
-                        pass
-
     def _draw_enemy_hp(self, screen, enemy, enemy_screen_rect):
         """Draw enemy HP bar above the enemy sprite."""
 
@@ -1026,37 +1204,23 @@ class Gameplay:
         text_rect = hp_text.get_rect(center=(enemy_screen_rect.centerx, bar_y - 12))
         screen.blit(hp_text, text_rect)
 
-    def _spawn_new_enemy(self):
-        """Spawn a new enemy at a random location on the map."""
-
-        # Respect the configured concurrent enemy limit
-        try:
-            if len(self.enemies) >= getattr(self, 'enemy_spawn_limit', 10):
-                return
-        except Exception:
-            pass
-        min_spawn_dist = 600  
-        while True:
-            spawn_x = random.randint(100, self.world_width - 100)
-
-            if abs(spawn_x - self.player.rect.centerx) > min_spawn_dist:
-                break
-
-        spawn_y = self.ground_y - 160
-        new_enemy = Enemy(spawn_x, spawn_y)
-        self.enemies.append(new_enemy)
+    def _pick_archetype(self):
+        """Weighted random choice among the archetypes unlocked by the current kill count."""
+        unlocked = [a for a in get_registry().values()
+                    if a.spawn_weight > 0 and a.unlock_kills <= self.kill_count]
+        if not unlocked:
+            return None
+        return self.rng.choices(unlocked, weights=[a.spawn_weight for a in unlocked])[0]
 
     def _spawn_health(self):
         """Spawn a health pickup somewhere on the map, ensuring it's a reasonable distance from the player.
 
         This creates at most one pickup; callers should check `self.health_pickup` to avoid duplicates.
         """
-        import random
-
         min_spawn_dist = 300
         attempts = 0
         while True:
-            spawn_x = random.randint(100, self.world_width - 100)
+            spawn_x = self.rng.randint(100, self.world_width - 100)
 
             if abs(spawn_x - self.player.rect.centerx) > min_spawn_dist:
                 break
@@ -1074,6 +1238,9 @@ class Gameplay:
             h = Health(spawn_x, spawn_y)
             self.health_pickup = h
 
+        self.spatial.clear('health')
+        self.spatial.insert(self.health_pickup, self.health_pickup.get_hitbox(), 'health')
+
         self.next_health_spawn_time = 0
 
     def _check_health_collision(self):
@@ -1083,19 +1250,16 @@ class Gameplay:
 
         try:
             player_hb = self.player.get_hitbox()
-            health_hb = self.health_pickup.get_hitbox()
-            if player_hb.colliderect(health_hb):
+            if self.spatial.query(player_hb, 'health'):
 
                 if self.player.current_hp < self.player.max_hp:
                     self.player.current_hp = min(self.player.max_hp, self.player.current_hp + 1)
 
+                    self.spatial.remove(self.health_pickup)
                     self.health_pickup = None
-                    self.next_health_spawn_time = pygame.time.get_ticks() + 30000
+                    self.next_health_spawn_time = self.now + 30000
 
-                    try:
-                        self.app.audio.play_sound_effect('heal')
-                    except Exception:
-                        pass
+                    self.events.emit(Pickup('health', player_hb.centerx, player_hb.centery))
         except Exception:
             pass
 
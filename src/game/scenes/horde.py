@@ -0,0 +1,195 @@
+import pygame
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from ..settings import ATTACK_RANGE, ATTACK_HEIGHT_FACTOR
+from ..entities.effects import Hitspark
+from ..entities.horde import Horde
+from ..snapshot import pack_gameplay, unpack_gameplay, pack_horde, unpack_horde
+from ..events import Hit, FireHit, PlayerHurt, Kill
+from .gameplay import Gameplay
+
+
+class HordeGameplay(Gameplay):
+    """Gameplay variant with hundreds of enemies simulated by `Horde`.
+
+    Regular `Enemy` objects are replaced by a NumPy struct-of-arrays horde
+    that keeps `horde_size` enemies alive at all times. Hits are reported
+    to the event bus like in the base scene, whose subscribers react once
+    per frame no matter how many enemies were involved; hitsparks, which are
+    simulation state, are capped here, so large fights do not multiply
+    audio/VFX work.
+    """
+
+    MAX_SPARKS_PER_TICK = 4
+
+    def __init__(self, app, horde_size=500):
+        super().__init__(app)
+        # reuse the sprites the base scene already loaded for its first enemy
+        template = self.enemies[0] if self.enemies else None
+        self.horde = Horde(template=template, capacity=horde_size)
+        self.horde_size = int(horde_size)
+        self._recycle_enemies()
+        self.enemy_spawn_limit = 0
+        self._spawn_row = self.ground_y - 160
+        # the vectorized horde updates every enemy at once; no LOD tiers
+        self.lod_counts = None
+        self._replenish_enemies()
+        # the opening state has no Enemy objects; restart() respawns the horde
+        self._snapshot_initial_state()
+
+    def enemy_count(self):
+        return len(self.horde)
+
+    def snapshot(self):
+        return pack_gameplay(self) + pack_horde(self.horde)
+
+    def restore(self, data):
+        unpack_horde(self.horde, data, unpack_gameplay(self, data))
+
+    def restart(self):
+        super().restart()
+        self.horde.compact(np.zeros(len(self.horde), dtype=bool))
+        self._replenish_enemies()
+
+    # -- simulation hooks -------------------------------------------------
+
+    def _update_enemies(self, now):
+        self.horde.update(self.player, self.world_width, self.ground_y, now)
+
+    def _remove_dead_enemies(self, now):
+        expired = self.horde.expired(now)
+        deaths = int(np.count_nonzero(expired))
+        if deaths:
+            self.horde.compact(~expired)
+        return deaths
+
+    def _register_kills(self, count):
+        # the horde size is fixed, so kills only feed the counter and mana
+        self.kill_count += count
+        self.events.emit(Kill(count, self.kill_count))
+        self.mana = min(self.max_mana, self.mana + self.mana_per_kill * count)
+
+    def _replenish_enemies(self):
+        missing = self.horde_size - len(self.horde)
+        if missing <= 0:
+            return
+        # sample spawn x from the director's valid (inclusive) intervals
+        intervals = self.spawner.valid_intervals(self.player.rect.centerx)
+        if not intervals:
+            intervals = [(self.spawner.margin, self.world_width - self.spawner.margin)]
+        # draw from the scene RNG so the horde replays (and rolls back) exactly
+        rng = self.rng
+        lengths = [b - a + 1 for a, b in intervals]
+        starts = [a for a, _ in intervals]
+        which = rng.choices(range(len(intervals)), weights=lengths, k=missing)
+        xs = [starts[i] + rng.randrange(lengths[i]) for i in which]
+        self.horde.spawn(xs, self._spawn_row, self.now)
+
+    def _check_player_attack_collision(self):
+        if not self.player.attack_active():
+            return
+        horde = self.horde
+        if not len(horde):
+            return
+
+        # each swing hits a given enemy once
+        touched = horde.register_swing(horde.overlaps(self.player.get_attack_box()), self.player.swing)
+        if not touched.any():
+            return
+        now = self.now
+        knockback_dir = 1 if self.player.facing > 0 else -1
+        _damaged, killed = horde.take_damage(touched, 2, knockback_dir, now)
+        self.player.knockback_vel_x = 10 * (-self.player.facing)
+
+        indices = np.flatnonzero(touched)
+        self._spawn_sparks(indices)
+        self._emit_hits(indices, killed, self.player.facing)
+
+    def _check_enemy_attack_collision(self):
+        horde = self.horde
+        n = len(horde)
+        if not n:
+            return
+        attacking = horde.attack_active() & ~horde.swing_landed[:n]
+        if not attacking.any():
+            return
+        phb = self.player.get_hitbox()
+        left, top, w, h = horde.attack_boxes(ATTACK_RANGE, ATTACK_HEIGHT_FACTOR)
+        hits = np.flatnonzero(attacking & (left < phb.right) & (phb.left < left + w)
+                              & (top < phb.bottom) & (phb.top < top + h))
+        if not len(hits):
+            return
+        horde.swing_landed[hits] = True
+
+        for i in hits.tolist():
+            self.player.take_damage(1, self.now)
+            self.player.knockback_vel_x = 15 * (-int(horde.facing[i]))
+
+        try:
+            self.effects.append(Hitspark.acquire(phb.centerx, phb.centery, self.now))
+        except Exception:
+            pass
+        self.events.emit(PlayerHurt(phb.centerx, phb.centery, int(horde.facing[hits[0]]),
+                                    self.player.current_hp <= 0))
+
+    def _check_projectile_hits(self):
+        horde = self.horde
+        for p in self.projectiles:
+            if getattr(p, 'finished', False) or not len(horde):
+                continue
+            touched = np.flatnonzero(horde.overlaps(p.get_hitbox()))
+            if not len(touched):
+                continue
+            # like the list version, a fireball consumes itself on the first enemy it meets
+            first = touched[:1]
+            mask = np.zeros(len(horde), dtype=bool)
+            mask[first] = True
+            remaining = horde.hp[:len(horde)].copy()
+            remaining[remaining <= 0] = horde.max_hp
+            horde.take_damage(mask, remaining, 0, self.now)
+            self._spawn_sparks(first)
+            phb = p.get_hitbox()
+            self.events.emit(FireHit(phb.centerx, phb.centery, p.vx))
+            p.finished = True
+
+    def _spawn_sparks(self, indices):
+        horde = self.horde
+        if len(indices) > self.MAX_SPARKS_PER_TICK:
+            indices = self.rng.sample(list(indices), self.MAX_SPARKS_PER_TICK)
+        for i in indices:
+            x = int(horde.x[i]) + horde.width // 2
+            y = int(horde.y[i]) + horde.height // 2
+            self.effects.append(Hitspark.acquire(x, y, self.now))
+
+    def _emit_hits(self, indices, killed, direction=1):
+        # one Hit per enemy touched; skipped outright when presentation is unhooked
+        events = self.events
+        if not events.enabled:
+            return
+        horde = self.horde
+        xs = (horde.x[indices] + horde.width // 2).astype(int).tolist()
+        ys = (horde.y[indices] + horde.height // 2).astype(int).tolist()
+        for x, y, dead in zip(xs, ys, killed[indices].tolist()):
+            events.emit(Hit(x, y, direction, dead))
+
+    # -- rendering ----------------------------------------------------------
+
+    def _render_enemies(self, screen):
+        horde = self.horde
+        cam_x = self.camera.x + self.camera.offset_x
+        cam_y = self.camera.y + self.camera.offset_y
+        visible = horde.draw(screen, cam_x, cam_y, self.screen_width, self.now)
+        if not len(visible):
+            return
+        # compact HP bars for wounded enemies only (no per-enemy text)
+        hp = horde.hp[visible]
+        wounded = visible[(hp > 0) & (hp < horde.max_hp)]
+        bar_w, bar_h = 40, 5
+        for i in wounded.tolist():
+            bx = int(horde.x[i] - cam_x) + horde.width // 2 - bar_w // 2
+            by = int(horde.y[i] - cam_y) - bar_h - 5
+            pygame.draw.rect(screen, (50, 50, 50), (bx, by, bar_w, bar_h))
+            pygame.draw.rect(screen, (200, 60, 40), (bx, by, bar_w * int(horde.hp[i]) // horde.max_hp, bar_h))
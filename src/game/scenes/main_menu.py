@@ -2,6 +2,7 @@ import os
 import pygame
 from ..settings import WHITE
 from ..entities.player import Player
+from ..entities.states import IDLE
 from .config_menu import ConfigMenu
 
 class MainMenu:
@@ -32,6 +33,12 @@ class MainMenu:
         self.title_text = 'KNIGHT DEMO GAME'
 
         self.options = ['INICIAR GAME', 'CONFIGURAÇÃO', 'SAIR']
+        # horde mode needs numpy for its vectorized enemy simulation
+        try:
+            import numpy  # noqa: F401
+            self.options.insert(1, 'MODO HORDA')
+        except Exception:
+            pass
         self.selected = 0
 
         sw, sh = self.screen.get_size()
@@ -39,7 +46,7 @@ class MainMenu:
         py = sh - 220
         self.menu_player = Player(px, py)
 
-        self.menu_player._set_state('idle')
+        self.menu_player._set_state(IDLE)
         self._auto_dir = -1
         self._dir_change_time = pygame.time.get_ticks() + 1200
         self._next_jump_time = pygame.time.get_ticks() + 2000
@@ -73,7 +80,7 @@ class MainMenu:
             ("Pausar", "Esc"),
         ]
 
-    def _start_game(self):
+    def _start_game(self, module='game.scenes.gameplay', class_name='Gameplay'):
         try:
             self.app.audio.play_sound('select')
         except Exception:
@@ -81,8 +88,8 @@ class MainMenu:
 
         try:
             import importlib
-            mod = importlib.import_module('game.scenes.gameplay')
-            Gameplay = getattr(mod, 'Gameplay')
+            mod = importlib.import_module(module)
+            Gameplay = getattr(mod, class_name)
 
             try:
                 from .load_screen import LoadScreen
@@ -98,7 +105,7 @@ class MainMenu:
                 return
         except Exception:
             try:
-                self.app.change_scene('game.scenes.gameplay')
+                self.app.change_scene(module)
             except Exception:
                 pass
 
@@ -163,6 +170,8 @@ class MainMenu:
                 choice = self.options[self.selected]
                 if choice == 'INICIAR GAME':
                     self._start_game()
+                elif choice == 'MODO HORDA':
+                    self._start_game('game.scenes.horde', 'HordeGameplay')
                 elif choice == 'CONFIGURAÇÃO':
                     self.config_overlay = ConfigMenu(self.app, on_done=self._close_config)
                 elif choice == 'SAIR':
@@ -0,0 +1,211 @@
+import struct
+
+import pygame
+
+from ..settings import WHITE, NETPLAY_INPUT_DELAY, NETPLAY_MAX_ROLLBACK
+from ..entities.player import Player
+from ..netplay import IN_ATTACK, IN_CAST, InputKeys, RollbackSession, encode_keys, tick_time
+from ..snapshot import pack_gameplay, unpack_gameplay
+from .gameplay import Gameplay
+
+
+class NetplayGameplay(Gameplay):
+    """Two-player co-op Gameplay, one knight per peer, kept in sync by rollback.
+
+    `players[0]` is the hosting peer's knight and `players[1]` the joining
+    one's; `local_index` says which one this side controls (`self.player`
+    outside a tick). Both peers run the exact same simulation from the same
+    RNG `seed`: the clock advances a fixed 1/FPS per tick (`tick_time`),
+    the spawn budget is unlimited, LOD is off and hit-stop slow motion and
+    the spawn alert pause are skipped, since those depend on the local
+    machine. Inside a tick the shared rules (spawn distance, pickup
+    placement) use `players[0]` on both sides.
+
+    Each frame `update()` hands the local input bits to the
+    `RollbackSession`, which calls `simulate()` for new ticks and again,
+    muted, for ticks replayed after a misprediction.
+    """
+
+    # simulation tick of the state being built; read by _clock()
+    sim_tick = 0
+
+    def __init__(self, app, transport, local_index=0, seed=0, input_delay=NETPLAY_INPUT_DELAY,
+                 max_rollback=NETPLAY_MAX_ROLLBACK):
+        super().__init__(app)
+        self.local_index = int(local_index)
+        self._spawn_points = [(400, self.ground_y - 160), (600, self.ground_y - 160)]
+        self.players.append(Player(*self._spawn_points[1]))
+        self.last_attack_times = [0] * len(self.players)
+        self._attack_times = struct.Struct(f'<{len(self.players)}q')
+
+        self.rng.seed(seed)
+        # the tiers follow each peer's own camera, so every enemy runs in full
+        self.lod_enabled = False
+        self.lod_counts = None
+        # how many enemies a tick places must not depend on this machine's speed
+        self.spawner.budget_ms = float('inf')
+
+        # edge-triggered buttons pressed since the last simulated tick
+        self._pressed = 0
+        self.waiting = False
+
+        self.restart()
+        self.session = RollbackSession(self, self.local_index, transport, input_delay, max_rollback)
+
+    def restart(self):
+        """Put both knights and the battle in the common opening state of tick 0."""
+        self.sim_tick = 0
+        self.player = self.players[0]
+        super().restart()
+        for player, (x, y) in zip(self.players, self._spawn_points):
+            player.reset(x, y, now=self.now)
+        self.last_attack_times = [0] * len(self.players)
+        self.player = self.players[self.local_index]
+        self.camera.update(self.player.rect)
+
+    def _clock(self):
+        return tick_time(self.sim_tick)
+
+    def _slow_motion(self, duration_ms, scale):
+        # would change this peer's frame rate only
+        pass
+
+    def _trigger_spawn_alert(self, limit):
+        # the alert freezes the local game while it is on screen
+        pass
+
+    # -- rollback hooks -----------------------------------------------------
+
+    def snapshot(self):
+        return pack_gameplay(self) + self._attack_times.pack(*self.last_attack_times)
+
+    def restore(self, data):
+        offset = unpack_gameplay(self, data)
+        self.last_attack_times[:] = self._attack_times.unpack_from(data, offset)
+
+    def simulate(self, inputs, tick, resim=False):
+        """Run simulation tick `tick` with the input bits of each player."""
+        self.sim_tick = tick
+        now = self.now = self._clock()
+        # a resimulated tick already played its sounds and sparks
+        self.events.muted = resim
+        try:
+            self._step(inputs, now)
+        finally:
+            self.events.muted = False
+            self.player = self.players[self.local_index]
+
+    def _step(self, inputs, now):
+        if self.is_dead:
+            return
+        players = self.players
+        for i, player in enumerate(players):
+            bits = inputs[i]
+            self.player = player
+            player.handle_input(InputKeys(bits))
+            if player.current_hp > 0:
+                if bits & IN_ATTACK:
+                    self.last_attack_time = self.last_attack_times[i]
+                    self._try_attack(now)
+                    self.last_attack_times[i] = self.last_attack_time
+                if bits & IN_CAST:
+                    self._cast_fireball(now)
+            self._update_player(player, now)
+
+        self._update_enemies(now)
+
+        for player in players:
+            self.player = player
+            self._check_player_attack_collision()
+            if player.current_hp > 0:
+                self._check_enemy_attack_collision()
+        self.player = players[0]
+
+        deaths_this_frame = self._remove_dead_enemies(now)
+        if deaths_this_frame:
+            self._register_kills(deaths_this_frame)
+        self._replenish_enemies()
+
+        self._update_projectiles(now)
+        self._update_health_pickup(now)
+        for player in players:
+            if player.current_hp > 0:
+                self.player = player
+                self._check_health_collision()
+
+        self._update_effects(now)
+
+        if all(player.current_hp <= 0 for player in players):
+            self.is_dead = True
+            self.death_time = now
+
+    def _update_enemies(self, now):
+        # every enemy chases the nearest knight still standing
+        living = [p for p in self.players if p.current_hp > 0] or self.players
+        for enemy in self.enemies:
+            rect = enemy.rect
+            cx = rect.centerx
+            target = min(living, key=lambda p: abs(p.rect.centerx - cx))
+            x, y = rect.x, rect.y
+            enemy.update(target, self.world_width, self.world_height, self.ground_y, now)
+            if rect.x != x or rect.y != y:
+                self.spatial.move(enemy, enemy.get_hitbox(), 'enemy')
+
+    # -- frame loop -----------------------------------------------------------
+
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.app.running = False
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_ESCAPE or (self.is_dead and event.key in (pygame.K_RETURN, pygame.K_KP_ENTER)):
+            self.session.close()
+            self.app.go_to_menu()
+        elif event.key in (pygame.K_LCTRL, pygame.K_RCTRL):
+            self._pressed |= IN_ATTACK
+        elif event.key in (pygame.K_LSHIFT, pygame.K_RSHIFT):
+            self._pressed |= IN_CAST
+
+    def update(self):
+        if self.is_dead:
+            # keep answering so the peer confirms the last ticks too
+            self.session.idle()
+            return
+        bits = self._pressed
+        try:
+            bits |= encode_keys(pygame.key.get_pressed())
+        except Exception:
+            pass
+        # a stalled tick keeps the presses for the next one
+        self.waiting = not self.session.advance(bits)
+        if not self.waiting:
+            self._pressed = 0
+        try:
+            self.camera.update(self.player.rect)
+        except Exception:
+            pass
+        # the reactions of every tick simulated this frame, at once
+        self.events.flush()
+        if not self.waiting:
+            self._publish()
+
+    def _render_enemies(self, screen):
+        super()._render_enemies(screen)
+        # the other knight(s); Gameplay.render draws the local one
+        for i, player in enumerate(self.players):
+            if player is self.player:
+                continue
+            rect = self.camera.apply(player.rect)
+            if rect.right > 0 and rect.left < self.screen_width:
+                player.draw_at(screen, rect.topleft, self.now)
+                label = self.font.render(f'P{i + 1}', True, WHITE)
+                screen.blit(label, label.get_rect(midbottom=(rect.centerx, rect.top)))
+
+    def render(self, screen):
+        super().render(screen)
+        if self.waiting:
+            text = self.font.render('Aguardando o outro jogador...', True, WHITE)
+            screen.blit(text, text.get_rect(midtop=(self.screen_width // 2, 10)))
+        if self.is_dead:
+            text = self.font.render('Enter - Voltar ao Menu', True, WHITE)
+            screen.blit(text, text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 60)))
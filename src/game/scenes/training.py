@@ -0,0 +1,79 @@
+from ..netplay import IN_ATTACK, IN_CAST, InputKeys, tick_time
+from ..entities.archetype import set_placeholder_frames
+from .gameplay import Gameplay
+
+
+class TrainingGameplay(Gameplay):
+    """Single-player Gameplay stepped by input bits instead of the keyboard.
+
+    The scene behind `GameEnv` (game/env.py). Like `NetplayGameplay` it runs
+    on the fixed-step clock (`tick_time`) with an unlimited spawn budget and
+    without hit-stop slow motion or the spawn alert pause, so an episode
+    depends only on the RNG seed and the actions, not on how fast the
+    machine steps it. Enemy LOD stays on: it follows the camera, which is
+    part of the simulated state.
+
+    With `render=False` the scene is never drawn: the parallax layers are
+    not loaded, character archetypes get blank frames (process-wide, see
+    `set_placeholder_frames`) and the presentation subscribers (sound,
+    camera feedback, particles) are unhooked from the event bus, which
+    leaves the simulation unchanged.
+    """
+
+    # simulation tick of the state being built; read by _clock()
+    sim_tick = 0
+
+    def __init__(self, app, seed=0, render=True):
+        self.render_enabled = bool(render)
+        if not self.render_enabled:
+            # before Gameplay builds the knight and the opening enemies
+            set_placeholder_frames(True)
+        super().__init__(app)
+        if not self.render_enabled:
+            self.set_presentation(False)
+        # input bits (netplay IN_*) the knight moves by during step()
+        self.action = 0
+        # how many enemies a tick places must not depend on this machine's speed
+        self.spawner.budget_ms = float('inf')
+        self.reset(seed)
+
+    def reset(self, seed=0):
+        """Start a new episode from the opening state, with the RNG seeded by `seed`."""
+        self.rng.seed(seed)
+        self.restart()
+
+    def restart(self):
+        self.sim_tick = 0
+        self.action = 0
+        super().restart()
+
+    def _make_background(self):
+        if not self.render_enabled:
+            return None
+        return super()._make_background()
+
+    def _clock(self):
+        return tick_time(self.sim_tick)
+
+    def _read_keys(self):
+        return InputKeys(self.action)
+
+    def _slow_motion(self, duration_ms, scale):
+        # would only change the pacing of the caller's loop
+        pass
+
+    def _trigger_spawn_alert(self, limit):
+        # the alert freezes the game until a key is pressed
+        pass
+
+    def step(self, bits):
+        """Advance one tick with the knight's input bits (IN_LEFT ... IN_CAST)."""
+        self.sim_tick += 1
+        self.action = bits
+        if not self.is_dead:
+            now = self._clock()
+            if bits & IN_ATTACK:
+                self._try_attack(now)
+            if bits & IN_CAST:
+                self._cast_fireball(now)
+        self.update()
@@ -18,4 +18,44 @@ HITBOX_HEIGHT = 80
 ATTACK_RANGE = 100
 # Portion of the entity hitbox height covered by an attack (0-1). A lower
 # value reduces vertical reach of attacks so they only hit the torso area.
-ATTACK_HEIGHT_FACTOR = 0.5
\ No newline at end of file
+ATTACK_HEIGHT_FACTOR = 0.5
+# Off-screen enemy level of detail. Enemies whose sprite is within
+# LOD_MARGIN px of the camera view update at full rate; up to
+# LOD_FAR_DISTANCE px beyond it they keep physics but only think every
+# LOD_AI_INTERVAL ticks and skip animation; farther ones only get a coarse
+# kinematic update. Anything within its detection range of the player
+# always keeps at least the reduced tier so pursuit is unaffected.
+LOD_MARGIN = 64
+LOD_FAR_DISTANCE = 600
+LOD_AI_INTERVAL = 4
+
+# Enemy spawning (SpawnDirector): time spent constructing enemies per frame,
+# and the minimum distance between a new enemy and the player.
+SPAWN_BUDGET_MS = 2.0
+SPAWN_MIN_PLAYER_DISTANCE = 600
+
+# Two-player netplay (game/netplay.py). Local inputs are applied
+# NETPLAY_INPUT_DELAY ticks late to hide some latency; the remote player's
+# input is predicted and the simulation rolled back on a misprediction, at
+# most NETPLAY_MAX_ROLLBACK ticks deep (further ahead the session waits).
+# Both peers run the simulation clock from NETPLAY_EPOCH_MS.
+NETPLAY_PORT = 47800
+NETPLAY_INPUT_DELAY = 2
+NETPLAY_MAX_ROLLBACK = 8
+NETPLAY_EPOCH_MS = 1000
+
+# World-state broadcast (game/broadcast.py): TCP port Gameplay publishes
+# on with --broadcast, ticks between keyframes, and how many bytes may
+# queue for a slow subscriber before it is resynced with a keyframe.
+BROADCAST_PORT = 47900
+BROADCAST_KEYFRAME_INTERVAL = 120
+BROADCAST_MAX_BACKLOG = 1 << 20
+
+# Training environment (game/env.py): ticks per episode before it is cut
+# short, how many of the nearest enemies an observation describes, and the
+# reward per kill, per point of HP lost and for dying.
+ENV_MAX_STEPS = 3600
+ENV_OBS_ENEMIES = 8
+ENV_REWARD_KILL = 1.0
+ENV_REWARD_DAMAGE = -0.25
+ENV_REWARD_DEATH = -1.0
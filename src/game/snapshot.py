@@ -0,0 +1,289 @@
+"""Flat binary snapshots of the Gameplay simulation state.
+
+Used for rollback and exact replays: `pack_gameplay(scene)` writes every
+piece of state the simulation reads (player, enemies, projectiles, effects,
+health pickup, counters, timers and the scene RNG) into one `bytes` buffer
+of fixed-layout `struct` records, and `unpack_gameplay(scene, data)`
+writes it back into the live objects. Surfaces, fonts, sounds and other
+assets are never part of a snapshot; enemies, effects and projectiles are
+recycled through their pools on restore. Particles, camera shake and the
+HUD are cosmetic and are not captured; the camera is re-aimed at the
+restored player. Neither are the spawn director's prewarmed enemies: they
+are blank instances that get their archetype, position and clock when
+placed (see `SpawnDirector.fill`).
+
+A restore replays exactly only in the fixed-step scenes (netplay,
+training), whose clock is the tick count and whose spawn budget is
+unlimited. Plain `Gameplay` reads `pygame.time.get_ticks()` and places as
+many enemies per frame as `SPAWN_BUDGET_MS` of wall-clock time allows, so
+there a snapshot restores the state but the ticks after it may differ.
+
+The vectorized horde of `HordeGameplay` is appended with `pack_horde()`:
+its per-enemy arrays are copied as raw bytes.
+
+`state_hash(data)` is a CRC32 of a snapshot, cheap enough to compute every
+tick and compare between peers to detect desyncs.
+"""
+import struct
+import zlib
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from .entities.archetype import get_registry
+from .entities.effects import Hitspark
+from .entities.effects.fireball import Fireball
+from .entities.effects.fireinbody import FireInBody
+from .entities.effects.pool import compact
+from .entities.enemy import Enemy
+from .entities.health import Health
+
+SNAPSHOT_VERSION = 2
+
+# version, players, enemies, projectiles, effects, flags
+_HEADER = struct.Struct('<BBHHHB')
+_HAS_PICKUP = 1
+_HAS_ALERT = 2
+
+# mana, kill_count, enemy_spawn_limit, next_kill_threshold,
+# next_health_spawn_time, last_attack_time, is_dead, death_time, lod_tick,
+# alert start/duration/limit, pickup x/y
+_SCENE = struct.Struct('<iiiiqq?qIqiiii')
+
+# Mersenne Twister state of the scene RNG (`random.Random.getstate()`)
+_RNG = struct.Struct('<B625I?d')
+
+# fields shared by Player and Enemy: x, y, vel_x, vel_y, knockback_vel_x,
+# on_ground, facing, state_id, anim_index, anim_start, locked,
+# _next_attack_is_two, current_hp, hit_cooldown, flash_timer, swing
+_CHARACTER = '<iiddd?bBHq??hqqI'
+# player: character fields + number of enemies hit by the current swing
+_PLAYER = struct.Struct(_CHARACTER + 'H')
+# enemy: archetype id + character fields + death_time, attack_cooldown and
+# the swing registry (0 = None, else bit 0 set and bit i+1 for each player
+# `scene.players[i]` it holds)
+_ENEMY = struct.Struct('<B' + _CHARACTER[1:] + 'qqB')
+
+# speed, vx, vy, x, y, spawn_time, lifetime_ms, frame_index, frame_started
+_FIREBALL = struct.Struct('<dddddqiBq')
+
+# effects are tagged by type: x/enemy index, y/offset, started, frame_index
+_EFFECT = struct.Struct('<BiiqB')
+_HITSPARK = 0
+_FIRE_IN_BODY = 1
+
+_NO_SWING = 0xFFFF
+
+_archetype_names = None
+
+
+def _archetype_table():
+    # stable ids for archetype names (sorted registry, 'enemy' always present)
+    global _archetype_names
+    if _archetype_names is None:
+        _archetype_names = tuple(sorted(set(get_registry()) | {'enemy'}))
+    return _archetype_names
+
+
+def _character_fields(c):
+    return (c.rect.x, c.rect.y, c.vel_x, c.vel_y, c.knockback_vel_x, c.on_ground, c.facing, c.state_id,
+            c.anim_index, c.anim_start, c.locked, c._next_attack_is_two, c.current_hp, c.hit_cooldown,
+            c.flash_timer, c.swing)
+
+
+def _set_character_fields(c, fields):
+    (x, y, c.vel_x, c.vel_y, c.knockback_vel_x, c.on_ground, c.facing, c.state_id, c.anim_index,
+     c.anim_start, c.locked, c._next_attack_is_two, c.current_hp, c.hit_cooldown, c.flash_timer,
+     c.swing) = fields
+    c.rect.x = x
+    c.rect.y = y
+    c._hitbox_x = None
+    c._hitbox_y = None
+
+
+def pack_gameplay(scene):
+    """Serialize the simulation state of `scene` (a Gameplay) to bytes."""
+    names = _archetype_table()
+    enemies = scene.enemies
+    index = {id(e): i for i, e in enumerate(enemies)}
+    players = scene.players
+    effects = [eff for eff in scene.effects if not eff.finished and isinstance(eff, (Hitspark, FireInBody))]
+    projectiles = [p for p in scene.projectiles if not p.finished]
+
+    pickup = scene.health_pickup
+    alert = scene.spawn_alert
+    flags = (_HAS_PICKUP if pickup is not None else 0) | (_HAS_ALERT if alert else 0)
+    parts = [_HEADER.pack(SNAPSHOT_VERSION, len(players), len(enemies), len(projectiles), len(effects), flags)]
+    parts.append(_SCENE.pack(
+        scene.mana, scene.kill_count, scene.enemy_spawn_limit, scene.next_kill_threshold,
+        scene.next_health_spawn_time, scene.last_attack_time, scene.is_dead, scene.death_time, scene.lod_tick,
+        alert['start'] if alert else 0, alert['duration_ms'] if alert else 0, alert['limit'] if alert else 0,
+        pickup.rect.x if pickup is not None else 0, pickup.rect.y if pickup is not None else 0))
+
+    version, mt, gauss = scene.rng.getstate()
+    parts.append(_RNG.pack(version, *mt, gauss is not None, gauss or 0.0))
+
+    for player in players:
+        # the swing registry as indices of enemies still in the scene
+        hits = player.swing_hits
+        hit_ids = () if hits is None else [index[id(e)] for e in hits if id(e) in index]
+        parts.append(_PLAYER.pack(*_character_fields(player), _NO_SWING if hits is None else len(hit_ids)))
+        if hit_ids:
+            parts.append(struct.pack(f'<{len(hit_ids)}H', *hit_ids))
+
+    pack_enemy = _ENEMY.pack
+    for e in enemies:
+        hits = e.swing_hits
+        code = 0
+        if hits is not None:
+            code = 1
+            for i, player in enumerate(players):
+                if player in hits:
+                    code |= 2 << i
+        parts.append(pack_enemy(names.index(e.archetype.name), *_character_fields(e), e.death_time,
+                                e.attack_cooldown, code))
+
+    for p in projectiles:
+        parts.append(_FIREBALL.pack(p.speed, p.vx, p.vy, p.x, p.y, p.spawn_time, p.lifetime_ms,
+                                    p.frame_index, p.frame_started))
+
+    for eff in effects:
+        if isinstance(eff, FireInBody):
+            target = index.get(id(eff.enemy), -1)
+            parts.append(_EFFECT.pack(_FIRE_IN_BODY, target, eff.offset_y, eff.started, eff.frame_index))
+        else:
+            parts.append(_EFFECT.pack(_HITSPARK, eff.x, eff.y, eff.started, eff.frame_index))
+    return b''.join(parts)
+
+
+def unpack_gameplay(scene, data, offset=0):
+    """Restore `scene` from a `pack_gameplay` buffer. Returns the end offset."""
+    version, n_players, n_enemies, n_projectiles, n_effects, flags = _HEADER.unpack_from(data, offset)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f'unsupported snapshot version {version}')
+    players = scene.players
+    if n_players != len(players):
+        raise ValueError(f'snapshot has {n_players} players, scene has {len(players)}')
+    offset += _HEADER.size
+
+    (scene.mana, scene.kill_count, scene.enemy_spawn_limit, scene.next_kill_threshold,
+     scene.next_health_spawn_time, scene.last_attack_time, scene.is_dead, scene.death_time, scene.lod_tick,
+     alert_start, alert_duration, alert_limit, pickup_x, pickup_y) = _SCENE.unpack_from(data, offset)
+    offset += _SCENE.size
+    scene.spawn_alert = None
+    if flags & _HAS_ALERT:
+        scene.spawn_alert = {'start': alert_start, 'duration_ms': alert_duration, 'limit': alert_limit}
+
+    rng = _RNG.unpack_from(data, offset)
+    offset += _RNG.size
+    scene.rng.setstate((rng[0], rng[1:626], rng[627] if rng[626] else None))
+
+    # enemies: reuse the live objects, top up from / return extras to the pool
+    names = _archetype_table()
+    enemies = scene.enemies
+    spatial = scene.spatial
+    spatial.clear('enemy')
+    for e in enemies[n_enemies:]:
+        e.release()
+    del enemies[n_enemies:]
+
+    player_hits = []
+    for player in players:
+        fields = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        _set_character_fields(player, fields[:-1])
+        count = fields[-1]
+        hit_ids = None
+        if count != _NO_SWING:
+            hit_ids = struct.unpack_from(f'<{count}H', data, offset)
+            offset += 2 * count
+        player_hits.append(hit_ids)
+
+    unpack_enemy = _ENEMY.unpack_from
+    size = _ENEMY.size
+    for i in range(n_enemies):
+        fields = unpack_enemy(data, offset)
+        offset += size
+        name = names[fields[0]]
+        if i < len(enemies):
+            e = enemies[i]
+            if e.archetype.name != name:
+                e.reset(fields[1], fields[2], name)
+        else:
+            e = Enemy.acquire(fields[1], fields[2], name)
+            enemies.append(e)
+        _set_character_fields(e, fields[1:17])
+        e.death_time, e.attack_cooldown, code = fields[17:]
+        e.swing_hits = None if code == 0 else [p for j, p in enumerate(players) if code & (2 << j)]
+        spatial.insert(e, e.get_hitbox(), 'enemy')
+
+    for player, hit_ids in zip(players, player_hits):
+        player.swing_hits = None if hit_ids is None else [enemies[i] for i in hit_ids]
+
+    for items in (scene.projectiles, scene.effects):
+        for obj in items:
+            obj.finished = True
+        compact(items)
+
+    for _ in range(n_projectiles):
+        (speed, vx, vy, x, y, spawn_time, lifetime_ms, frame_index,
+         frame_started) = _FIREBALL.unpack_from(data, offset)
+        offset += _FIREBALL.size
+        p = Fireball.acquire(x, y, vx, speed, lifetime_ms, spawn_time)
+        p.vx = vx
+        p.vy = vy
+        p.frame_index = frame_index
+        p.frame_started = frame_started
+        scene.projectiles.append(p)
+
+    for _ in range(n_effects):
+        kind, a, b, started, frame_index = _EFFECT.unpack_from(data, offset)
+        offset += _EFFECT.size
+        if kind == _FIRE_IN_BODY:
+            if a < 0:
+                continue
+            eff = FireInBody.acquire(enemies[a], b, started)
+        else:
+            eff = Hitspark.acquire(a, b, started)
+        eff.frame_index = frame_index
+        scene.effects.append(eff)
+
+    spatial.clear('health')
+    if flags & _HAS_PICKUP:
+        pickup = scene.health_pickup
+        if pickup is None:
+            pickup = scene.health_pickup = Health(pickup_x, pickup_y)
+        pickup.rect.topleft = (pickup_x, pickup_y)
+        spatial.insert(pickup, pickup.get_hitbox(), 'health')
+    else:
+        scene.health_pickup = None
+
+    # the camera follows the player and picks the enemies' LOD tiers
+    scene.camera.update(scene.player.rect)
+    return offset
+
+
+def pack_horde(horde):
+    """Serialize the live entries of a `Horde`'s per-enemy arrays."""
+    n = horde.count
+    return struct.pack('<I', n) + b''.join(getattr(horde, name)[:n].tobytes() for name in horde.STATE_FIELDS)
+
+
+def unpack_horde(horde, data, offset=0):
+    """Restore a `Horde` from `pack_horde` bytes at `offset`. Returns the end offset."""
+    (n,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    if n > horde.capacity:
+        horde._alloc(n)
+    for name in horde.STATE_FIELDS:
+        arr = getattr(horde, name)
+        arr[:n] = np.frombuffer(data, arr.dtype, n, offset)
+        offset += n * arr.dtype.itemsize
+    horde.count = n
+    return offset
+
+
+def state_hash(data):
+    """32-bit checksum of a snapshot, for desync detection."""
+    return zlib.crc32(data)
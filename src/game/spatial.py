@@ -0,0 +1,138 @@
+import pygame
+
+# half-height of the band used for x-only queries
+_FAR = 1 << 20
+
+
+class _Entry:
+    __slots__ = ('obj', 'rect', 'kind', 'first', 'last', 'order')
+
+    def __init__(self, obj, rect, kind, first, last, order):
+        self.obj = obj
+        self.rect = rect
+        self.kind = kind
+        self.first = first
+        self.last = last
+        self.order = order
+
+
+def _order_key(entry):
+    return entry.order
+
+
+class SpatialGrid:
+    """Uniform grid over world x for collision and proximity queries.
+
+    The world is a wide horizontal strip, so only x is bucketed: each cell
+    covers `cell_size` pixels and holds the entries whose rect overlaps it.
+    `move()` is meant to be called whenever an entity moves; it just updates
+    the stored rect and only touches the buckets when the entity crosses a
+    cell boundary. Queries visit the cells spanned by the query rect and
+    return matching objects in insertion order, so code that used to scan a
+    list (and stop at the first hit) keeps the same behavior.
+    """
+
+    def __init__(self, world_width, cell_size=64):
+        self.cell_size = max(1, int(cell_size))
+        self.cell_count = max(1, -(-int(world_width) // self.cell_size))
+        self._cells = [dict() for _ in range(self.cell_count)]
+        self._entries = {}
+        self._order = 0
+        # scratch band reused by query_range()
+        self._band = pygame.Rect(0, -_FAR, 1, 2 * _FAR)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj):
+        return obj in self._entries
+
+    def _span(self, rect):
+        last_cell = self.cell_count - 1
+        first = rect.left // self.cell_size
+        last = (rect.right - 1) // self.cell_size
+        first = 0 if first < 0 else (last_cell if first > last_cell else first)
+        last = 0 if last < 0 else (last_cell if last > last_cell else last)
+        return first, max(first, last)
+
+    def insert(self, obj, rect, kind=None):
+        if obj in self._entries:
+            self.move(obj, rect)
+            return
+        first, last = self._span(rect)
+        entry = _Entry(obj, pygame.Rect(rect), kind, first, last, self._order)
+        self._order += 1
+        self._entries[obj] = entry
+        cells = self._cells
+        for c in range(first, last + 1):
+            cells[c][obj] = entry
+
+    def move(self, obj, rect, kind=None):
+        """Update an entity's rect, inserting it (as `kind`) if it is not indexed yet."""
+        entry = self._entries.get(obj)
+        if entry is None:
+            self.insert(obj, rect, kind)
+            return
+        stored = entry.rect
+        stored.update(rect)
+        # fast path: still inside the same cells (the common case per tick)
+        cs = self.cell_size
+        if stored.left // cs == entry.first and (stored.right - 1) // cs == entry.last:
+            return
+        first, last = self._span(stored)
+        if first == entry.first and last == entry.last:
+            return
+        cells = self._cells
+        for c in range(entry.first, entry.last + 1):
+            if c < first or c > last:
+                del cells[c][obj]
+        for c in range(first, last + 1):
+            if c < entry.first or c > entry.last:
+                cells[c][obj] = entry
+        entry.first = first
+        entry.last = last
+
+    def remove(self, obj):
+        entry = self._entries.pop(obj, None)
+        if entry is None:
+            return
+        cells = self._cells
+        for c in range(entry.first, entry.last + 1):
+            cells[c].pop(obj, None)
+
+    def clear(self, kind=None):
+        if kind is None:
+            self._entries.clear()
+            for cell in self._cells:
+                cell.clear()
+            return
+        for obj in [o for o, e in self._entries.items() if e.kind == kind]:
+            self.remove(obj)
+
+    def _collect(self, rect, kind):
+        first, last = self._span(rect)
+        found = []
+        cells = self._cells
+        collide = rect.colliderect
+        for c in range(first, last + 1):
+            for entry in cells[c].values():
+                # an entry spanning several cells is reported from the first
+                # cell both it and the query cover, so nothing is duplicated
+                if kind is not None and entry.kind != kind:
+                    continue
+                if (entry.first if entry.first > first else first) == c and collide(entry.rect):
+                    found.append(entry)
+        if len(found) > 1:
+            found.sort(key=_order_key)
+        return [e.obj for e in found]
+
+    def query(self, rect, kind=None):
+        """Objects whose rect overlaps `rect`, optionally only those of `kind`."""
+        return self._collect(rect, kind)
+
+    def query_range(self, x0, x1, kind=None):
+        """Objects whose rect overlaps the world x interval [x0, x1), at any height."""
+        band = self._band
+        band.x = x0
+        band.width = max(1, x1 - x0)
+        return self._collect(band, kind)
@@ -0,0 +1,119 @@
+import random
+import time
+
+from .entities.enemy import Enemy
+
+
+class SpawnDirector:
+    """Creates and places enemies for `Gameplay` without frame spikes.
+
+    Spawn positions come from the precomputed valid intervals of the ground
+    (inside the world margins and at least `min_player_distance` from the
+    player), picked with one length-weighted draw instead of rejection
+    sampling. Enemy construction is amortized: `prewarm()` builds instances
+    ahead of time (e.g. while the spawn alert is on screen) into a ready
+    list, and `fill()` places ready enemies first and constructs new ones
+    only while the per-frame time budget lasts. Archetypes are picked when
+    an enemy is placed, never while prewarming, so the random draws do not
+    depend on how many enemies the budget let `prewarm()` build. At least one enemy is
+    produced per call, so a tiny budget still makes progress. New enemies
+    come from `Enemy.acquire()`, so released (dead) enemies are reused.
+    """
+
+    def __init__(self, world_width, spawn_y, budget_ms=2.0, min_player_distance=600, margin=100,
+                 pick_archetype=None, rng=None):
+        self.world_width = int(world_width)
+        self.spawn_y = int(spawn_y)
+        self.budget_ms = float(budget_ms)
+        self.min_player_distance = int(min_player_distance)
+        self.margin = int(margin)
+        # callable returning the archetype (or registry name / None) of the next enemy
+        self.pick_archetype = pick_archetype or (lambda: None)
+        self.rng = rng or random
+        # constructed enemies waiting to be placed
+        self.ready = []
+
+    def __len__(self):
+        return len(self.ready)
+
+    # -- placement --------------------------------------------------------
+
+    def valid_intervals(self, player_x):
+        """[lo, hi] ranges of spawn x that respect the margins and player distance."""
+        lo, hi = self.margin, self.world_width - self.margin
+        if hi < lo:
+            lo = hi = self.world_width // 2
+        gap = self.min_player_distance
+        intervals = []
+        if player_x - gap - 1 >= lo:
+            intervals.append((lo, min(hi, player_x - gap - 1)))
+        if player_x + gap + 1 <= hi:
+            intervals.append((max(lo, player_x + gap + 1), hi))
+        return intervals
+
+    def pick_x(self, player_x):
+        """A uniformly distributed valid spawn x (the farthest edge if none is valid)."""
+        intervals = self.valid_intervals(player_x)
+        if not intervals:
+            lo, hi = self.margin, self.world_width - self.margin
+            return lo if abs(lo - player_x) >= abs(hi - player_x) else hi
+        total = sum(b - a + 1 for a, b in intervals)
+        offset = self.rng.randrange(total)
+        for a, b in intervals:
+            length = b - a + 1
+            if offset < length:
+                return a + offset
+            offset -= length
+        return intervals[-1][1]
+
+    # -- construction -----------------------------------------------------
+
+    def _build(self, x=0, now=None, archetype=None):
+        # recycles a pooled enemy when one is available
+        return Enemy.acquire(x, self.spawn_y, archetype, now)
+
+    def clear(self):
+        """Return the ready enemies to the Enemy pool."""
+        for enemy in self.ready:
+            enemy.release()
+        del self.ready[:]
+
+    def prewarm(self, count, budget_ms=None, archetypes=()):
+        """Preload `archetypes` and build up to `count` ready enemies within the budget.
+
+        Returns how many enemies are ready afterwards.
+        """
+        deadline = time.perf_counter() + (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        for archetype in archetypes:
+            if time.perf_counter() >= deadline:
+                return len(self.ready)
+            archetype.preload()
+        while len(self.ready) < count and time.perf_counter() < deadline:
+            # a blank instance; fill() gives it its archetype, position and clock
+            self.ready.append(self._build())
+        return len(self.ready)
+
+    def fill(self, missing, player_x, budget_ms=None, now=None):
+        """Place up to `missing` enemies this frame and return them.
+
+        Ready enemies are used first; new ones are constructed while the
+        budget lasts. The caller adds the result to its enemy list/index.
+        `now` is the simulation time the enemies start their clips at; ready
+        enemies are reset with it, so they carry nothing from prewarm time.
+        """
+        if missing <= 0:
+            return []
+        deadline = time.perf_counter() + (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        spawned = []
+        while len(spawned) < missing:
+            if spawned and time.perf_counter() >= deadline:
+                break
+            x = self.pick_x(player_x)
+            archetype = self.pick_archetype()
+            if self.ready:
+                enemy = self.ready.pop()
+                enemy.reset(x, self.spawn_y, archetype, now)
+            else:
+                enemy = self._build(x, now, archetype)
+            spawned.append(enemy)
+        return spawned
@@ -39,6 +39,9 @@ class AudioManager:
         self._battle_channel_fraction = {}
         self._processed_cache = {}
         self._processing = {}
+        # processed-SFX cache statistics (shown by the performance overlay)
+        self.cache_hits = 0
+        self.cache_misses = 0
 
         try:
             pygame.mixer.set_num_channels(max(8, int(num_channels)))
@@ -376,6 +379,14 @@ class AudioManager:
         except Exception:
             return None
 
+    @staticmethod
+    def default_layers(pitch=1.0, bitcrush=1, distortion=0.0):
+        """Two-layer preset used by play_sound_effect when no layers are given."""
+        return [
+            {'pitch': pitch, 'bitcrush': bitcrush, 'distortion': distortion, 'gain': 1.0},
+            {'pitch': pitch * 1.12, 'bitcrush': max(1, bitcrush + 1), 'distortion': max(0.0, distortion * 0.6), 'gain': 0.45},
+        ]
+
     def play_sound_effect(self, name, pitch=1.0, bitcrush=1, distortion=0.0, volume=1.0, layers=None, async_process=True, cache=True):
         if np is None:
             return self.play_variant(name) if os.path.isdir(os.path.join(self.assets_path, 'aounds', name)) or os.path.isdir(os.path.join(self.sfx_path, name)) else self.play_sound(name, volume=volume)
@@ -392,13 +403,11 @@ class AudioManager:
                 return None
 
             if layers is None:
-                layers = [
-                    {'pitch': pitch, 'bitcrush': bitcrush, 'distortion': distortion, 'gain': 1.0},
-                    {'pitch': pitch * 1.12, 'bitcrush': max(1, bitcrush + 1), 'distortion': max(0.0, distortion * 0.6), 'gain': 0.45},
-                ]
+                layers = self.default_layers(pitch, bitcrush, distortion)
 
             key = (path, tuple((int(round(l.get('pitch',1.0)*100)), int(l.get('bitcrush',1)), int(round(l.get('distortion',0.0)*100)), int(round(l.get('gain',1.0)*100))) for l in layers))
             if cache and key in self._processed_cache:
+                self.cache_hits += 1
                 snd = self._processed_cache[key]
                 try:
                     snd.set_volume(volume * self.sfx_volume * self.master_volume)
@@ -407,6 +416,7 @@ class AudioManager:
                 except Exception:
                     pass
 
+            self.cache_misses += 1
             if async_process:
                 if cache and key in self._processing:
                     return self.play_sound(name, volume=volume*0.5)
@@ -496,4 +506,56 @@ class AudioManager:
             snd = pygame.sndarray.make_sound(out)
             return snd
         except Exception:
-            return None
\ No newline at end of file
+            return None
+
+class NullAudio:
+    """Silent stand-in used when the mixer is unavailable (or in headless runs).
+
+    Mirrors the subset of the `AudioManager` API that scenes call so callers
+    never need to special-case a missing sound device.
+    """
+
+    master_volume = 1.0
+    sfx_volume = 0.2
+    music_volume = 0.2
+    cache_hits = 0
+    cache_misses = 0
+
+    def play_sound(self, *args, **kwargs):
+        return None
+
+    def play_variant(self, *args, **kwargs):
+        return None
+
+    def play_sound_effect(self, *args, **kwargs):
+        return None
+
+    def play_music(self, *args, **kwargs):
+        return False
+
+    def play_menu_music(self, *args, **kwargs):
+        return False
+
+    def crossfade_music(self, *args, **kwargs):
+        return False
+
+    def start_battle_music(self, *args, **kwargs):
+        return False
+
+    def stop_battle_music(self, *args, **kwargs):
+        return None
+
+    def stop_music(self, *args, **kwargs):
+        return None
+
+    def set_master_volume(self, volume):
+        self.master_volume = max(0.0, min(1.0, float(volume)))
+
+    def set_sfx_volume(self, volume):
+        self.sfx_volume = max(0.0, min(1.0, float(volume)))
+
+    def set_music_volume(self, volume):
+        self.music_volume = max(0.0, min(1.0, float(volume)))
+
+    def preload_folder(self, *args, **kwargs):
+        return 0
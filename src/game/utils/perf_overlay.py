@@ -0,0 +1,141 @@
+import collections
+import pygame
+
+
+class PerfOverlay:
+    """Toggleable performance overlay (F3) drawn by `GameApp` on the display.
+
+    Shows FPS, a rolling frame-time graph, the per-stage breakdown of the
+    last frame (events, update, render, zoom, flip), live entity counts from
+    the active scene and the audio DSP cache hit rate.
+
+    While hidden nothing is recorded: `GameApp.run` only takes timestamps
+    when `visible` is True, so the overlay can stay enabled in release builds.
+    """
+
+    STAGES = ('events', 'update', 'render', 'zoom', 'flip')
+    STAGE_COLORS = {
+        'events': (120, 200, 255),
+        'update': (120, 255, 140),
+        'render': (255, 210, 90),
+        'zoom': (255, 130, 200),
+        'flip': (200, 160, 255),
+    }
+    TOGGLE_KEY = pygame.K_F3
+
+    def __init__(self, history=120, budget_ms=1000.0 / 60.0):
+        self.visible = False
+        self.budget_ms = float(budget_ms)
+        self.frame_times = collections.deque(maxlen=int(history))
+        self.stage_ms = dict.fromkeys(self.STAGES, 0.0)
+        self._font = None
+        self._panel = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        # stale samples from the previous session would skew the graph
+        self.frame_times.clear()
+
+    def handle_event(self, event):
+        """Consume the toggle key. Returns True if the event was handled."""
+        if event.type == pygame.KEYDOWN and event.key == self.TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def record(self, frame_ms, stages):
+        self.frame_times.append(frame_ms)
+        self.stage_ms.update(stages)
+
+    def _get_font(self):
+        if self._font is None:
+            try:
+                self._font = pygame.font.SysFont('Courier New', 14)
+            except Exception:
+                self._font = pygame.font.Font(None, 18)
+        return self._font
+
+    @staticmethod
+    def _entity_counts(scene):
+        counts = []
+        for attr in ('enemies', 'effects', 'projectiles'):
+            if attr == 'enemies' and hasattr(scene, 'enemy_count'):
+                counts.append((attr, scene.enemy_count()))
+                continue
+            items = getattr(scene, attr, None)
+            if items is not None:
+                try:
+                    counts.append((attr, len(items)))
+                except Exception:
+                    pass
+        # enemies per level-of-detail tier (full/reduced/far)
+        lod = getattr(scene, 'lod_counts', None)
+        if lod:
+            counts.append(('lod', '/'.join(str(c) for c in lod)))
+        return counts
+
+    @staticmethod
+    def _cache_rate(audio):
+        hits = getattr(audio, 'cache_hits', 0)
+        misses = getattr(audio, 'cache_misses', 0)
+        total = hits + misses
+        if not total:
+            return None
+        return hits, total
+
+    def draw(self, surface, fps, scene=None, audio=None):
+        if not self.visible:
+            return
+        font = self._get_font()
+        line_h = font.get_linesize()
+
+        lines = [(f'FPS {fps:5.1f}', (255, 255, 255))]
+        if self.frame_times:
+            last = self.frame_times[-1]
+            worst = max(self.frame_times)
+            lines.append((f'frame {last:6.2f} ms  max {worst:6.2f}', (255, 255, 255)))
+        for name in self.STAGES:
+            lines.append((f'{name:<7}{self.stage_ms.get(name, 0.0):7.2f} ms', self.STAGE_COLORS[name]))
+        if scene is not None:
+            lines.append((f'scene  {scene.__class__.__name__}', (220, 220, 220)))
+            counts = self._entity_counts(scene)
+            if counts:
+                lines.append(('  '.join(f'{k} {v}' for k, v in counts), (220, 220, 220)))
+        rate = self._cache_rate(audio)
+        if rate is not None:
+            hits, total = rate
+            lines.append((f'sfx cache {100.0 * hits / total:5.1f}% ({hits}/{total})', (220, 220, 220)))
+
+        graph_h = 60
+        width = 260
+        height = 8 + line_h * len(lines) + 6 + graph_h + 8
+        if self._panel is None or self._panel.get_size() != (width, height):
+            self._panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((0, 0, 0, 170))
+
+        y = 8
+        for text, color in lines:
+            panel.blit(font.render(text, True, color), (8, y))
+            y += line_h
+
+        # rolling frame-time graph; the budget line sits at half height so
+        # spikes up to 2x budget remain visible
+        gx = 8
+        gy = y + 6
+        gw = width - 16
+        scale = graph_h / (self.budget_ms * 2.0)
+        pygame.draw.rect(panel, (40, 40, 40, 200), (gx, gy, gw, graph_h))
+        budget_y = gy + graph_h - int(self.budget_ms * scale)
+        pygame.draw.line(panel, (255, 80, 80), (gx, budget_y), (gx + gw - 1, budget_y))
+        n = len(self.frame_times)
+        if n:
+            bar_w = max(1, gw // self.frame_times.maxlen)
+            x = gx + gw - n * bar_w
+            for ft in self.frame_times:
+                h = min(graph_h, max(1, int(ft * scale)))
+                color = (120, 255, 140) if ft <= self.budget_ms else (255, 110, 80)
+                panel.fill(color, (x, gy + graph_h - h, bar_w, h))
+                x += bar_w
+
+        surface.blit(panel, (8, surface.get_height() - height - 8))
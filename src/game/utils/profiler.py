@@ -0,0 +1,157 @@
+import cProfile
+import os
+import pstats
+import time
+import pygame
+
+
+def _default_out_dir():
+    base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    return os.path.join(base, 'logs', 'profiles')
+
+
+def _func_label(func):
+    filename, lineno, name = func
+    if filename == '~':
+        # built-ins are reported as ('~', 0, '<built-in method ...>')
+        return name
+    return f'{os.path.basename(filename)}:{name}:{lineno}'
+
+
+def write_collapsed(stats, path, min_ms=0.01, max_depth=64):
+    """Write a `pstats.Stats` call graph as collapsed stacks (`a;b;c microseconds`).
+
+    cProfile only records caller/callee pairs, so full stacks are rebuilt by
+    walking the graph from its roots and splitting each function's time across
+    callers in proportion to the cumulative time each caller accounted for.
+    The result is an approximation, but it is exactly what flame-graph tools
+    expect and keeps the hot paths readable.
+    """
+    raw = stats.stats
+    callees = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+    roots = [f for f, v in raw.items() if not v[4]]
+
+    lines = {}
+
+    def _walk(func, path_labels, on_path, share):
+        # share: fraction of func's cumulative time flowing through this path
+        _cc, _nc, tt, ct, _callers = raw[func]
+        if ct * share * 1000.0 < min_ms or len(path_labels) >= max_depth:
+            return
+        path_labels.append(_func_label(func))
+        on_path.add(func)
+        self_us = int(tt * share * 1e6)
+        if self_us > 0:
+            key = ';'.join(path_labels)
+            lines[key] = lines.get(key, 0) + self_us
+        for child in callees.get(func, ()):
+            if child in on_path:
+                continue
+            child_ct = raw[child][3]
+            via = raw[child][4].get(func)
+            if not via or child_ct <= 0:
+                continue
+            _walk(child, path_labels, on_path, share * via[3] / child_ct)
+        on_path.discard(func)
+        path_labels.pop()
+
+    for root in roots:
+        _walk(root, [], set(), 1.0)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for key, us in sorted(lines.items()):
+            f.write(f'{key} {us}\n')
+
+
+class ProfileCapture:
+    """cProfile capture sessions triggered from inside the running game.
+
+    Press F4 (or pass `--profile` on the command line) to profile the next
+    `frames` frames of `GameApp.run`. Only frame work is profiled; the idle
+    time spent in `clock.tick` is excluded. Each capture writes a `.pstats`
+    file and a collapsed-stack `.folded` file next to it, both named after
+    the scene classes that were active (e.g. `Gameplay-20250101-120000`).
+    """
+
+    TOGGLE_KEY = pygame.K_F4
+
+    def __init__(self, frames=300, out_dir=None, start_on_scene=None):
+        self.frames = max(1, int(frames))
+        self.out_dir = out_dir or _default_out_dir()
+        # scene class name that auto-starts a capture when it becomes active
+        self.start_on_scene = start_on_scene
+        self.active = False
+        self.last_paths = None
+        self._profile = None
+        self._frames_done = 0
+        self._scenes = []
+
+    def handle_event(self, event):
+        """Consume the toggle key. Returns True if the event was handled."""
+        if event.type == pygame.KEYDOWN and event.key == self.TOGGLE_KEY:
+            if self.active:
+                self.stop()
+            else:
+                self.start()
+            return True
+        return False
+
+    def start(self):
+        if self.active:
+            return
+        self._profile = cProfile.Profile()
+        self._frames_done = 0
+        self._scenes = []
+        self.active = True
+
+    def begin_frame(self, scene):
+        if not self.active:
+            name = scene.__class__.__name__
+            if self.start_on_scene and name == self.start_on_scene:
+                self.start_on_scene = None
+                self.start()
+            else:
+                return
+        name = scene.__class__.__name__
+        if not self._scenes or self._scenes[-1] != name:
+            self._scenes.append(name)
+        self._profile.enable()
+
+    def end_frame(self):
+        if not self.active:
+            return None
+        self._profile.disable()
+        self._frames_done += 1
+        if self._frames_done >= self.frames:
+            return self.stop()
+        return None
+
+    def stop(self):
+        """Finish the capture and write it out. Returns (pstats_path, folded_path)."""
+        if not self.active:
+            return None
+        self.active = False
+        profile = self._profile
+        self._profile = None
+        try:
+            profile.disable()
+        except Exception:
+            pass
+
+        label = '+'.join(self._scenes) or 'unknown'
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(self.out_dir, f'{label}-{stamp}-{self._frames_done}f')
+        try:
+            os.makedirs(self.out_dir, exist_ok=True)
+            stats = pstats.Stats(profile)
+            stats.dump_stats(base + '.pstats')
+            write_collapsed(stats, base + '.folded')
+        except Exception as e:
+            print(f'Profile capture failed: {e}')
+            return None
+        self.last_paths = (base + '.pstats', base + '.folded')
+        print(f'Profile written: {self.last_paths[0]}')
+        return self.last_paths
@@ -0,0 +1,175 @@
+import csv
+import os
+import re
+import struct
+import threading
+import time
+
+from ..events import EVENT_NAMES
+
+MAGIC = b'KTEL'
+VERSION = 2
+
+# gameplay events delivered in the frame, one column per type ('player_hurt', ...)
+EVENT_FIELDS = tuple(re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower() for name in EVENT_NAMES)
+_NO_EVENTS = (0,) * len(EVENT_FIELDS)
+
+# one frame: timestamp (s since session start), frame period, five stage
+# timings (ms), scene id, enemy count, effect count, time_scale, and the
+# count of each gameplay event type (EventCounter)
+RECORD = struct.Struct(f'<d6fBHHf{len(EVENT_FIELDS)}H')
+FIELDS = ('timestamp', 'frame_ms', 'events_ms', 'update_ms', 'render_ms', 'zoom_ms', 'flip_ms',
+          'scene', 'enemies', 'effects', 'time_scale') + EVENT_FIELDS
+
+_HEADER = struct.Struct('<4sHH')      # magic, version, record size
+_SCENE_TAG = b'S'                     # S, id (B), name length (B), name
+_FRAMES_TAG = b'F'                    # F, record count (I), records
+_COUNT = struct.Struct('<I')
+
+
+def _default_path():
+    base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    return os.path.join(base, 'logs', time.strftime('telemetry-%Y%m%d-%H%M%S.ktel'))
+
+
+class FrameTelemetry:
+    """Per-frame timing telemetry kept in a fixed-size binary ring buffer.
+
+    `record()` packs one fixed-size struct into a preallocated bytearray on
+    the main thread; a background writer drains the ring to disk in chunks,
+    so no file I/O happens inside a frame. If the writer falls a full ring
+    behind, new records are dropped and counted in `dropped` rather than
+    blocking the game.
+
+    Convert a capture to CSV with `python src/tools/telemetry2csv.py FILE`.
+    """
+
+    def __init__(self, path=None, capacity=4096):
+        self.path = path or _default_path()
+        self.capacity = max(16, int(capacity))
+        self._buf = bytearray(RECORD.size * self.capacity)
+        self._head = 0      # records written by the main thread
+        self._tail = 0      # records flushed by the writer
+        self.dropped = 0
+        self._scene_ids = {}
+        self._pending_scenes = []
+        self._scene_lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._wake = threading.Event()
+        self._closed = False
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._thread = threading.Thread(target=self._writer, name='telemetry-writer', daemon=True)
+        self._thread.start()
+
+    def _scene_id(self, name):
+        sid = self._scene_ids.get(name)
+        if sid is None:
+            sid = len(self._scene_ids) % 256
+            self._scene_ids[name] = sid
+            with self._scene_lock:
+                self._pending_scenes.append((sid, name))
+        return sid
+
+    def record(self, frame_ms, stages, scene_name, enemies, effects, time_scale, events=None):
+        """Log one frame; `events` are the per-type event counts in `EVENT_NAMES` order."""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.dropped += 1
+            return
+        RECORD.pack_into(self._buf, (head % self.capacity) * RECORD.size,
+                         time.perf_counter() - self._t0, frame_ms,
+                         stages[0], stages[1], stages[2], stages[3], stages[4],
+                         self._scene_id(scene_name), min(enemies, 0xFFFF), min(effects, 0xFFFF),
+                         time_scale, *(min(n, 0xFFFF) for n in (events or _NO_EVENTS)))
+        self._head = head + 1
+        if self._head - self._tail >= self.capacity // 2:
+            self._wake.set()
+
+    def _drain(self):
+        head = self._head
+        tail = self._tail
+        if self._pending_scenes:
+            with self._scene_lock:
+                scenes, self._pending_scenes = self._pending_scenes, []
+            for sid, name in scenes:
+                raw = name.encode('utf-8')[:255]
+                self._file.write(_SCENE_TAG + bytes((sid, len(raw))) + raw)
+        if head == tail:
+            return
+        count = head - tail
+        start = tail % self.capacity
+        end = start + count
+        self._file.write(_FRAMES_TAG + _COUNT.pack(count))
+        size = RECORD.size
+        if end <= self.capacity:
+            self._file.write(self._buf[start * size:end * size])
+        else:
+            self._file.write(self._buf[start * size:])
+            self._file.write(self._buf[:(end - self.capacity) * size])
+        self._tail = head
+
+    def _writer(self):
+        while not self._closed:
+            self._wake.wait(1.0)
+            self._wake.clear()
+            try:
+                self._drain()
+            except Exception:
+                return
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+        try:
+            self._drain()
+            self._file.close()
+        except Exception:
+            pass
+
+
+def read_records(path):
+    """Yield one dict per recorded frame, with the scene id resolved to its name."""
+    scenes = {}
+    with open(path, 'rb') as f:
+        magic, version, size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a telemetry capture')
+        if size != RECORD.size:
+            raise ValueError(f'unsupported record size {size} (version {version})')
+        while True:
+            tag = f.read(1)
+            if not tag:
+                return
+            if tag == _SCENE_TAG:
+                sid, n = f.read(2)
+                scenes[sid] = f.read(n).decode('utf-8', 'replace')
+            elif tag == _FRAMES_TAG:
+                data = f.read(_COUNT.size)
+                if len(data) < _COUNT.size:
+                    return
+                (count,) = _COUNT.unpack(data)
+                chunk = f.read(count * size)
+                for values in RECORD.iter_unpack(chunk[:len(chunk) - len(chunk) % size]):
+                    row = dict(zip(FIELDS, values))
+                    row['scene'] = scenes.get(row['scene'], str(row['scene']))
+                    yield row
+            else:
+                raise ValueError(f'corrupt telemetry block tag {tag!r}')
+
+
+def to_csv(path, out_path):
+    """Convert a telemetry capture to CSV. Returns the number of frames written."""
+    n = 0
+    with open(out_path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in read_records(path):
+            writer.writerow(row)
+            n += 1
+    return n
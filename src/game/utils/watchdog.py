@@ -0,0 +1,147 @@
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+
+
+def _default_log_path():
+    base = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    return os.path.join(base, 'logs', 'hitches.log')
+
+
+class FrameWatchdog:
+    """Long-frame watchdog backed by a sampling stack profiler.
+
+    A daemon thread samples the main thread's Python stack (via
+    `sys._current_frames`) every `interval_ms` while a frame is in progress.
+    When a frame ends over `budget_ms`, the stacks gathered during that frame
+    are aggregated and written to a rotating log, leaf-most frame last, in
+    the collapsed `a;b;c count` form flame-graph tools understand.
+
+    Usage from the main loop:
+
+        watchdog.begin_frame()
+        ...  # events / update / render / flip
+        watchdog.end_frame(label=scene.__class__.__name__)
+    """
+
+    def __init__(self, budget_ms=1000.0 / 60.0, interval_ms=2.0, log_path=None,
+                 max_bytes=1024 * 1024, backup_count=3, max_depth=48):
+        self.budget_ms = float(budget_ms)
+        self.interval_s = max(0.0005, float(interval_ms) / 1000.0)
+        self.max_depth = int(max_depth)
+        self.log_path = log_path or _default_log_path()
+        self.hitches = 0
+
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._target_ident = None
+        self._frame_start = 0.0
+        self._samples = {}
+        self._sample_count = 0
+        self._thread = None
+        self._prev_switch_interval = None
+
+        self.logger = logging.getLogger('game.watchdog')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._handler = None
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            self._handler = logging.handlers.RotatingFileHandler(
+                self.log_path, maxBytes=int(max_bytes), backupCount=int(backup_count), encoding='utf-8')
+            self._handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self.logger.addHandler(self._handler)
+        except Exception:
+            # the watchdog must never stop the game from starting
+            self._handler = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # a sampler can only run when the main thread yields the GIL; shorten
+        # the switch interval so samples land close to the requested rate
+        self._prev_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._prev_switch_interval, self.interval_s))
+        self._thread = threading.Thread(target=self._run, name='frame-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        if self._prev_switch_interval is not None:
+            sys.setswitchinterval(self._prev_switch_interval)
+            self._prev_switch_interval = None
+        if self._handler is not None:
+            try:
+                self.logger.removeHandler(self._handler)
+                self._handler.close()
+            except Exception:
+                pass
+            self._handler = None
+
+    def begin_frame(self):
+        with self._lock:
+            self._target_ident = threading.get_ident()
+            self._samples = {}
+            self._sample_count = 0
+            self._frame_start = time.perf_counter()
+        self._active.set()
+
+    def end_frame(self, label=''):
+        """Close the current frame. Returns the frame time in milliseconds."""
+        self._active.clear()
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        if frame_ms > self.budget_ms:
+            with self._lock:
+                samples = self._samples
+                count = self._sample_count
+                self._samples = {}
+                self._sample_count = 0
+            self.hitches += 1
+            self._dump(frame_ms, label, samples, count)
+        return frame_ms
+
+    def _run(self):
+        current_frames = sys._current_frames
+        interval = self.interval_s
+        while not self._stop.is_set():
+            if not self._active.wait(0.25):
+                continue
+            if self._stop.is_set():
+                break
+            time.sleep(interval)
+            if not self._active.is_set():
+                continue
+            frame = current_frames().get(self._target_ident)
+            if frame is None:
+                continue
+            stack = []
+            depth = 0
+            while frame is not None and depth < self.max_depth:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}')
+                frame = frame.f_back
+                depth += 1
+            del frame
+            key = ';'.join(reversed(stack))
+            with self._lock:
+                if self._active.is_set():
+                    self._samples[key] = self._samples.get(key, 0) + 1
+                    self._sample_count += 1
+
+    def _dump(self, frame_ms, label, samples, count):
+        if self._handler is None:
+            return
+        lines = [f'long frame {frame_ms:.1f} ms (budget {self.budget_ms:.1f} ms) '
+                 f'scene={label or "?"} samples={count}']
+        for stack, n in sorted(samples.items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f'{stack} {n}')
+        self.logger.info('\n'.join(lines))
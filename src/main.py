@@ -1,11 +1,55 @@
+import argparse
 import pygame
 from game.app import GameApp
+from game.settings import NETPLAY_PORT, BROADCAST_PORT
 
-def main():
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Knight Demo Game')
+    parser.add_argument('--watchdog', metavar='MS', type=float, nargs='?', const=1000.0 / 60.0, default=None,
+                        help='log sampled stacks of frames slower than MS milliseconds to logs/hitches.log')
+    parser.add_argument('--profile', metavar='N', type=int, nargs='?', const=300, default=None,
+                        help='capture a cProfile session of N frames (default 300); F4 starts/stops one in game')
+    parser.add_argument('--profile-scene', metavar='SCENE', default=None,
+                        help='with --profile, wait until SCENE (MainMenu, Gameplay, LoadScreen) is active')
+    parser.add_argument('--telemetry', metavar='PATH', nargs='?', const='', default=None,
+                        help='record per-frame timings to a binary capture (default: logs/telemetry-*.ktel)')
+    parser.add_argument('--netplay', metavar='HOST:PORT', default=None,
+                        help='start a two-player netplay match with the game listening at HOST:PORT')
+    parser.add_argument('--netplay-port', metavar='PORT', type=int, default=NETPLAY_PORT,
+                        help=f'UDP port this game listens on (default {NETPLAY_PORT})')
+    parser.add_argument('--netplay-player', type=int, choices=(1, 2), default=1,
+                        help='which knight this side controls; the other game must pick the other one')
+    parser.add_argument('--netplay-seed', type=int, default=0, help='battle seed, identical on both sides')
+    parser.add_argument('--broadcast', metavar='PORT', type=int, nargs='?', const=BROADCAST_PORT, default=None,
+                        help=f'stream the battle to spectators on local TCP PORT (default {BROADCAST_PORT}); '
+                             'watch with src/tools/stream_viewer.py')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    netplay = None
+    if args.netplay:
+        host, _, port = args.netplay.rpartition(':')
+        netplay = {
+            'port': args.netplay_port,
+            'peer': (host or '127.0.0.1', int(port)),
+            'player': args.netplay_player - 1,
+            'seed': args.netplay_seed,
+        }
     pygame.init()
-    game = GameApp()
+    game = GameApp(
+        watchdog_budget_ms=args.watchdog,
+        profile_frames=args.profile or 300,
+        profile_on_start=args.profile is not None and not args.profile_scene,
+        profile_scene=args.profile_scene if args.profile is not None else None,
+        telemetry_path=args.telemetry,
+        netplay=netplay,
+        broadcast_port=args.broadcast,
+    )
     game.run()
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,311 @@
+"""Batch balance simulator: many headless sessions per parameter set, on every core.
+
+Sweeps the cartesian product of the `--param` values; each combination is
+played `--runs` times (seeds `--seed` onwards) by a scripted knight
+(`ScriptedPlayer`) on the fixed-step `TrainingGameplay`, so every run is
+reproducible. Sessions end when the knight dies or after `--minutes` of
+simulated time. Per combination the report gives the distribution
+(p10/median/p90) of survival time, kills per minute and damage taken,
+plus the share of runs that survived to the time limit.
+
+A pool of worker processes plays the runs. Each worker builds one scene
+and restarts it in place between runs, so assets are loaded once per
+worker; `--no-render` skips the images only drawing needs (parallax
+layers, character spritesheets; blank frames with the same frame counts
+keep the animation timing and so the results unchanged).
+Only a small record per run comes back from the workers, streamed as runs
+finish.
+
+Parameters:
+
+    mana_per_kill             Gameplay.mana_per_kill (default 50)
+    attack_cooldown_duration  ms between attacks of every enemy type (enemies.json)
+    attack_range              reach of the knight's swing in px (Player.attack_range)
+    kill_threshold_step       kills between increases of the enemy limit (default 5)
+
+Usage (from the repository root):
+
+    python src/tools/balance_sim.py --param mana_per_kill=25,50,100 --runs 200 --no-render
+    python src/tools/balance_sim.py --param attack_range=80,100,120 --param kill_threshold_step=3,5,8
+    python src/tools/balance_sim.py --param attack_cooldown_duration=1000,2000 --csv runs.csv --json -
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.settings import FPS  # noqa: E402
+from game.netplay import IN_LEFT, IN_RIGHT, IN_JUMP, IN_ATTACK, IN_CAST  # noqa: E402
+from game.entities.states import STATE_FLAGS, ATTACKING, DEAD  # noqa: E402
+
+
+def _set_mana_per_kill(scene, value):
+    scene.mana_per_kill = value
+
+
+def _set_attack_cooldown(scene, value):
+    from game.entities.archetype import get_registry
+    from game.entities.enemy import ENEMY_ARCHETYPE
+
+    for archetype in list(get_registry().values()) + [ENEMY_ARCHETYPE]:
+        archetype.attack_cooldown_duration = int(value)
+
+
+def _set_attack_range(scene, value):
+    scene.player.attack_range = int(value)
+
+
+def _set_kill_threshold_step(scene, value):
+    scene.kill_threshold_step = int(value)
+    scene.next_kill_threshold = int(value)
+
+
+# name -> (setter, function reading the current value from a fresh scene)
+PARAMETERS = {
+    'mana_per_kill': (_set_mana_per_kill, lambda scene: scene.mana_per_kill),
+    'attack_cooldown_duration': (_set_attack_cooldown, None),
+    'attack_range': (_set_attack_range, lambda scene: scene.player.attack_range),
+    'kill_threshold_step': (_set_kill_threshold_step, lambda scene: scene.kill_threshold_step),
+}
+
+METRICS = ('survival_s', 'kills_per_min', 'damage')
+
+
+class ScriptedPlayer:
+    """A plain, slightly noisy fighter: close in, face the enemy, swing.
+
+    Targets the nearest living enemy, walks until it is within reach of a
+    swing, turns to face it and attacks; casts a fireball whenever the mana
+    bar is full and it faces an enemy, and sometimes jumps away from an
+    enemy mid-attack. A seeded RNG adds hesitation (repeating the previous
+    input) so runs with different seeds differ beyond the spawn order.
+    """
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.last = 0
+
+    def act(self, scene):
+        rng = self.rng
+        if rng.random() < 0.15:
+            return self.last & ~(IN_ATTACK | IN_CAST)
+        player = scene.player
+        hb = player.get_hitbox()
+        cx = hb.centerx
+        target = None
+        best = None
+        for enemy in scene.enemies:
+            if STATE_FLAGS[enemy.state_id] & DEAD:
+                continue
+            distance = abs(enemy.rect.centerx - cx)
+            if best is None or distance < best:
+                target, best = enemy, distance
+        bits = 0
+        if target is not None:
+            ehb = target.get_hitbox()
+            dx = ehb.centerx - cx
+            toward = IN_RIGHT if dx > 0 else IN_LEFT
+            gap = abs(dx) - (hb.width + ehb.width) // 2
+            reach = player.attack_range
+            facing = (dx > 0) == (player.facing > 0)
+            if STATE_FLAGS[target.state_id] & ATTACKING and gap < reach and rng.random() < 0.2:
+                bits |= IN_JUMP | (IN_LEFT if dx > 0 else IN_RIGHT)
+            elif gap > reach * 0.8 or not facing:
+                bits |= toward
+            else:
+                bits |= IN_ATTACK
+            if facing and scene.mana >= scene.max_mana:
+                bits |= IN_CAST
+        self.last = bits
+        return bits
+
+
+# per-process state of a pool worker (see _init_worker)
+_WORKER = {}
+
+
+def _init_worker(no_render):
+    from game.headless import init_headless, HeadlessApp
+    from game.entities.archetype import get_registry
+    from game.entities.enemy import ENEMY_ARCHETYPE
+    from game.scenes.training import TrainingGameplay
+
+    init_headless()
+    app = HeadlessApp()
+    scene = TrainingGameplay(app, render=not no_render)
+    app.current_scene = scene
+    defaults = {name: read(scene) for name, (_set, read) in PARAMETERS.items() if read is not None}
+    cooldowns = {archetype: archetype.attack_cooldown_duration
+                 for archetype in list(get_registry().values()) + [ENEMY_ARCHETYPE]}
+    _WORKER.update(scene=scene, defaults=defaults, cooldowns=cooldowns)
+
+
+def play(scene, params, seed, max_ticks):
+    """One session of `ScriptedPlayer` with `params` applied; returns its result record."""
+    scene.reset(seed)
+    for name, value in params.items():
+        PARAMETERS[name][0](scene, value)
+    policy = ScriptedPlayer(seed)
+    player = scene.player
+    hp = player.current_hp
+    damage = heals = 0
+    while scene.sim_tick < max_ticks and not scene.is_dead:
+        scene.step(policy.act(scene))
+        if player.current_hp < hp:
+            damage += hp - player.current_hp
+        elif player.current_hp > hp:
+            heals += player.current_hp - hp
+        hp = player.current_hp
+    seconds = scene.sim_tick / FPS
+    return {
+        'seed': seed,
+        'survived': not scene.is_dead,
+        'survival_s': seconds,
+        'kills': scene.kill_count,
+        'kills_per_min': 60.0 * scene.kill_count / seconds if seconds else 0.0,
+        'damage': damage,
+        'heals': heals,
+    }
+
+
+def _run(task):
+    index, params, seed, max_ticks = task
+    worker = _WORKER
+    scene = worker['scene']
+    # every run starts from the stock values of whatever it does not sweep
+    for name, value in worker['defaults'].items():
+        PARAMETERS[name][0](scene, value)
+    for archetype, cooldown in worker['cooldowns'].items():
+        archetype.attack_cooldown_duration = cooldown
+    record = play(scene, params, seed, max_ticks)
+    record['combo'] = index
+    return record
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile `q` (0..100) of `values`."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize(records):
+    """Distribution of each metric over the run records of one combination."""
+    summary = {'runs': len(records),
+               'survived': sum(1 for r in records if r['survived']) / len(records) if records else 0.0}
+    for metric in METRICS:
+        values = [r[metric] for r in records]
+        summary[metric] = {
+            'mean': sum(values) / len(values) if values else 0.0,
+            'p10': percentile(values, 10),
+            'p50': percentile(values, 50),
+            'p90': percentile(values, 90),
+        }
+    return summary
+
+
+def parse_params(specs):
+    """`['name=v1,v2', ...]` -> list of {name: value} combinations."""
+    names, values = [], []
+    for spec in specs:
+        name, _, raw = spec.partition('=')
+        name = name.strip()
+        if name not in PARAMETERS:
+            raise SystemExit(f"unknown parameter {name!r} (known: {', '.join(PARAMETERS)})")
+        try:
+            parsed = [float(v) if '.' in v else int(v) for v in raw.split(',') if v.strip()]
+        except ValueError:
+            raise SystemExit(f'bad values for {name}: {raw!r}')
+        if not parsed:
+            raise SystemExit(f'no values for {name}')
+        names.append(name)
+        values.append(parsed)
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def format_report(combos, summaries):
+    def dist(d, fmt):
+        return f"{d['p10']:{fmt}} {d['p50']:{fmt}} {d['p90']:{fmt}}"
+
+    labels = [' '.join(f'{k}={v}' for k, v in params.items()) or '(defaults)' for params in combos]
+    width = max([len('parameters')] + [len(label) for label in labels])
+    lines = [f"{'parameters':<{width}} {'runs':>5} {'alive':>6}  {'survival s p10/50/90':>20}  "
+             f"{'kills/min p10/50/90':>20}  {'damage p10/50/90':>17}"]
+    for label, s in zip(labels, summaries):
+        lines.append(f"{label:<{width}} {s['runs']:>5} {100.0 * s['survived']:>5.0f}%  "
+                     f"{dist(s['survival_s'], '6.1f'):>20}  {dist(s['kills_per_min'], '6.2f'):>20}  "
+                     f"{dist(s['damage'], '5.1f'):>17}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=V1,V2',
+                        help='parameter values to sweep (repeatable)')
+    parser.add_argument('--runs', type=int, default=50, help='sessions per parameter combination')
+    parser.add_argument('--minutes', type=float, default=3.0, help='simulated time limit per session')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first run of each combination')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--no-render', action='store_true', help='skip loading images that only drawing needs')
+    parser.add_argument('--csv', metavar='PATH', help='write one row per session to PATH')
+    parser.add_argument('--json', metavar='PATH', help="write the summaries as JSON to PATH ('-' for stdout)")
+    opts = parser.parse_args(argv)
+
+    combos = parse_params(opts.param)
+    max_ticks = int(opts.minutes * 60 * FPS)
+    tasks = [(i, params, opts.seed + run, max_ticks)
+             for i, params in enumerate(combos) for run in range(opts.runs)]
+
+    records = [[] for _ in combos]
+    t0 = time.perf_counter()
+    done = 0
+    with multiprocessing.Pool(max(1, opts.workers), initializer=_init_worker, initargs=(opts.no_render,)) as pool:
+        for record in pool.imap_unordered(_run, tasks, chunksize=max(1, len(tasks) // (opts.workers * 8))):
+            records[record['combo']].append(record)
+            done += 1
+            if sys.stderr.isatty():
+                print(f'\r{done}/{len(tasks)} sessions', end='', file=sys.stderr)
+    elapsed = time.perf_counter() - t0
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+
+    summaries = [summarize(sorted(r, key=lambda rec: rec['seed'])) for r in records]
+    simulated = sum(rec['survival_s'] for r in records for rec in r)
+    if opts.csv:
+        with open(opts.csv, 'w', newline='', encoding='utf-8') as f:
+            names = list(combos[0]) if combos else []
+            writer = csv.writer(f)
+            writer.writerow(names + ['seed', 'survived', 'survival_s', 'kills', 'kills_per_min', 'damage', 'heals'])
+            for params, rs in zip(combos, records):
+                for rec in sorted(rs, key=lambda r: r['seed']):
+                    writer.writerow([params[n] for n in names] + [rec['seed'], int(rec['survived']),
+                                    f"{rec['survival_s']:.2f}", rec['kills'], f"{rec['kills_per_min']:.3f}",
+                                    rec['damage'], rec['heals']])
+    if opts.json:
+        text = json.dumps([{'params': p, **s} for p, s in zip(combos, summaries)], indent=2)
+        if opts.json == '-':
+            print(text)
+        else:
+            with open(opts.json, 'w', encoding='utf-8') as f:
+                f.write(text)
+    else:
+        print(format_report(combos, summaries))
+        print(f'{len(tasks)} sessions, {simulated / 60.0:.1f} simulated minutes in {elapsed:.1f} s '
+              f'({simulated / elapsed:.0f}x real time, {opts.workers} workers)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
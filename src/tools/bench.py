@@ -0,0 +1,188 @@
+"""Tiny benchmark harness shared by the scripts in `tools`.
+
+Each measurement runs a warmup phase, then `repeat` timed batches of
+`number` calls, and reports per-call statistics in milliseconds.
+"""
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+
+def measure(name, fn, setup=None, warmup=5, repeat=30, number=1, params=None):
+    """Time `fn` and return a result dict.
+
+    Args:
+        name: Benchmark identifier used in reports.
+        fn: Zero-argument callable being measured.
+        setup: Optional zero-argument callable run (untimed) before every batch.
+        warmup: Untimed batches run first to fill caches.
+        repeat: Number of timed batches.
+        number: Calls per batch; per-call time is batch time / number.
+        params: Optional dict of parameters recorded alongside the result.
+    """
+    number = max(1, int(number))
+    for _ in range(max(0, int(warmup))):
+        if setup is not None:
+            setup()
+        for _ in range(number):
+            fn()
+
+    samples = []
+    for _ in range(max(1, int(repeat))):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        samples.append(elapsed * 1000.0 / number)
+
+    return summarize(name, samples, params=params, number=number)
+
+
+def summarize(name, samples, params=None, number=1):
+    ordered = sorted(samples)
+    n = len(ordered)
+    p95 = ordered[min(n - 1, int(math.ceil(0.95 * n)) - 1)]
+    return {
+        'name': name,
+        'params': dict(params or {}),
+        'repeat': n,
+        'number': number,
+        'min_ms': ordered[0],
+        'median_ms': statistics.median(ordered),
+        'mean_ms': statistics.fmean(ordered),
+        'stdev_ms': statistics.stdev(ordered) if n > 1 else 0.0,
+        'p95_ms': p95,
+        'max_ms': ordered[-1],
+    }
+
+
+def environment():
+    """Describe the machine a report was produced on."""
+    try:
+        import pygame
+        pg = pygame.version.ver
+    except Exception:
+        pg = None
+    try:
+        import numpy
+        np_ver = numpy.__version__
+    except Exception:
+        np_ver = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'pygame': pg,
+        'numpy': np_ver,
+    }
+
+
+class RectCounter:
+    """Count `pygame.Rect` allocations while active (a context manager).
+
+    Two sources are counted:
+
+    - `pygame.Rect(...)` constructions, by swapping the module attribute for
+      a counting subclass;
+    - calls to the C functions that always return a new Rect (`Rect.move`,
+      `copy`, `clip`, `Surface.get_rect`, `blit`, `fill`, `pygame.draw.*`,
+      ... see `FACTORIES`), seen through a `sys.setprofile` hook.
+
+    `count` is the total and `by_source` breaks it down per constructor or
+    factory. Not covered: Rects built inside other C code without a call
+    from Python (e.g. list-returning `Surface.blits`, sprite group drawing
+    in C), `FRect`, and Rects made by modules that bound `pygame.Rect`
+    before the counter started. The profile hook slows the measured code
+    down considerably; only the counts are meaningful.
+    """
+
+    # C callables that return a freshly allocated Rect on every call
+    FACTORIES = frozenset((
+        'Rect.move', 'Rect.copy', 'Rect.clip', 'Rect.inflate', 'Rect.union', 'Rect.unionall',
+        'Rect.clamp', 'Rect.fit', 'Rect.scale_by', 'Rect.__copy__',
+        'Surface.get_rect', 'Surface.get_bounding_rect', 'Surface.get_clip', 'Surface.blit', 'Surface.fill',
+        'pygame.draw.rect', 'pygame.draw.polygon', 'pygame.draw.circle', 'pygame.draw.ellipse',
+        'pygame.draw.arc', 'pygame.draw.line', 'pygame.draw.lines', 'pygame.draw.aaline',
+        'pygame.draw.aalines',
+    ))
+    UNCOVERED = ('Surface.blits', 'C-side sprite drawing', 'FRect', 'Rect aliases bound before start')
+
+    def __init__(self):
+        self.count = 0
+        self.by_source = {}
+        self._original = None
+        self._previous_profile = None
+
+    def _add(self, source):
+        self.count += 1
+        self.by_source[source] = self.by_source.get(source, 0) + 1
+
+    def _profile(self, frame, event, arg):
+        if event != 'c_call':
+            return
+        owner = getattr(arg, '__self__', None)
+        if isinstance(owner, type(sys)):
+            name = f'{owner.__name__}.{arg.__name__}'
+        else:
+            name = getattr(arg, '__qualname__', '')
+        if name in self.FACTORIES:
+            self._add(name)
+
+    def __enter__(self):
+        import pygame
+
+        counter = self
+        original = pygame.Rect
+
+        class CountingRect(original):
+            __slots__ = ()
+
+            def __init__(self, *args):
+                counter._add('Rect()')
+                super().__init__(*args)
+
+        self._original = original
+        pygame.Rect = CountingRect
+        self._previous_profile = sys.getprofile()
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc):
+        import pygame
+        sys.setprofile(self._previous_profile)
+        pygame.Rect = self._original
+        return False
+
+
+def format_table(results):
+    lines = []
+    header = f"{'benchmark':<60} {'median':>10} {'p95':>10} {'min':>10} {'stdev':>10}"
+    lines.append(header)
+    lines.append('-' * len(header))
+    for r in results:
+        label = r['name']
+        if r.get('params'):
+            label += ' ' + ' '.join(f'{k}={v}' for k, v in r['params'].items())
+        lines.append(f"{label:<60} {r['median_ms']:>9.4f}ms {r['p95_ms']:>9.4f}ms "
+                     f"{r['min_ms']:>9.4f}ms {r['stdev_ms']:>9.4f}ms")
+    return '\n'.join(lines)
+
+
+def write_report(results, path=None):
+    """Print a table to stdout and, if `path` is given, dump JSON there ('-' = stdout)."""
+    report = {'environment': environment(), 'results': results}
+    if path == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return report
+    print(format_table(results))
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report
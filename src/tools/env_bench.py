@@ -0,0 +1,94 @@
+"""Throughput of the training environment (game/env.py) under a random policy.
+
+Steps `VecGameEnv` with uniformly random actions for each requested
+worker count (0 = every env in this process) and reports environment
+steps per second, simulated ticks per second and the episodes finished
+with their mean return. The random policy is seeded, so every worker
+count sees the same episodes.
+
+Usage (from the repository root):
+
+    python src/tools/env_bench.py
+    python src/tools/env_bench.py --envs 32 --workers 0,4,8 --steps 2000
+    python src/tools/env_bench.py --frame-skip 4 --json -
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.env import VecGameEnv, ACTION_COUNT, OBS_SIZE, np  # noqa: E402
+
+
+def run(envs, workers, steps, frame_skip, seed):
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, ACTION_COUNT, size=(steps, envs))
+    returns = []
+    t0 = time.perf_counter()
+    with VecGameEnv(envs, workers=workers, seed=seed, frame_skip=frame_skip) as venv:
+        startup_s = time.perf_counter() - t0
+        venv.reset()
+        t0 = time.perf_counter()
+        for row in actions:
+            _obs, _rewards, _terminated, _truncated, infos = venv.step(row)
+            for info in infos:
+                if info:
+                    returns.append(info['episode']['return'])
+        elapsed = time.perf_counter() - t0
+        workers = venv.workers
+    return {
+        'envs': envs,
+        'workers': workers,
+        'steps': steps * envs,
+        'startup_s': startup_s,
+        'steps_per_s': steps * envs / elapsed,
+        'ticks_per_s': steps * envs * frame_skip / elapsed,
+        'episodes': len(returns),
+        'mean_return': sum(returns) / len(returns) if returns else 0.0,
+    }
+
+
+def format_report(results):
+    lines = [f"{'envs':>5} {'workers':>7} {'startup s':>9} {'steps/s':>9} {'ticks/s':>9} {'episodes':>8} "
+             f"{'return':>7}"]
+    for r in results:
+        lines.append(f"{r['envs']:>5} {r['workers']:>7} {r['startup_s']:>9.2f} {r['steps_per_s']:>9.0f} "
+                     f"{r['ticks_per_s']:>9.0f} {r['episodes']:>8} {r['mean_return']:>7.2f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--envs', type=int, default=8)
+    parser.add_argument('--workers', default=f'0,{os.cpu_count() or 1}',
+                        help='comma-separated worker counts to compare')
+    parser.add_argument('--steps', type=int, default=1000, help='vector steps per run')
+    parser.add_argument('--frame-skip', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON to PATH ('-' for stdout)")
+    opts = parser.parse_args(argv)
+
+    if np is None:
+        print('numpy is required for the training environment', file=sys.stderr)
+        return 2
+    results = [run(opts.envs, int(w), opts.steps, opts.frame_skip, opts.seed)
+               for w in opts.workers.split(',') if w.strip()]
+    if opts.json:
+        text = json.dumps({'observation_size': OBS_SIZE, 'action_count': ACTION_COUNT, 'runs': results}, indent=2)
+        if opts.json == '-':
+            print(text)
+        else:
+            with open(opts.json, 'w', encoding='utf-8') as f:
+                f.write(text)
+    else:
+        print(f'observation: {OBS_SIZE} floats, actions: {ACTION_COUNT}')
+        print(format_report(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
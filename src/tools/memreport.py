@@ -0,0 +1,182 @@
+"""Memory cost of game entities (bytes per enemy).
+
+Builds enemies headlessly and walks each object graph: Python object sizes
+(`sys.getsizeof` of the instance, its `__dict__`/slots and every container
+it owns) plus the pixel memory of any Surfaces it references. Objects shared
+between enemies (e.g. an archetype's frames) are only counted once, so the
+marginal cost of one more enemy is reported separately from the shared
+per-type cost.
+
+`--baseline` also measures the layout enemies had before archetypes: a
+plain object whose `__dict__` holds every field, with its own
+`frame_durations` table and its own copy of every animation frame. It is
+rebuilt from live enemies, so both columns describe the same enemy types.
+Its frames take megabytes per enemy, so only `BASELINE_SAMPLE` of them
+are built.
+
+Usage (from the repository root):
+
+    python src/tools/memreport.py
+    python src/tools/memreport.py --enemies 200 --json
+    python src/tools/memreport.py --mixed
+    python src/tools/memreport.py --baseline
+"""
+import argparse
+import json
+import os
+import sys
+import types
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.headless import init_headless  # noqa: E402
+
+# legacy enemies built by --baseline (each owns ~8.5 MB of frames)
+BASELINE_SAMPLE = 5
+
+_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def _slot_names(cls):
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(slots)
+    return names
+
+
+def deep_size(obj, seen):
+    """(python_bytes, surface_pixel_bytes) reachable from `obj` and not in `seen`."""
+    import pygame
+
+    py_bytes = 0
+    px_bytes = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SKIP) or o is None:
+            continue
+        seen.add(id(o))
+        py_bytes += sys.getsizeof(o)
+        if isinstance(o, pygame.Surface):
+            px_bytes += o.get_width() * o.get_height() * o.get_bytesize()
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+            continue
+        if isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+            continue
+        if isinstance(o, (str, bytes, int, float, bool, complex, pygame.Rect)):
+            continue
+        d = getattr(o, '__dict__', None)
+        if d is not None:
+            stack.append(d)
+        for name in _slot_names(type(o)):
+            if name in ('__dict__', '__weakref__'):
+                continue
+            try:
+                stack.append(getattr(o, name))
+            except AttributeError:
+                pass
+    return py_bytes, px_bytes
+
+
+class _LegacyEnemy:
+    """Stand-in for the enemy layout before archetypes (no slots, nothing shared)."""
+
+
+def legacy_enemy(enemy):
+    """A `_LegacyEnemy` holding `enemy`'s state and its own copy of the per-type data and frames."""
+    from game.entities.enemy import Enemy
+
+    legacy = _LegacyEnemy()
+    d = legacy.__dict__
+    for name in _slot_names(Enemy):
+        if name not in ('archetype', '__dict__', '__weakref__'):
+            d[name] = getattr(enemy, name)
+    d['rect'] = enemy.rect.copy()
+    d['hitbox'] = enemy.hitbox.copy()
+    d['attack_box'] = enemy.attack_box.copy()
+    archetype = enemy.archetype
+    for name in _slot_names(type(archetype)):
+        if not name.startswith('_'):
+            d[name] = getattr(archetype, name)
+    d['state'] = enemy.state
+    d['frame_durations'] = dict(archetype.frame_durations)
+    d['animations'] = {state: [frame.copy() for frame in frames]
+                       for state, frames in archetype.animations.items()}
+    return legacy
+
+
+def _measure(pool):
+    seen = set()
+    first = deep_size(pool[0], seen)
+    rest_py = rest_px = 0
+    for e in pool[1:]:
+        py, px = deep_size(e, seen)
+        rest_py += py
+        rest_px += px
+    n = max(1, len(pool) - 1)
+    return {
+        'enemies': len(pool),
+        'first_enemy_python_bytes': first[0],
+        'first_enemy_surface_bytes': first[1],
+        'per_enemy_python_bytes': rest_py / n,
+        'per_enemy_surface_bytes': rest_px / n,
+        'per_enemy_total_bytes': (rest_py + rest_px) / n,
+    }
+
+
+def run(enemies=100, mixed=False, baseline=False):
+    from game.entities.enemy import Enemy
+    from game.entities.archetype import get_registry
+
+    # --mixed cycles through every archetype in enemies.json
+    names = list(get_registry()) if mixed else []
+    names = names or [None]
+    pool = [Enemy(100 + i * 10, 2000, names[i % len(names)]) for i in range(enemies)]
+    result = _measure(pool)
+    if baseline:
+        result['baseline'] = _measure([legacy_enemy(e) for e in pool[:BASELINE_SAMPLE]])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--enemies', type=int, default=100)
+    parser.add_argument('--mixed', action='store_true', help='spread enemies over every registered archetype')
+    parser.add_argument('--baseline', action='store_true',
+                        help='also measure the pre-archetype layout (dict fields, own frames)')
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    opts = parser.parse_args(argv)
+
+    init_headless()
+    r = run(max(2, opts.enemies), opts.mixed, opts.baseline)
+    if opts.json:
+        print(json.dumps(r, indent=2))
+        return 0
+    b = r.get('baseline')
+    if b is None:
+        print(f"first enemy (incl. shared data): {r['first_enemy_python_bytes']:,} B objects + "
+              f"{r['first_enemy_surface_bytes']:,} B pixels")
+        print(f"each additional enemy:           {r['per_enemy_python_bytes']:,.0f} B objects + "
+              f"{r['per_enemy_surface_bytes']:,.0f} B pixels = {r['per_enemy_total_bytes']:,.0f} B")
+        return 0
+    print(f"{'bytes':<24}{'before':>16}{'after':>16}")
+    print(f"{'(enemies measured)':<24}{b['enemies']:>16,}{r['enemies']:>16,}")
+    for label, key in (('first enemy objects', 'first_enemy_python_bytes'),
+                       ('first enemy pixels', 'first_enemy_surface_bytes'),
+                       ('per enemy objects', 'per_enemy_python_bytes'),
+                       ('per enemy pixels', 'per_enemy_surface_bytes'),
+                       ('per enemy total', 'per_enemy_total_bytes')):
+        print(f"{label:<24}{b[key]:>16,.0f}{r[key]:>16,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,453 @@
+"""Micro-benchmarks for individual hot functions.
+
+Runs without a display or sound device (SDL dummy drivers).
+
+Usage (from the repository root):
+
+    python src/tools/microbench.py
+    python src/tools/microbench.py --json bench.json --filter collision
+    python src/tools/microbench.py --json - --counts 1,10,100
+"""
+import argparse
+import os
+import sys
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.headless import init_headless, HeadlessApp  # noqa: E402
+from tools.bench import measure, write_report  # noqa: E402
+
+
+def bench_sprite_loading(opts):
+    from game.entities.player import Player
+    from game.entities.enemy import Enemy
+
+    player = Player(0, 0)
+    enemy = Enemy(0, 0)
+    return [
+        measure('Player._load_sprites', player._load_sprites, warmup=1, repeat=opts.repeat // 3 or 1),
+        measure('Enemy._load_sprites', enemy._load_sprites, warmup=1, repeat=opts.repeat // 3 or 1),
+    ]
+
+
+def bench_background(opts):
+    from game.background import ParallaxBackground
+    from game.camera import Camera
+
+    app = HeadlessApp()
+    sw, sh = app.screen.get_size()
+    world_w = world_h = 2400
+    ground_y = world_h - 150
+    bg = ParallaxBackground(sw, sh, world_w, ground_y)
+    camera = Camera(sw, sh, world_w, world_h)
+    camera.x = 700
+    camera.y = ground_y - sh // 2
+    return [
+        measure('ParallaxBackground.draw', lambda: bg.draw(app.screen, camera),
+                warmup=opts.warmup, repeat=opts.repeat, number=10),
+    ]
+
+
+def bench_audio_dsp(opts):
+    from game.utils.audio import AudioManager, np
+    from game.events import ATTACK_SFX_LAYERS, HIT_SFX_LAYERS, DIE_SFX_LAYERS
+
+    if np is None:
+        print('numpy not available: skipping AudioManager benchmarks', file=sys.stderr)
+        return []
+    audio = AudioManager()
+
+    def _first_file(category):
+        d = audio._find_variant_dir(category)
+        if not d:
+            return None
+        files = sorted(f for f in os.listdir(d) if os.path.splitext(f)[1].lower() in audio.DEFAULT_SFX_EXT)
+        return os.path.join(d, files[0]) if files else None
+
+    # (label, sound, layers) exactly as Gameplay requests them
+    presets = [
+        ('attack-swing', 'attack', AudioManager.default_layers(1.1, 1, 0.03)),
+        ('attack-hit', 'attack', ATTACK_SFX_LAYERS),
+        ('hit', 'hit', HIT_SFX_LAYERS),
+        ('die', 'die', DIE_SFX_LAYERS),
+        ('demon-laugh', os.path.join('alert', 'demonLaugh.mp3'), AudioManager.default_layers(0.95)),
+        ('fireball', os.path.join('playereffects', 'fireBallSFX.mp3'), AudioManager.default_layers()),
+    ]
+    results = []
+    for label, name, layers in presets:
+        path = audio._find_file(audio.sfx_path, name, audio.DEFAULT_SFX_EXT) or _first_file(name)
+        if not path:
+            continue
+        results.append(measure('AudioManager._process_and_make_sound',
+                               lambda p=path, l=layers: audio._process_and_make_sound(p, l),
+                               warmup=1, repeat=max(3, opts.repeat // 3), params={'preset': label}))
+    return results
+
+
+def _make_gameplay(enemy_count):
+    from game.scenes.gameplay import Gameplay
+    from game.entities.enemy import Enemy
+
+    app = HeadlessApp()
+    scene = Gameplay(app)
+    app.current_scene = scene
+    ground = scene.ground_y - 160
+    # spread enemies across the world; the first few overlap the player's reach
+    step = max(1, (scene.world_width - 200) // max(1, enemy_count))
+    scene.enemies = [Enemy(scene.player.rect.x + 60 + i * step, ground) for i in range(enemy_count)]
+    scene.enemy_spawn_limit = enemy_count
+    scene.spatial.clear('enemy')
+    for e in scene.enemies:
+        scene.spatial.insert(e, e.get_hitbox(), 'enemy')
+    return scene
+
+
+def bench_collisions(opts):
+    counts = [int(c) for c in opts.counts.split(',') if c.strip()]
+    results = []
+    for n in counts:
+        scene = _make_gameplay(n)
+        player = scene.player
+
+        def reset_player_attack(scene=scene, player=player):
+            # a fresh swing on a hit-active frame
+            player.state = 'attack1'
+            player.anim_index = 1
+            player.swing_hits = None
+            player.facing = 1
+            player.knockback_vel_x = 0
+            for e in scene.enemies:
+                e.current_hp = e.max_hp
+                e.hit_cooldown = 0
+                e.state = 'idle'
+            scene.effects = []
+            scene.events.clear()
+
+        def reset_enemy_attack(scene=scene, player=player):
+            player.current_hp = player.max_hp
+            player.hit_cooldown = 0
+            player.state = 'idle'
+            for e in scene.enemies:
+                e.state = 'attack1'
+                e.anim_index = 1
+                e.swing_hits = None
+                e.facing = 1 if player.rect.centerx > e.rect.centerx else -1
+            scene.effects = []
+            scene.events.clear()
+
+        results.append(measure('Gameplay._check_player_attack_collision', scene._check_player_attack_collision,
+                               setup=reset_player_attack, warmup=opts.warmup, repeat=opts.repeat,
+                               params={'enemies': n}))
+        results.append(measure('Gameplay._check_enemy_attack_collision', scene._check_enemy_attack_collision,
+                               setup=reset_enemy_attack, warmup=opts.warmup, repeat=opts.repeat,
+                               params={'enemies': n}))
+    return results
+
+
+def bench_spatial(opts):
+    import random
+    import pygame
+    from game.spatial import SpatialGrid
+
+    world_width = 2400
+    rng = random.Random(1234)
+    results = []
+    for n in (10, 100, 1000):
+        rects = [pygame.Rect(rng.randrange(0, world_width - 40), 2090, 40, 80) for _ in range(n)]
+        grid = SpatialGrid(world_width)
+        for i, r in enumerate(rects):
+            grid.insert(i, r, 'enemy')
+        # an attack box of ATTACK_RANGE next to a hitbox in the middle of the world
+        probe = pygame.Rect(1220, 2106, 100, 48)
+
+        # what the scene used to do: build every hitbox Rect and test it
+        def linear(rects=rects):
+            return [i for i, r in enumerate(rects) if probe.colliderect(pygame.Rect(r.x, r.y, r.w, r.h))]
+
+        # entities step back and forth by a typical per-tick distance
+        steps = [[(i, r.move(d, 0)) for i, r in enumerate(rects)] for d in (6, 0)]
+        flip = [0]
+
+        def move_all(grid=grid, steps=steps, flip=flip):
+            flip[0] ^= 1
+            for i, r in steps[flip[0]]:
+                grid.move(i, r)
+
+        results.append(measure('linear scan (fresh Rects)', linear,
+                               warmup=opts.warmup, repeat=opts.repeat, number=20, params={'entities': n}))
+        results.append(measure('SpatialGrid.query', lambda grid=grid: grid.query(probe, 'enemy'),
+                               warmup=opts.warmup, repeat=opts.repeat, number=20, params={'entities': n}))
+        results.append(measure('SpatialGrid.move (all entities)', move_all,
+                               warmup=opts.warmup, repeat=opts.repeat, params={'entities': n}))
+    return results
+
+
+def bench_lod(opts):
+    import pygame
+
+    results = []
+    for n in (20, 100):
+        scene = _make_gameplay(n)
+        scene.camera.update(scene.player.rect)
+        for enabled in (False, True):
+            def tick(scene=scene, enabled=enabled):
+                scene.lod_enabled = enabled
+                scene._update_enemies(pygame.time.get_ticks())
+
+            results.append(measure('Gameplay._update_enemies', tick, warmup=opts.warmup, repeat=opts.repeat,
+                                   params={'enemies': n, 'lod': 'on' if enabled else 'off'}))
+    return results
+
+
+def bench_particles(opts):
+    try:
+        import numpy  # noqa: F401
+    except Exception:
+        return []
+    from game.entities.effects.particles import ParticleSystem
+
+    app = HeadlessApp()
+    results = []
+    for n in (500, 2000, 4000):
+        ps = ParticleSystem(capacity=n)
+
+        def refill(ps=ps, n=n):
+            ps.clear()
+            while len(ps) < n and ps.emit(app.screen.get_width() // 2, app.screen.get_height() // 2, 'kill'):
+                pass
+
+        results.append(measure('ParticleSystem.update', ps.update, setup=refill,
+                               warmup=opts.warmup, repeat=opts.repeat, params={'particles': n}))
+        results.append(measure('ParticleSystem.draw', lambda ps=ps: ps.draw(app.screen, 0, 0), setup=refill,
+                               warmup=opts.warmup, repeat=opts.repeat, params={'particles': n}))
+    return results
+
+
+def bench_animation(opts):
+    from game.entities.animation import AnimationTimeline
+    from game.entities.enemy import Enemy
+
+    # what the effects used to do every tick: re-sum and scan the durations
+    def scan(durations, elapsed):
+        t = elapsed % sum(durations)
+        s = 0
+        for i, d in enumerate(durations):
+            s += d
+            if t < s:
+                return i
+        return len(durations) - 1
+
+    results = []
+    clips = {
+        'fire_in_body': (120, 120, 120, 120),
+        'mixed-10': (60, 80, 100, 80, 60, 120, 80, 60, 100, 140),
+    }
+    samples = list(range(0, 5000, 7))
+    for label, durations in clips.items():
+        timeline = AnimationTimeline(durations, label)
+        results.append(measure('linear duration scan', lambda d=durations: [scan(d, t) for t in samples],
+                               warmup=opts.warmup, repeat=opts.repeat, params={'clip': label}))
+        results.append(measure('AnimationTimeline.frame_at', lambda f=timeline.frame_at: [f(t) for t in samples],
+                               warmup=opts.warmup, repeat=opts.repeat, params={'clip': label}))
+
+    enemies = [Enemy(i * 10, 0) for i in range(100)]
+    clock = [0]
+
+    def animate(enemies=enemies, clock=clock):
+        clock[0] += 16
+        now = clock[0]
+        for e in enemies:
+            e._update_animation(now)
+
+    results.append(measure('Enemy._update_animation', animate,
+                           warmup=opts.warmup, repeat=opts.repeat, params={'enemies': len(enemies)}))
+    return results
+
+
+def bench_horde(opts):
+    try:
+        import numpy  # noqa: F401
+    except Exception:
+        return []
+    import pygame
+    from game.scenes.horde import HordeGameplay
+
+    results = []
+    for n in (100, 500, 1000):
+        app = HeadlessApp()
+        scene = HordeGameplay(app, horde_size=n)
+        app.current_scene = scene
+
+        def tick(scene=scene):
+            scene._update_enemies(pygame.time.get_ticks())
+            scene._check_enemy_attack_collision()
+            scene.events.flush()
+
+        results.append(measure('HordeGameplay enemy tick', tick,
+                               warmup=opts.warmup, repeat=opts.repeat, params={'enemies': n}))
+        results.append(measure('Horde.draw', lambda scene=scene: scene._render_enemies(app.screen),
+                               warmup=opts.warmup, repeat=opts.repeat, params={'enemies': n}))
+        results.append(measure('Horde.overlaps', lambda h=scene.horde, r=scene.player.get_hitbox(): h.overlaps(r),
+                               warmup=opts.warmup, repeat=opts.repeat, params={'enemies': n}))
+    return results
+
+
+def bench_load_screen(opts):
+    import pygame
+    from game.scenes.load_screen import LoadScreen
+
+    app = HeadlessApp()
+    prev = app.screen.copy()
+    prev.fill((40, 60, 80))
+
+    exit_scene = LoadScreen(app, target=None, prev_surface=prev)
+    entry_scene = LoadScreen(app, target=None, prev_surface=prev)
+    entry_scene.phase = 'entry'
+    entry_scene._entry_surface = prev.copy()
+    entry_scene.entry_start = pygame.time.get_ticks()
+
+    return [
+        measure('LoadScreen.render', lambda: exit_scene.render(app.screen),
+                warmup=opts.warmup, repeat=opts.repeat, params={'phase': 'exit'}),
+        measure('LoadScreen.render', lambda: entry_scene.render(app.screen),
+                warmup=opts.warmup, repeat=opts.repeat, params={'phase': 'entry'}),
+    ]
+
+
+def bench_restart(opts):
+    from game.scenes.gameplay import Gameplay
+
+    def cold():
+        # fresh app: nothing retained, every asset is loaded again
+        HeadlessApp().change_scene(Gameplay)
+
+    app = HeadlessApp()
+    app.change_scene(Gameplay)
+
+    def restart():
+        app.current_scene._recycle_enemies()
+        app.change_scene(Gameplay)
+
+    return [
+        measure('Gameplay restart', cold, warmup=1, repeat=min(opts.repeat, 3), number=1,
+                params={'assets': 'cold'}),
+        measure('Gameplay restart', restart, warmup=opts.warmup, repeat=opts.repeat, number=1,
+                params={'assets': 'retained'}),
+        measure('Gameplay restart', app.current_scene.restart, warmup=opts.warmup, repeat=opts.repeat,
+                params={'assets': 'in place'}),
+    ]
+
+
+def bench_events(opts):
+    from game.events import Swing, Hit
+
+    scene = _make_gameplay(1)
+    x, y = scene.player.rect.center
+    results = []
+    for hooked in (True, False):
+        scene.set_presentation(hooked)
+        for hits in (1, 3, 10, 50):
+            def frame(scene=scene, hits=hits):
+                # one swing through `hits` enemies, then the frame's reactions
+                events = scene.events
+                events.emit(Swing(x, y, 1))
+                for i in range(hits):
+                    events.emit(Hit(x + 4 * i, y, 1, i % 2 == 0))
+                events.flush()
+
+            results.append(measure('EventBus emit+flush', frame, setup=scene.particles.clear,
+                                   warmup=opts.warmup, repeat=opts.repeat,
+                                   params={'hits': hits, 'presentation': 'on' if hooked else 'off'}))
+    return results
+
+
+def bench_snapshot(opts):
+    results = []
+    for count in [int(c) for c in opts.counts.split(',') if c.strip()]:
+        scene = _make_gameplay(count)
+        scene.update()
+        data = scene.snapshot()
+        params = {'enemies': count, 'bytes': len(data)}
+        results.append(measure('Gameplay.snapshot', scene.snapshot, warmup=opts.warmup, repeat=opts.repeat,
+                               params=params))
+        results.append(measure('Gameplay.restore', lambda: scene.restore(data), warmup=opts.warmup,
+                               repeat=opts.repeat, params=params))
+        results.append(measure('Gameplay.state_hash', scene.state_hash, warmup=opts.warmup, repeat=opts.repeat,
+                               params=params))
+    return results
+
+
+def bench_broadcast(opts):
+    from game.broadcast import WorldIds, archetype_names, capture, encode_world, decode_world, EMPTY_WORLD
+
+    names = archetype_names()
+    results = []
+    for count in [int(c) for c in opts.counts.split(',') if c.strip()]:
+        scene = _make_gameplay(count)
+        ids = WorldIds()
+        scene.update()
+        prev = capture(scene, ids, names)
+        keyframe = encode_world(EMPTY_WORLD, prev)
+        # average delta over a stretch of play
+        delta_bytes = 0
+        ticks = 60
+        for _ in range(ticks):
+            scene.update()
+            world = capture(scene, ids, names)
+            delta_bytes += len(encode_world(prev, world))
+            prev = world
+        scene.update()
+        world = capture(scene, ids, names)
+        delta = encode_world(prev, world)
+        params = {'enemies': count, 'keyframe_bytes': len(keyframe), 'delta_bytes': round(delta_bytes / ticks, 1)}
+        results.append(measure('broadcast.capture', lambda: capture(scene, ids, names), warmup=opts.warmup,
+                               repeat=opts.repeat, params=params))
+        results.append(measure('broadcast.encode_keyframe', lambda: encode_world(EMPTY_WORLD, world),
+                               warmup=opts.warmup, repeat=opts.repeat, params=params))
+        results.append(measure('broadcast.encode_delta', lambda: encode_world(prev, world), warmup=opts.warmup,
+                               repeat=opts.repeat, params=params))
+        results.append(measure('broadcast.decode_delta', lambda: decode_world(prev, delta), warmup=opts.warmup,
+                               repeat=opts.repeat, params=params))
+    return results
+
+
+SUITES = [
+    ('sprites', bench_sprite_loading),
+    ('background', bench_background),
+    ('audio', bench_audio_dsp),
+    ('collision', bench_collisions),
+    ('spatial', bench_spatial),
+    ('lod', bench_lod),
+    ('particles', bench_particles),
+    ('animation', bench_animation),
+    ('horde', bench_horde),
+    ('loadscreen', bench_load_screen),
+    ('restart', bench_restart),
+    ('events', bench_events),
+    ('snapshot', bench_snapshot),
+    ('broadcast', bench_broadcast),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--json', metavar='PATH', help="write machine-readable results to PATH ('-' for stdout)")
+    parser.add_argument('--filter', default='', help='only run suites whose name contains this text')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--counts', default='1,10,50,100', help='enemy counts for the collision suite')
+    opts = parser.parse_args(argv)
+
+    init_headless()
+    results = []
+    for name, suite in SUITES:
+        if opts.filter and opts.filter not in name:
+            continue
+        results.extend(suite(opts))
+    write_report(results, opts.json)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Two headless netplay clients on one machine, over a lossy loopback link.
+
+Starts two processes that each run a `NetplayGameplay` with scripted
+inputs, connected by UDP on 127.0.0.1 through `LossyLink` (artificial
+one-way delay, jitter and packet loss on both directions). Reports per
+client how often the session rolled back, how many ticks it resimulated
+and the CPU time that cost, stalls, and whether the two simulations ever
+diverged (in-band hash mismatches plus a final comparison of the
+confirmed state hashes of both clients).
+
+Usage (from the repository root):
+
+    python src/tools/netplay_harness.py
+    python src/tools/netplay_harness.py --delay 60 --jitter 20 --loss 0.1 --ticks 1200
+    python src/tools/netplay_harness.py --fps 0 --json -
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.headless import init_headless, HeadlessApp  # noqa: E402
+from game.netplay import IN_LEFT, IN_RIGHT, IN_JUMP, IN_ATTACK, IN_CAST, LossyLink, UdpTransport  # noqa: E402
+
+
+class ScriptedInput:
+    """Random but reproducible button presses, roughly like a player's."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.held = 0
+        self.hold_ticks = 0
+
+    def next(self):
+        rng = self.rng
+        if self.hold_ticks <= 0:
+            self.held = rng.choice((0, IN_LEFT, IN_RIGHT, IN_RIGHT))
+            self.hold_ticks = rng.randint(10, 60)
+        self.hold_ticks -= 1
+        bits = self.held
+        if rng.random() < 0.03:
+            bits |= IN_JUMP
+        if rng.random() < 0.08:
+            bits |= IN_ATTACK
+        if rng.random() < 0.01:
+            bits |= IN_CAST
+        return bits
+
+
+def _free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def run_client(index, port, peer_port, opts, results):
+    from game.scenes.netplay import NetplayGameplay
+
+    init_headless()
+    app = HeadlessApp()
+    link = LossyLink(UdpTransport(port, ('127.0.0.1', peer_port)), opts.delay, opts.jitter, opts.loss,
+                     seed=opts.seed * 2 + index)
+    scene = NetplayGameplay(app, link, index, seed=opts.seed, input_delay=opts.input_delay,
+                            max_rollback=opts.max_rollback)
+    # only the simulation is measured, and no frame flushes the event bus here
+    scene.set_presentation(False)
+    session = scene.session
+    script = ScriptedInput(opts.seed * 7 + index)
+
+    frame_s = 1.0 / opts.fps if opts.fps > 0 else 0.0
+    advance_ms = 0.0
+    bits = script.next()
+    deadline = time.perf_counter() + opts.timeout
+    next_frame = time.perf_counter()
+    while session.tick < opts.ticks and time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        if session.advance(bits):
+            bits = script.next()
+        advance_ms += (time.perf_counter() - t0) * 1000.0
+        if frame_s:
+            next_frame += frame_s
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            # let the peer's packets in when running flat out
+            time.sleep(0)
+
+    # keep exchanging packets so both sides confirm the last ticks
+    grace = time.perf_counter() + max(0.5, 4 * (opts.delay + opts.jitter) / 1000.0)
+    while time.perf_counter() < grace:
+        session.idle()
+        time.sleep(0.002)
+
+    stats = session.stats()
+    stats.update({
+        'client': index,
+        'advance_ms': advance_ms,
+        'dropped': link.dropped,
+        'hashes': session.confirmed_hashes(),
+    })
+    session.close()
+    results.put(stats)
+
+
+def _client_main(index, port, peer_port, opts, results):
+    try:
+        run_client(index, port, peer_port, opts, results)
+    except Exception as exc:
+        results.put({'client': index, 'error': repr(exc)})
+        raise
+
+
+def compare_hashes(a, b):
+    """(ticks compared, ticks whose confirmed state hash differs)."""
+    common = set(a) & set(b)
+    return len(common), sum(1 for t in common if a[t] != b[t])
+
+
+def format_report(clients, compared, mismatched):
+    lines = [
+        f"{'client':>6} {'ticks':>6} {'rollbacks':>9} {'rb/100t':>8} {'resim t':>8} {'depth':>6} "
+        f"{'resim ms':>9} {'ms/resim t':>10} {'resim %':>8} {'stalls':>7} {'dropped':>8} {'desyncs':>8}"
+    ]
+    for c in clients:
+        ticks = max(1, c['ticks'])
+        rollbacks = c['rollbacks']
+        depth = c['resimulated'] / rollbacks if rollbacks else 0.0
+        per_tick = c['resim_ms'] / c['resimulated'] if c['resimulated'] else 0.0
+        share = 100.0 * c['resim_ms'] / c['advance_ms'] if c['advance_ms'] else 0.0
+        lines.append(
+            f"{c['client']:>6} {c['ticks']:>6} {rollbacks:>9} {100.0 * rollbacks / ticks:>8.1f} "
+            f"{c['resimulated']:>8} {depth:>6.1f} {c['resim_ms']:>9.1f} {per_tick:>10.3f} {share:>7.1f}% "
+            f"{c['stalls']:>7} {c['dropped']:>8} {c['desyncs']:>8}"
+        )
+    lines.append(f'confirmed state hashes compared: {compared}, mismatched: {mismatched}')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=600, help='simulation ticks per client')
+    parser.add_argument('--fps', type=float, default=60.0, help='frame pacing (0 runs flat out)')
+    parser.add_argument('--delay', type=float, default=40.0, help='one-way delay in ms')
+    parser.add_argument('--jitter', type=float, default=10.0, help='extra random delay of up to this many ms')
+    parser.add_argument('--loss', type=float, default=0.05, help='packet loss probability')
+    parser.add_argument('--input-delay', type=int, default=2)
+    parser.add_argument('--max-rollback', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=120.0, help='give up after this many seconds')
+    parser.add_argument('--json', metavar='PATH', help="write the results as JSON to PATH ('-' for stdout)")
+    opts = parser.parse_args(argv)
+
+    ports = (_free_port(), _free_port())
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_client_main, args=(i, ports[i], ports[1 - i], opts, results))
+             for i in range(2)]
+    for p in procs:
+        p.start()
+    clients = sorted((results.get(timeout=opts.timeout + 30) for _ in procs), key=lambda c: c['client'])
+    for p in procs:
+        p.join()
+    failed = [c for c in clients if 'error' in c]
+    if failed:
+        for c in failed:
+            print(f"client {c['client']} failed: {c['error']}", file=sys.stderr)
+        return 2
+
+    compared, mismatched = compare_hashes(clients[0].pop('hashes'), clients[1].pop('hashes'))
+    report = {'clients': clients, 'hashes_compared': compared, 'hashes_mismatched': mismatched}
+    if opts.json:
+        text = json.dumps(report, indent=2)
+        if opts.json == '-':
+            print(text)
+        else:
+            with open(opts.json, 'w', encoding='utf-8') as f:
+                f.write(text)
+    else:
+        print(format_report(clients, compared, mismatched))
+    desynced = mismatched or any(c['desyncs'] for c in clients)
+    return 1 if desynced else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Count pygame.Rect allocations per Gameplay tick.
+
+Runs a headless Gameplay with enemies around the player and reports how many
+`pygame.Rect` objects `update()` and `render()` build per tick on average:
+`pygame.Rect(...)` calls plus the C calls that return a new Rect (`move`,
+`Surface.get_rect`, `blit`, `pygame.draw.*`, ...), broken down by source.
+`RectCounter.UNCOVERED` lists what is not counted.
+
+Usage (from the repository root):
+
+    python src/tools/rectchurn.py
+    python src/tools/rectchurn.py --enemies 50 --ticks 600
+"""
+import argparse
+import json
+import os
+import sys
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.headless import init_headless, HeadlessApp  # noqa: E402
+from tools.bench import RectCounter  # noqa: E402
+
+
+def run(enemies=10, ticks=300):
+    from game.scenes.gameplay import Gameplay
+    from game.entities.enemy import Enemy
+
+    app = HeadlessApp()
+    scene = Gameplay(app)
+    app.current_scene = scene
+    ground = scene.ground_y - 160
+    scene.spatial.clear('enemy')
+    scene.enemies = []
+    for i in range(enemies):
+        e = Enemy(scene.player.rect.x + 120 + (i * 97) % 1400, ground)
+        scene.enemies.append(e)
+        scene.spatial.insert(e, e.get_hitbox(), 'enemy')
+    scene.enemy_spawn_limit = enemies
+
+    update_rects = render_rects = 0
+    update_sources = {}
+    render_sources = {}
+    for tick in range(ticks):
+        # keep the fight going: swing regularly and never die
+        if tick % 20 == 0:
+            scene.player.attack()
+        scene.player.current_hp = scene.player.max_hp
+        with RectCounter() as c:
+            scene.update()
+        update_rects += c.count
+        _merge(update_sources, c.by_source)
+        with RectCounter() as c:
+            scene.render(app.screen)
+        render_rects += c.count
+        _merge(render_sources, c.by_source)
+    return {
+        'enemies': enemies,
+        'ticks': ticks,
+        'update_rects_per_tick': update_rects / ticks,
+        'render_rects_per_tick': render_rects / ticks,
+        'update_sources_per_tick': {k: v / ticks for k, v in sorted(update_sources.items())},
+        'render_sources_per_tick': {k: v / ticks for k, v in sorted(render_sources.items())},
+        'not_counted': list(RectCounter.UNCOVERED),
+    }
+
+
+def _merge(total, counts):
+    for source, n in counts.items():
+        total[source] = total.get(source, 0) + n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--enemies', type=int, default=10)
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    opts = parser.parse_args(argv)
+
+    init_headless()
+    result = run(opts.enemies, opts.ticks)
+    if opts.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['enemies']} enemies, {result['ticks']} ticks: "
+              f"update {result['update_rects_per_tick']:.2f} Rects/tick, "
+              f"render {result['render_rects_per_tick']:.2f} Rects/tick")
+        for stage in ('update', 'render'):
+            sources = result[f'{stage}_sources_per_tick']
+            if sources:
+                print(f'  {stage}: ' + ', '.join(f'{k} {v:.2f}' for k, v in sources.items()))
+        print('  not counted: ' + ', '.join(result['not_counted']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
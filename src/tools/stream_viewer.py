@@ -0,0 +1,279 @@
+"""Spectator viewer for the world stream of a game run with --broadcast.
+
+Connects to the game's local TCP stream, rebuilds the world from its
+keyframes and bit-packed deltas (game/broadcast.py) and draws it with the
+game's own background, sprite caches and effect frames. The raw stream
+can be recorded to a file and played back later at the original tick
+rate. On exit it prints how many frames arrived and the bytes they took.
+
+Usage (from the repository root):
+
+    python src/main.py --broadcast
+    python src/tools/stream_viewer.py
+    python src/tools/stream_viewer.py --record logs/battle.kstream
+    python src/tools/stream_viewer.py --play logs/battle.kstream
+    python src/tools/stream_viewer.py --headless --frames 600
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame  # noqa: E402
+
+from game.headless import init_headless  # noqa: E402
+from game.settings import BROADCAST_PORT, FPS, SCREEN_WIDTH, SCREEN_HEIGHT  # noqa: E402
+from game.broadcast import (  # noqa: E402
+    WorldStream, SCENE_FIELDS, FLAG_FLASH,
+    KIND_PLAYER, KIND_ENEMY, KIND_FIREBALL, KIND_HITSPARK, KIND_FIRE_IN_BODY, KIND_HEALTH,
+)
+
+# back to front, like Gameplay.render
+_DRAW_ORDER = (KIND_ENEMY, KIND_HEALTH, KIND_PLAYER, KIND_HITSPARK, KIND_FIRE_IN_BODY, KIND_FIREBALL)
+
+
+class WorldView:
+    """Draws a `WorldStream` the way Gameplay.render draws the live scene.
+
+    Knights and enemies are puppets (`Player` / pooled `Enemy` objects
+    whose rect, state, frame, facing and flash are set from the stream),
+    so they share the archetype sprite caches; effects and projectiles
+    blit the class-level frame lists of Hitspark, FireInBody and Fireball.
+    """
+
+    def __init__(self, info):
+        from game.background import ParallaxBackground
+        from game.camera import Camera
+
+        self.info = info
+        sw, sh = info['screen']
+        ww, wh = info['world']
+        self.camera = Camera(sw, sh, ww, wh)
+        self.background = ParallaxBackground(sw, sh, ww, info['ground_y'])
+        self.names = info['archetypes']
+        # stream id -> (kind, sprite, puppet)
+        self.puppets = {}
+        self._health = None
+        self.font = pygame.font.Font(None, 30)
+
+    def close(self):
+        for sid in list(self.puppets):
+            self._drop(sid)
+
+    def _drop(self, sid):
+        kind, _sprite, puppet = self.puppets.pop(sid)
+        if kind == KIND_ENEMY:
+            puppet.release()
+
+    def _puppet(self, sid, kind, sprite, x, y):
+        from game.entities.enemy import Enemy
+        from game.entities.player import Player
+
+        entry = self.puppets.get(sid)
+        if entry is not None and entry[0] == kind and entry[1] == sprite:
+            return entry[2]
+        if entry is not None:
+            self._drop(sid)
+        if kind == KIND_PLAYER:
+            puppet = Player(x, y)
+        else:
+            name = self.names[sprite] if sprite < len(self.names) else None
+            puppet = Enemy.acquire(x, y, name)
+        self.puppets[sid] = (kind, sprite, puppet)
+        return puppet
+
+    @staticmethod
+    def _frames(cls):
+        if cls._frames is None:
+            cls._load_frames()
+        return cls._frames
+
+    def draw(self, screen, stream, now):
+        from game.entities.effects import Hitspark
+        from game.entities.effects.fireball import Fireball
+        from game.entities.effects.fireinbody import FireInBody
+        from game.entities.health import Health
+
+        scene = dict(zip(SCENE_FIELDS, stream.scene))
+        camera = self.camera
+        camera.x = scene['camera_x']
+        camera.y = scene['camera_y']
+        self.background.draw(screen, camera)
+
+        entities = stream.entities
+        for sid in [sid for sid in self.puppets if sid not in entities]:
+            self._drop(sid)
+        by_kind = {kind: [] for kind in _DRAW_ORDER}
+        for sid, record in sorted(entities.items()):
+            by_kind.setdefault(record[0], []).append((sid, record))
+
+        effect_frames = {
+            KIND_HITSPARK: self._frames(Hitspark),
+            KIND_FIRE_IN_BODY: self._frames(FireInBody),
+            KIND_FIREBALL: self._frames(Fireball),
+        }
+        sw = camera.screen_width
+        for kind in _DRAW_ORDER:
+            for sid, (_kind, sprite, x, y, state, frame, facing, hp, max_hp, flags) in by_kind[kind]:
+                if kind in (KIND_PLAYER, KIND_ENEMY):
+                    puppet = self._puppet(sid, kind, sprite, x, y)
+                    puppet.rect.topleft = (x, y)
+                    puppet.state_id = state
+                    puppet.anim_index = frame
+                    puppet.facing = facing
+                    puppet.current_hp = hp
+                    puppet.flash_timer = now if flags & FLAG_FLASH else 0
+                    rect = camera.apply(puppet.rect)
+                    if rect.right > 0 and rect.left < sw:
+                        puppet.draw_at(screen, rect.topleft, now)
+                        if kind == KIND_ENEMY and max_hp:
+                            self._draw_hp(screen, rect, hp, max_hp)
+                elif kind == KIND_HEALTH:
+                    if self._health is None:
+                        self._health = Health(x, y)
+                    self._health.rect.topleft = (x, y)
+                    self._health.draw_at(screen, camera.apply(self._health.rect).topleft)
+                else:
+                    frames = effect_frames[kind]
+                    if not frames:
+                        continue
+                    image = frames[frame % len(frames)]
+                    rect = image.get_rect(center=(x, y))
+                    screen.blit(image, camera.apply(rect).topleft)
+
+        hud = f"Kills: {scene['kills']}   Mana: {scene['mana']}/{scene['max_mana']}   Tick {stream.tick}"
+        screen.blit(self.font.render(hud, True, (255, 255, 255)), (10, 10))
+        if scene['dead']:
+            text = self.font.render('FIM DE JOGO', True, (255, 60, 60))
+            screen.blit(text, text.get_rect(center=(sw // 2, camera.screen_height // 2)))
+
+    @staticmethod
+    def _draw_hp(screen, rect, hp, max_hp):
+        bar_x = rect.centerx - 30
+        bar_y = rect.top - 13
+        pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, 60, 8))
+        filled = int(60 * max(0, hp) / max_hp)
+        if filled > 0:
+            pygame.draw.rect(screen, (200, 0, 0) if hp <= 1 else (0, 200, 0), (bar_x, bar_y, filled, 8))
+
+
+def _connect(host, port, timeout):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=1.0)
+            sock.setblocking(False)
+            return sock
+        except OSError:
+            if time.perf_counter() >= deadline:
+                raise
+            time.sleep(0.2)
+
+
+def _receive(sock):
+    """Everything the socket has buffered; None once the game closed the stream."""
+    chunks = []
+    while True:
+        try:
+            data = sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            break
+        if not data:
+            return None if not chunks else b''.join(chunks)
+        chunks.append(data)
+    return b''.join(chunks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=BROADCAST_PORT)
+    parser.add_argument('--record', metavar='PATH', help='also write the raw stream to PATH')
+    parser.add_argument('--play', metavar='PATH', help='play back a recorded stream instead of connecting')
+    parser.add_argument('--headless', action='store_true', help='decode without opening a window')
+    parser.add_argument('--frames', type=int, default=0, help='stop after this many world frames (0 = never)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='seconds to keep trying to connect')
+    opts = parser.parse_args(argv)
+
+    if opts.headless:
+        init_headless()
+        display = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    else:
+        pygame.init()
+        display = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption('Knight Demo Game - espectador')
+    clock = pygame.time.Clock()
+
+    stream = WorldStream()
+    sock = recording = playback = None
+    if opts.play:
+        with open(opts.play, 'rb') as f:
+            playback = f.read()
+    else:
+        sock = _connect(opts.host, opts.port, opts.timeout)
+    if opts.record:
+        recording = open(opts.record, 'wb')
+
+    view = None
+    received = 0
+    running = True
+    try:
+        while running:
+            if not opts.headless:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                        running = False
+            if playback is not None:
+                # one tick per frame at the game's rate
+                if playback:
+                    received += len(playback)
+                    stream.feed(playback, limit=1)
+                    playback = b''
+                elif not stream.feed(limit=1):
+                    break
+            else:
+                data = _receive(sock)
+                if data is None:
+                    break
+                if data:
+                    received += len(data)
+                    if recording is not None:
+                        recording.write(data)
+                    stream.feed(data)
+
+            if stream.info is not None and (view is None or view.info is not stream.info):
+                if view is not None:
+                    view.close()
+                view = WorldView(stream.info)
+                if not opts.headless and tuple(stream.info['screen']) != display.get_size():
+                    display = pygame.display.set_mode(stream.info['screen'])
+            if view is not None and stream.synced:
+                view.draw(display, stream, pygame.time.get_ticks())
+            if not opts.headless:
+                pygame.display.flip()
+            frames = stream.keyframes + stream.deltas
+            if opts.frames and frames >= opts.frames:
+                break
+            clock.tick(FPS if playback is not None or not opts.headless else 0)
+    finally:
+        if sock is not None:
+            sock.close()
+        if recording is not None:
+            recording.close()
+
+    frames = stream.keyframes + stream.deltas
+    print(f'frames: {frames} ({stream.keyframes} keyframes, {stream.deltas} deltas), {received} bytes received')
+    if stream.keyframes:
+        print(f'  keyframe: {stream.keyframe_bytes / stream.keyframes:.0f} B avg')
+    if stream.deltas:
+        print(f'  delta:    {stream.delta_bytes / stream.deltas:.1f} B avg '
+              f'({stream.delta_bytes * FPS / stream.deltas / 1024:.1f} KiB/s at {FPS} ticks/s)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
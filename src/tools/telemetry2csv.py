@@ -0,0 +1,31 @@
+"""Convert a frame telemetry capture (.ktel) to CSV.
+
+Usage (from the repository root):
+
+    python src/tools/telemetry2csv.py src/logs/telemetry-20250101-120000.ktel
+    python src/tools/telemetry2csv.py capture.ktel -o frames.csv
+"""
+import argparse
+import os
+import sys
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.utils.telemetry import to_csv  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('capture', help='telemetry file written by --telemetry')
+    parser.add_argument('-o', '--output', help='CSV path (default: capture path with .csv)')
+    opts = parser.parse_args(argv)
+
+    out = opts.output or os.path.splitext(opts.capture)[0] + '.csv'
+    n = to_csv(opts.capture, out)
+    print(f'{n} frames -> {out}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())